@@ -0,0 +1,14 @@
+import click
+
+from crit.connections import Broker
+
+
+@click.command()
+@click.option('-s', '--socket', 'socket_path', required=True, help='The path of the unix socket the broker listens on')
+@click.option('--idle-timeout', default=600, type=float, help='Seconds without commands after which the broker stops')
+def main(socket_path: str, idle_timeout: float = 600):
+    Broker(socket_path, idle_timeout).serve()
+
+
+if __name__ == "__main__":
+    main()
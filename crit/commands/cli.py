@@ -7,6 +7,7 @@ import click
 from importlib.machinery import SourceFileLoader
 from crit.exceptions import ConfigNotInFileException, NoSequenceException, WrongExtraVarsFormatException
 from crit.config import Localhost, config as config_module
+from crit.connections import BrokerClient
 from crit.utils import get_host_by_name
 
 
@@ -20,7 +21,15 @@ from crit.utils import get_host_by_name
 @click.option('-e', '--extra-vars', default='', help='Key value based variable that will be inserted into the registry')
 @click.option('-p', '--linux-pass', is_flag=True, help='Crit will ask for the linux password')
 @click.option('-v', '--verbose', default=0, count=True, help='Shows the commands that are running')
-def main(sequence_file: str, hosts: Union[str, List[str]] = 'all', config: str = 'config.py', tags: str = '', skip_tags: str = '', extra_vars: str = '', verbose: int = 0, linux_pass: bool = False):
+@click.option('-f', '--forks', default=None, type=int, help='The maximum amount of executors that run at the same time. Defaults to one per host and at most 50')
+@click.option('--processes', default=None, type=int, help='Shards the hosts over this amount of worker processes')
+@click.option('--timeout', default=None, type=float, help='Seconds an executor may run on a host before the host fails')
+@click.option('--fail-fast', is_flag=True, help='Stops the run after the first executor that fails')
+@click.option('--durations-file', default=None, help='Json file in which the durations of the executors are kept so the longest ones start first')
+@click.option('--preconnect', is_flag=True, help='Probes and connects to all the hosts at the same time before the first executor runs')
+@click.option('--coalesce', is_flag=True, help='Runs consecutive executors as one script on a host')
+@click.option('--broker', default=None, help='Unix socket of a connection broker that keeps the ssh connections open between runs. Starts the broker when it is not running')
+def main(sequence_file: str, hosts: Union[str, List[str]] = 'all', config: str = 'config.py', tags: str = '', skip_tags: str = '', extra_vars: str = '', verbose: int = 0, linux_pass: bool = False, forks: int = None, processes: int = None, timeout: float = None, fail_fast: bool = False, durations_file: str = None, preconnect: bool = False, coalesce: bool = False, broker: str = None):
     # Always first because other files can use the modules
     add_work_dir_as_module()
 
@@ -29,6 +38,14 @@ def main(sequence_file: str, hosts: Union[str, List[str]] = 'all', config: str =
     add_tags_and_skip_tags(tags, skip_tags)
     add_extra_vars(extra_vars)
     set_verbose(verbose)
+    set_forks(forks)
+    set_processes(processes)
+    set_timeout(timeout)
+    set_fail_fast(fail_fast)
+    set_durations_file(durations_file)
+    set_preconnect(preconnect)
+    set_coalesce(coalesce)
+    set_broker(broker)
     ask_linux_password(linux_pass)
 
     # Should always be the last one to run
@@ -127,6 +144,97 @@ def set_verbose(verbose: int):
     config_module.verbose = verbose
 
 
+def set_forks(forks: int):
+    """
+    Sets the maximum amount of executors that run at the same time
+
+    Args:
+        forks (int): The amount of forks. None lets the sequence decide
+    """
+
+    config_module.forks = forks
+
+
+def set_processes(processes: int):
+    """
+    Sets the amount of worker processes the hosts are sharded over
+
+    Args:
+        processes (int): The amount of processes. None lets the sequence decide
+    """
+
+    config_module.processes = processes
+
+
+def set_timeout(timeout: float):
+    """
+    Sets the seconds an executor may run on a host
+
+    Args:
+        timeout (float): The timeout in seconds. None means executors can run forever
+    """
+
+    config_module.timeout = timeout
+
+
+def set_fail_fast(fail_fast: bool):
+    """
+    Sets if the run stops after the first executor that fails
+
+    Args:
+        fail_fast (bool): Stop after the first failure
+    """
+
+    config_module.fail_fast = fail_fast
+
+
+def set_durations_file(durations_file: str):
+    """
+    Sets the file in which the durations of the executors are kept between runs
+
+    Args:
+        durations_file (str): Path to the json file
+    """
+
+    config_module.durations_file = durations_file
+
+
+def set_preconnect(preconnect: bool):
+    """
+    Sets if the hosts are probed and connected to before the first executor runs
+
+    Args:
+        preconnect (bool): Connect to all the hosts first
+    """
+
+    config_module.preconnect = preconnect
+
+
+def set_coalesce(coalesce: bool):
+    """
+    Sets if consecutive executors run as one script on a host
+
+    Args:
+        coalesce (bool): Coalesce the executors
+    """
+
+    config_module.coalesce = coalesce
+
+
+def set_broker(broker: str):
+    """
+    Sets the connection broker the commands are sent to and starts it when it is not running
+
+    Args:
+        broker (str): Path to the unix socket of the broker
+    """
+
+    if broker:
+        BrokerClient(broker).start()
+
+    config_module.broker = broker
+
+
 def ask_linux_password(linux_pass):
     if linux_pass:
         password = getpass.getpass(prompt='Password for the linux user: ')
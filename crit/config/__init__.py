@@ -1,3 +1,4 @@
 from .host import Host, Localhost
+from .throttle import Throttle
 from .config_module import config
 from .general_config import GeneralConfig
@@ -1,7 +1,8 @@
-from typing import List, Dict
-from paramiko import SSHClient
+from threading import Event
+from typing import List
 from crit.config import Host
 from crit.config.general_config import GeneralConfig
+from crit.connections import ConnectionPool
 
 
 class Config(object):
@@ -12,23 +13,41 @@ class Config(object):
         hosts (List[Host]): The hosts that are used in the current run
         general_config (GeneralConfig): General config of crit. From the config.py file
         all_hosts (List[Host]): All the hosts found in the config file
-        channels (Dict[str, SSHClient]): The paramiko channels that are matched with the url
+        channels (ConnectionPool): The ssh connections to the hosts
         linux_password (str): Password for the linux user
         tags (List[str]): Tags to run
         skip_tags (List[str]): Tags to skip
         registry (list): The registry of conditional variables in the run
         verbose (int): Level of debugging
+        forks (int): The maximum amount of executors that run at the same time
+        processes (int): The amount of worker processes the hosts are sharded over
+        timeout (float): Seconds an executor may run on a host. Executors can overwrite this
+        fail_fast (bool): Stops the run after the first executor that fails
+        durations_file (str): Json file in which the durations of the executors are kept between runs
+        preconnect (bool): Probes and connects to all the hosts before the first executor runs
+        coalesce (bool): Runs consecutive single executors as one script on a host
+        broker (str): The unix socket of the connection broker the commands are sent to. Without it crit connects to the hosts itself
+        cancelled (Event): Is set when the run is cancelled. No executors are started after that
         sequence (crit.sequence.Sequence): The sequence that is running
     """
 
     hosts: List[Host] = []
     general_config: GeneralConfig = None
-    channels: Dict[str, SSHClient] = {}
+    channels: ConnectionPool = ConnectionPool()
     linux_password: str = None
     tags: List[str] = []
     skip_tags: List[str] = []
     registry: list = {}
     verbose: int = 0
+    forks: int = None
+    processes: int = None
+    timeout: float = None
+    fail_fast: bool = False
+    durations_file: str = None
+    preconnect: bool = False
+    coalesce: bool = False
+    broker: str = None
+    cancelled: Event = Event()
     sequence: 'crit.sequence.Sequence' = {}
 
     def get_registered(self, host: Host, item: str) -> 'crit.executors.Result':
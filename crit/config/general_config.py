@@ -1,8 +1,8 @@
-from typing import List
+from typing import List, Dict
 from dataclasses import dataclass
 from hvac import Client
 
-from crit.config import Host
+from crit.config import Host, Throttle
 
 
 @dataclass
@@ -13,7 +13,9 @@ class GeneralConfig:
     Args:
         hosts (List[Host]): Hosts on which crit can eventually run
         vault (Client): Vault client that will be used for all secrets
+        throttles (Dict[str, Throttle]): Limits on how many executors run at the same time. Executors use a throttle with its name. :obj:`optional`
     """
 
     hosts: List[Host]
     vault: Client = None
+    throttles: Dict[str, Throttle] = None
@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from crit.transports import BaseTransport, LocalTransport
 
 
 @dataclass(frozen=True)
@@ -11,10 +12,17 @@ class Host:
         url (str): The url of the host. :obj:`required`
         ssh_user (str): The user that will be used when ssh'ing into the host. :obj:`required`
         ssh_password (str): The password that will be used when ssh'ing into the host. :obj:`optional`
-        ssh_identity_file (str): The path to the private key. Defaults to :obj:`'~/.ssh/id_rsa'`
+        ssh_identity_file (str): The path to the private key. Rsa, ecdsa and ed25519 keys are supported. Use :obj:`None` to only use the ssh agent. Defaults to :obj:`'~/.ssh/id_rsa'`
         passwordless_user (bool): If the user has a sudo password. Defaults to :obj:`'False'`
         name (str): The name that will be displayed when using the cli commands. :obj:`optional`
         data (dict): Data specific for host. :obj:`optional`
+        max_sessions (int): The maximum amount of commands that run at the same time over the connection to the host. Keep this at or below the :obj:`MaxSessions` of the sshd of the host. Defaults to :obj:`10`
+        ssh_key_password (str): The password of the private key. :obj:`optional`
+        ssh_agent (bool): Also use the keys of the ssh agent next to the identity file. Without an identity file the ssh agent is always used. Defaults to :obj:`False`
+        ssh_port (int): The port of the ssh server. Defaults to :obj:`22`
+        keepalive (int): Seconds between the keepalive messages over the connection to the host. Use :obj:`0` to turn them off. Defaults to :obj:`30`
+        jump (Host): The bastion host the connection to this host goes through. All the hosts behind the same bastion share one connection to it. :obj:`optional`
+        transport (BaseTransport): Runs the commands of the host, for example :obj:`DockerTransport()`. Defaults to :obj:`SshTransport()`
     """
 
     url: str
@@ -24,6 +32,13 @@ class Host:
     passwordless_user: bool = False
     name: str = None
     data: dict = None
+    max_sessions: int = 10
+    ssh_key_password: str = None
+    ssh_agent: bool = False
+    ssh_port: int = 22
+    keepalive: int = 30
+    jump: 'Host' = None
+    transport: BaseTransport = None
 
     def __repr__(self):
         return self.name or self.url
@@ -37,6 +52,7 @@ class Localhost(Host):
 
     url: str = 'localhost'
     passwordless_user: bool = True
+    transport: BaseTransport = LocalTransport()
 
     # Added the try except for read the docs os.getlogin() needs permissions
     try:
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Throttle:
+    """
+    Limits how many executors with this throttle run at the same time. Executors use the throttle by its name in the :obj:`GeneralConfig`
+
+    Args:
+        limit (int): The maximum amount of executors that run at the same time. :obj:`required`
+        per_host (bool): The limit counts for every host on its own instead of for all the hosts together. Defaults to :obj:`False`
+    """
+
+    limit: int
+    per_host: bool = False
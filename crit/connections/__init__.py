@@ -0,0 +1,7 @@
+from .key_cache import KeyCache
+from .sudo_prompt import SudoPrompt
+from .channel_command import read_command
+from .remote_shell import RemoteShell
+from .remote_agent import RemoteAgent
+from .connection_pool import ConnectionPool
+from .broker import Broker, BrokerClient
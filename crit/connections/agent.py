@@ -0,0 +1,121 @@
+"""
+The agent that runs on the host for the :obj:`AgentTransport`. It is sent to the host as source and only uses the standard library of python 3.
+It reads one json request per line from stdin and writes one json response per line to stdout
+"""
+
+import base64
+import hashlib
+import json
+import os
+import pwd
+import signal
+import stat as stat_module
+import subprocess
+import sys
+
+
+def encode(data: bytes) -> str:
+    return base64.b64encode(data or b'').decode()
+
+
+def run(command: str, input: str = None, timeout: float = None, pty: bool = True) -> dict:
+    """
+    Runs the command in a shell. Without pty stderr is kept apart from the output
+    """
+
+    process = subprocess.Popen(
+        ['/bin/sh', '-c', command],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT if pty else subprocess.PIPE,
+        start_new_session=True
+    )
+
+    try:
+        output, errors = process.communicate(input.encode() if input else None, timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.communicate()
+
+        return {'output': '', 'timed_out': True}
+
+    return {'output': encode(output), 'stderr': encode(errors), 'exit_status': process.returncode, 'timed_out': False}
+
+
+def stat(path: str) -> dict:
+    """
+    Gets the type, owner and mode of a path and the sha256 of a file
+    """
+
+    try:
+        info = os.stat(path)
+    except OSError:
+        return {'exists': False}
+
+    response = {
+        'exists': True,
+        'is_dir': stat_module.S_ISDIR(info.st_mode),
+        'is_file': stat_module.S_ISREG(info.st_mode),
+        'mode': stat_module.S_IMODE(info.st_mode),
+        'uid': info.st_uid,
+        'gid': info.st_gid,
+        'size': info.st_size,
+    }
+
+    if response['is_file']:
+        try:
+            with open(path, 'rb') as file:
+                response['sha256'] = hashlib.sha256(file.read()).hexdigest()
+        except OSError:
+            pass
+
+    return response
+
+
+def package(name: str) -> dict:
+    """
+    Gets if a package is installed with dpkg and its version
+    """
+
+    process = subprocess.run(
+        ['dpkg-query', '-W', '-f', '${Status}\t${Version}', name],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    status, _, version = process.stdout.decode().partition('\t')
+
+    if process.returncode != 0 or status != 'install ok installed':
+        return {'installed': False}
+
+    return {'installed': True, 'version': version}
+
+
+def user(name: str) -> dict:
+    """
+    Gets if a user exists with its uid, home and shell
+    """
+
+    try:
+        entry = pwd.getpwnam(name)
+    except KeyError:
+        return {'exists': False}
+
+    return {'exists': True, 'uid': entry.pw_uid, 'gid': entry.pw_gid, 'home': entry.pw_dir, 'shell': entry.pw_shell}
+
+
+methods = {'run': run, 'stat': stat, 'package': package, 'user': user}
+
+
+def main():
+    # The first argument is the sentinel that tells crit the agent started
+    print(sys.argv[1], flush=True)
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+            response = methods[request['method']](**request.get('params', {}))
+        except Exception as e:
+            response = {'error': f'{e.__class__.__name__}: {e}'}
+
+        print(json.dumps(response), flush=True)
+
+
+if __name__ == '__main__':
+    main()
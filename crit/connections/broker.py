@@ -0,0 +1,256 @@
+import base64
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from threading import Lock, Thread
+
+from crit.config.host import Host
+from crit.connections.connection_pool import ConnectionPool
+from crit.connections.channel_command import read_command
+from crit.exceptions import BrokerException
+from crit.transports import BaseTransport
+
+
+def host_to_dict(host: Host) -> dict:
+    """
+    Turns the host into a dict that can be sent to the broker. The data of the host is not needed to connect and is left out
+    """
+
+    fields = {key: value for key, value in asdict(host).items() if key not in ['data', 'jump', 'transport']}
+    fields['jump'] = host_to_dict(host.jump) if host.jump else None
+
+    return fields
+
+
+def host_from_dict(fields: dict) -> Host:
+    """
+    Turns a dict of :obj:`host_to_dict` back into a host
+    """
+
+    return Host(**dict(fields, jump=host_from_dict(fields['jump']) if fields.get('jump') else None))
+
+
+class BrokerHandler(socketserver.StreamRequestHandler):
+    """
+    Handles one request of a crit run. A request is a json line with the host, the command, the input and the timeout
+    """
+
+    def handle(self):
+        broker = self.server.broker
+        line = self.rfile.readline()
+
+        # Checking if the broker is running connects without a request
+        if not line:
+            return
+
+        try:
+            response = broker.run(json.loads(line))
+        except Exception as e:
+            response = {'error': f'{e.__class__.__name__}: {e}'}
+
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class Broker:
+    """
+    Keeps the ssh connections to the hosts open between runs of crit, like the ControlPersist of OpenSSH.
+    Crit runs send their commands over a unix socket and the broker runs them over its connections. The broker stops after idle_timeout seconds without requests
+
+    Args:
+        path (str): The path of the unix socket. :obj:`required`
+        idle_timeout (float): Seconds without requests after which the broker stops. Defaults to :obj:`600`
+
+    Attributes:
+        pool (ConnectionPool): The connections to the hosts
+        running (int): The amount of commands that are running
+        last_request (float): When the last request came in
+    """
+
+    path: str = None
+    idle_timeout: float = 600
+    pool: ConnectionPool = None
+    running: int = 0
+    last_request: float = None
+
+    def __init__(self, path: str, idle_timeout: float = 600):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.pool = ConnectionPool(max_idle=idle_timeout)
+        self.running = 0
+        self.last_request = time.monotonic()
+        self.lock = Lock()
+
+    def serve(self):
+        """
+        Serves the requests till the broker is idle for idle_timeout seconds. Only the user that started the broker can use the socket
+        """
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        umask = os.umask(0o177)
+
+        try:
+            server = socketserver.ThreadingUnixStreamServer(self.path, BrokerHandler)
+        finally:
+            os.umask(umask)
+
+        server.daemon_threads = True
+        server.broker = self
+        Thread(target=server.serve_forever, daemon=True).start()
+
+        try:
+            while self.running or time.monotonic() - self.last_request < self.idle_timeout:
+                time.sleep(1)
+
+                if not self.running:
+                    self.pool.evict_idle()
+        finally:
+            server.shutdown()
+            server.server_close()
+            self.pool.close_all()
+            os.remove(self.path)
+
+    def run(self, request: dict) -> dict:
+        """
+        Runs a command on a host over the connection of the broker
+
+        Args:
+            request (dict): The host, command, input, timeout and pty of the command
+
+        Returns:
+            The output of the command in base64, if it timed out and if the password was incorrect
+        """
+
+        with self.lock:
+            self.running += 1
+            self.last_request = time.monotonic()
+
+        try:
+            return self.run_command(host_from_dict(request['host']), request['command'], request.get('input'), request.get('timeout'), request.get('pty', True))
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.last_request = time.monotonic()
+
+    def run_command(self, host: Host, command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Runs the command with :obj:`read_command` the same way :obj:`SingleExecutor.run_command` does
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+            password (str): The sudo password that is filled in when sudo asks for it. :obj:`optional`
+            timeout (float): Seconds after which the channel is closed. :obj:`optional`
+            pty (bool): Runs the command in a terminal. Without it stderr and the exit status are returned as well. Defaults to :obj:`True`
+
+        Returns:
+            The response for the crit run
+        """
+
+        if password and not self.pool.check_sudo(host, password):
+            return {'password_incorrect': True}
+
+        with self.pool.session(host):
+            stdin, stdout, stderr = self.pool.exec_command(host, command, pty)
+            response = read_command(stdin, stdout, stderr, password, timeout, pty)
+
+        for key in ['output', 'stderr']:
+            if key in response:
+                response[key] = base64.b64encode(response[key]).decode()
+
+        return response
+
+
+class BrokerClient(BaseTransport):
+    """
+    Sends the commands of a crit run to the broker
+
+    Args:
+        path (str): The path of the unix socket of the broker. :obj:`required`
+
+    Attributes:
+        sudo_prompt (bool): The broker answers the prompt of sudo, so sudo only reads the password when it asks for it
+    """
+
+    path: str = None
+    sudo_prompt = True
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def is_running(self) -> bool:
+        """
+        Checks if a broker listens on the socket
+        """
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.connect(self.path)
+
+            return True
+        except OSError:
+            return False
+
+    def start(self, idle_timeout: float = 600):
+        """
+        Starts a broker in the background when none is running. The broker keeps running after the crit run is done
+
+        Args:
+            idle_timeout (float): Seconds without requests after which the broker stops
+        """
+
+        if self.is_running():
+            return
+
+        subprocess.Popen(
+            [sys.executable, '-m', 'crit.commands.broker', '--socket', self.path, '--idle-timeout', str(idle_timeout)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+        )
+
+        for i in range(100):
+            if self.is_running():
+                return
+
+            time.sleep(0.1)
+
+        raise BrokerException(f'The broker did not start on {self.path}')
+
+    def exec_command(self, host: Host, command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Runs the command on the host through the broker
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+            password (str): The sudo password that is filled in when the command starts. :obj:`optional`
+            timeout (float): Seconds after which the command is stopped. :obj:`optional`
+            pty (bool): Runs the command in a terminal. Defaults to :obj:`True`
+
+        Returns:
+            The response of the broker with the output as bytes
+        """
+
+        request = {'host': host_to_dict(host), 'command': command, 'input': password, 'timeout': timeout, 'pty': pty}
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(self.path)
+            connection.sendall(json.dumps(request).encode() + b'\n')
+
+            with connection.makefile('rb') as response_file:
+                response = json.loads(response_file.readline())
+
+        if 'error' in response:
+            raise BrokerException(response['error'])
+
+        response['output'] = base64.b64decode(response.get('output', ''))
+
+        if 'stderr' in response:
+            response['stderr'] = base64.b64decode(response['stderr'])
+
+        return response
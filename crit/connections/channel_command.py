@@ -0,0 +1,67 @@
+from threading import Event, Thread, Timer
+
+from paramiko import ChannelFile
+
+from crit.connections.sudo_prompt import SudoPrompt
+
+
+def read_command(stdin: ChannelFile, stdout: ChannelFile, stderr: ChannelFile, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+    """
+    Reads a command that is started on a channel till it ends. The password prompt of sudo is answered on the way and the channel is closed
+    when the command runs longer than the timeout. Closing the channel stops the command and makes the reads return.
+    The channel is always closed at the end, so the session on the host is freed
+
+    Args:
+        stdin (ChannelFile): The stdin of the command. :obj:`required`
+        stdout (ChannelFile): The output of the command. :obj:`required`
+        stderr (ChannelFile): The stderr of the command. :obj:`required`
+        password (str): The sudo password that is filled in when sudo asks for it. :obj:`optional`
+        timeout (float): Seconds after which the channel is closed. :obj:`optional`
+        pty (bool): The command runs in a terminal. Without it stderr and the exit status are read as well. Defaults to :obj:`True`
+
+    Returns:
+        The response like the one of :obj:`BaseTransport.exec_command`
+    """
+
+    channel = stdout.channel
+    prompt = SudoPrompt(stdin, password, pty) if password else None
+    timed_out = Event()
+    timer = Timer(timeout, lambda: timed_out.set() or channel.close()) if timeout else None
+
+    if timer:
+        timer.start()
+
+    try:
+        if pty:
+            output = prompt.read(channel.recv) if prompt else stdout.read()
+            errors, exit_status = None, None
+        else:
+            # Nothing is written, so a command that reads stdin does not wait. With sudo the prompt closes stdin after the password
+            if not prompt:
+                channel.shutdown_write()
+
+            # Stderr is read at the same time, so a command with a lot of errors can not fill up the window of the channel
+            errors = []
+            reader = Thread(target=lambda: errors.append(prompt.read(stderr.channel.recv_stderr) if prompt else stderr.read()))
+            reader.start()
+
+            output = stdout.read()
+            reader.join()
+            errors = errors[0] if errors else b''
+            exit_status = channel.recv_exit_status()
+    finally:
+        if timer:
+            timer.cancel()
+
+        channel.close()
+
+    if prompt and (prompt.incorrect or (errors and b'Sorry, try again.' in errors)):
+        return {'password_incorrect': True}
+
+    if timed_out.is_set():
+        return {'output': b'', 'timed_out': True}
+
+    if pty:
+        return {'output': output, 'timed_out': False}
+
+    return {'output': output, 'stderr': errors, 'exit_status': exit_status, 'timed_out': False}
@@ -0,0 +1,368 @@
+import hashlib
+import time
+from threading import Lock, BoundedSemaphore
+from typing import Dict, List, Set
+
+import paramiko
+
+from crit.config.host import Host
+from crit.connections.key_cache import KeyCache
+from crit.connections.sudo_prompt import SudoPrompt
+from crit.connections.remote_shell import RemoteShell
+from crit.connections.remote_agent import RemoteAgent
+
+
+class ConnectionPool:
+    """
+    Keeps one ssh connection per host which is shared by all the executors that run on the host.
+    Executors that connect to the same host at the same time wait for each other, so only one connection is made.
+    Every command opens its own channel over the connection, so the commands on a host run at the same time till max_sessions of the host is reached.
+    Hosts with a jump host are connected through a tunnel over the pooled connection to the jump host
+
+    Args:
+        max_idle (float): Seconds a connection may be unused before :obj:`evict_idle` closes it. Defaults to :obj:`300`
+        retries (int): How many times connecting is tried again when a host that was connected before can not be reached. The first connection
+            to a host is not tried again, so a host that can not be reached fails right away. Defaults to :obj:`3`
+        backoff (float): Seconds to wait before the first retry. The wait doubles every retry. Defaults to :obj:`1`
+        connect_timeout (float): Seconds to wait for a connection when no timeout is given. Defaults to :obj:`10`
+
+    Attributes:
+        clients (Dict[str, paramiko.SSHClient]): The connected clients per host
+        last_used (Dict[str, float]): When the client of the host was last handed out
+        locks (Dict[str, Lock]): The lock per host that is held while connecting
+        sessions (Dict[str, BoundedSemaphore]): Limits the amount of open channels per host
+        shells (Dict[str, RemoteShell]): The shells and agents that keep running on the hosts for the :obj:`ShellTransport` and :obj:`AgentTransport`
+        sudo_checks (Dict[str, bool]): If the sudo password is correct per host and hash of the password
+        connected (Set[str]): The hosts that were connected before, of which a failed connection is tried again
+        keys (KeyCache): The private keys and known hosts that are shared by the connections
+    """
+
+    max_idle: float = 300
+    retries: int = 3
+    backoff: float = 1
+    connect_timeout: float = 10
+    clients: Dict[str, paramiko.SSHClient] = None
+    last_used: Dict[str, float] = None
+    locks: Dict[str, Lock] = None
+    sessions: Dict[str, BoundedSemaphore] = None
+    shells: Dict[str, RemoteShell] = None
+    sudo_checks: Dict[str, bool] = None
+    connected: Set[str] = None
+    keys: KeyCache = None
+
+    def __init__(self, max_idle: float = 300, retries: int = 3, backoff: float = 1, connect_timeout: float = 10):
+        self.max_idle = max_idle
+        self.retries = retries
+        self.backoff = backoff
+        self.connect_timeout = connect_timeout
+        self.clients = {}
+        self.last_used = {}
+        self.locks = {}
+        self.sessions = {}
+        self.shells = {}
+        self.sudo_checks = {}
+        self.connected = set()
+        self.keys = KeyCache()
+        self.lock = Lock()
+
+    def key(self, host: Host) -> str:
+        """
+        The key of the host in the pool
+        """
+
+        return f'{host.ssh_user}@{host.url}:{host.ssh_port}'
+
+    def lock_for(self, host: Host) -> Lock:
+        """
+        Gets the lock of the host
+        """
+
+        with self.lock:
+            return self.locks.setdefault(self.key(host), Lock())
+
+    def session(self, host: Host) -> BoundedSemaphore:
+        """
+        Gets the semaphore that has to be held while a channel to the host is open. Allows max_sessions of the host channels at the same time
+
+        Args:
+            host (Host): The host the channel is opened to
+
+        Returns:
+            The semaphore of the host
+        """
+
+        with self.lock:
+            return self.sessions.setdefault(self.key(host), BoundedSemaphore(host.max_sessions))
+
+    def shell(self, host: Host, sudo: bool = False, shell: str = 'sh', keep_state: bool = False) -> RemoteShell:
+        """
+        Gets the shell that keeps running on the host. The shell starts when the first command runs in it
+
+        Args:
+            host (Host): The host the shell runs on
+            sudo (bool): Gets the shell that runs with sudo. Defaults to :obj:`False`
+            shell (str): The shell that runs on the host. Defaults to :obj:`'sh'`
+            keep_state (bool): Gets the shell in which the working directory and variables carry over between commands. Defaults to :obj:`False`
+
+        Returns:
+            The shell of the host
+        """
+
+        key = f"{self.key(host)} {shell}{' sudo' if sudo else ''}{' state' if keep_state else ''}"
+
+        with self.lock:
+            if key not in self.shells:
+                self.shells[key] = RemoteShell(self, host, sudo, shell, keep_state)
+
+            return self.shells[key]
+
+    def agent(self, host: Host, sudo: bool = False, python: str = 'python3') -> RemoteAgent:
+        """
+        Gets the python agent that keeps running on the host. The agent starts with the first request
+
+        Args:
+            host (Host): The host the agent runs on
+            sudo (bool): Gets the agent that runs with sudo. Defaults to :obj:`False`
+            python (str): The python of the host. Defaults to :obj:`'python3'`
+
+        Returns:
+            The agent of the host
+        """
+
+        key = f"{self.key(host)} agent {python}{' sudo' if sudo else ''}"
+
+        with self.lock:
+            if key not in self.shells:
+                self.shells[key] = RemoteAgent(self, host, sudo, python)
+
+            return self.shells[key]
+
+    def check_sudo(self, host: Host, password: str) -> bool:
+        """
+        Checks the sudo password once per host with :obj:`sudo -v` before the first command with sudo runs. This also starts the timestamp of sudo
+        and shows the lecture of sudo, so they do not end up in the output of a command. Commands that check the same host at the same time wait for the first check
+
+        Args:
+            host (Host): The host to check the password on
+            password (str): The sudo password
+
+        Returns:
+            If the password is correct
+        """
+
+        key = f'{self.key(host)} sudo {hashlib.sha256(password.encode()).hexdigest()}'
+
+        with self.lock:
+            lock = self.locks.setdefault(key, Lock())
+
+        with lock:
+            if key not in self.sudo_checks:
+                with self.session(host):
+                    stdin, stdout, stderr = self.exec_command(host, f"{SudoPrompt.command(False)} -v", False)
+
+                    try:
+                        prompt = SudoPrompt(stdin, password, False)
+                        prompt.read(stderr.channel.recv_stderr)
+                    finally:
+                        stdout.channel.close()
+
+                self.sudo_checks[key] = not prompt.incorrect
+
+            return self.sudo_checks[key]
+
+    def get(self, host: Host, timeout: float = None, retries: int = None) -> paramiko.SSHClient:
+        """
+        Gets the client of the host. Connects when there is no client yet or when the connection of the client is dead
+
+        Args:
+            host (Host): The host to connect to
+            timeout (float): Seconds to wait for the connection. Defaults to the connect_timeout of the pool
+            retries (int): How many times connecting is tried again. Defaults to the retries of the pool for a host that was connected before and otherwise :obj:`0`
+
+        Returns:
+            Client which can run the commands
+        """
+
+        key = self.key(host)
+
+        with self.lock_for(host):
+            client = self.clients.get(key)
+
+            if client and not self.is_alive(client):
+                client.close()
+                client = None
+
+            if not client:
+                if retries is None:
+                    retries = self.retries if key in self.connected else 0
+
+                client = self.connect_with_retries(host, timeout or self.connect_timeout, retries)
+
+            with self.lock:
+                self.connected.add(key)
+                self.clients[key] = client
+                self.last_used[key] = time.monotonic()
+
+            return client
+
+    def exec_command(self, host: Host, command: str, pty: bool = True) -> tuple:
+        """
+        Starts the command on the host. When the connection turns out to be dead the client is replaced and the command is started once more
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+            pty (bool): Runs the command in a terminal. Defaults to :obj:`True`
+
+        Returns:
+            The stdin, stdout and stderr of the command
+        """
+
+        try:
+            return self.get(host).exec_command(command, get_pty=pty)
+        except (OSError, EOFError, paramiko.SSHException):
+            self.close(host)
+
+            return self.get(host).exec_command(command, get_pty=pty)
+
+    def connect_with_retries(self, host: Host, timeout: float, retries: int) -> paramiko.SSHClient:
+        """
+        Connects to the host and tries again with an exponential backoff when the host can not be reached.
+        Wrong credentials and host keys are not tried again
+
+        Args:
+            host (Host): The host to connect to
+            timeout (float): Seconds to wait for the connection
+            retries (int): How many times connecting is tried again
+
+        Returns:
+            The connected client
+        """
+
+        for attempt in range(retries + 1):
+            try:
+                return self.connect(host, timeout)
+            except (paramiko.AuthenticationException, paramiko.BadHostKeyException):
+                raise
+            except (OSError, EOFError, paramiko.SSHException):
+                if attempt == retries:
+                    raise
+
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def connect(self, host: Host, timeout: float = None) -> paramiko.SSHClient:
+        """
+        Makes a new connection to the host. Only the identity file from the key cache and the ssh agent are used, paramiko does not look for keys on disk itself
+
+        Args:
+            host (Host): The host to connect to
+            timeout (float): Seconds to wait for the connection. :obj:`optional`
+
+        Returns:
+            The connected client
+        """
+
+        client = paramiko.SSHClient()
+        client.get_host_keys().update(self.keys.host_keys())
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(hostname=host.url, port=host.ssh_port, username=host.ssh_user, password=host.ssh_password,
+                       pkey=self.keys.private_key(host.ssh_identity_file, host.ssh_key_password) if host.ssh_identity_file else None,
+                       allow_agent=host.ssh_agent or not host.ssh_identity_file, look_for_keys=False, timeout=timeout, sock=self.tunnel(host, timeout))
+
+        # Keepalives stop firewalls and NAT from dropping the connection between executors and show when it is dead
+        if host.keepalive:
+            client.get_transport().set_keepalive(host.keepalive)
+
+        return client
+
+    def tunnel(self, host: Host, timeout: float = None) -> paramiko.Channel:
+        """
+        Opens a tunnel to the host over the connection to its jump host
+
+        Args:
+            host (Host): The host to connect to
+            timeout (float): Seconds to wait for the tunnel. :obj:`optional`
+
+        Returns:
+            The tunnel or None if the host has no jump host
+        """
+
+        if not host.jump:
+            return None
+
+        transport = self.get(host.jump, timeout).get_transport()
+
+        return transport.open_channel('direct-tcpip', (host.url, host.ssh_port), ('127.0.0.1', 0), timeout=timeout)
+
+    def is_alive(self, client: paramiko.SSHClient) -> bool:
+        """
+        Checks if the connection of the client can still be used
+        """
+
+        transport = client.get_transport()
+
+        return transport is not None and transport.is_active()
+
+    def evict_idle(self, hosts: List[Host] = None):
+        """
+        Closes the clients that are not used for max_idle seconds. Only call this when no executors are running on the hosts
+
+        Args:
+            hosts (List[Host]): Closes the clients of these hosts even if they are not idle. :obj:`optional`
+        """
+
+        now = time.monotonic()
+        keys = [self.key(host) for host in hosts or []]
+
+        with self.lock:
+            idle = [key for key, used in self.last_used.items() if key in keys or now - used > self.max_idle]
+
+        for key in idle:
+            self.close_key(key)
+
+    def close(self, host: Host):
+        """
+        Closes the client of the host
+        """
+
+        self.close_key(self.key(host))
+
+    def close_key(self, key: str):
+        """
+        Closes the client with the key in the pool and the shells over it
+        """
+
+        with self.lock:
+            client = self.clients.pop(key, None)
+            self.last_used.pop(key, None)
+            shells = [self.shells.pop(shell) for shell in list(self.shells) if shell.startswith(key + ' ')]
+
+        for shell in shells:
+            shell.close()
+
+        if client:
+            client.close()
+
+    def close_all(self):
+        """
+        Closes the clients of all the hosts
+        """
+
+        with self.lock:
+            clients = list(self.clients.values())
+            shells = list(self.shells.values())
+            self.clients = {}
+            self.last_used = {}
+            self.shells = {}
+
+        for shell in shells:
+            shell.close()
+
+        for client in clients:
+            client.close()
+
+    def __contains__(self, host: Host) -> bool:
+        return self.key(host) in self.clients
+
+    def __len__(self) -> int:
+        return len(self.clients)
@@ -0,0 +1,88 @@
+import os
+from threading import Lock
+from typing import Dict, Tuple
+
+import paramiko
+
+
+class KeyCache:
+    """
+    Loads the private keys and the known hosts once and shares them between all the connections of a run.
+    Supports rsa, ecdsa and ed25519 keys
+
+    Args:
+        known_hosts_file (str): The known hosts file of the system. Defaults to :obj:`'~/.ssh/known_hosts'`
+
+    Attributes:
+        keys (Dict[Tuple[str, str], paramiko.PKey]): The loaded private keys per path and password
+        known_hosts (paramiko.HostKeys): The loaded known hosts
+    """
+
+    key_types = [paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey]
+
+    known_hosts_file: str = '~/.ssh/known_hosts'
+    keys: Dict[Tuple[str, str], paramiko.PKey] = None
+    known_hosts: paramiko.HostKeys = None
+
+    def __init__(self, known_hosts_file: str = '~/.ssh/known_hosts'):
+        self.known_hosts_file = known_hosts_file
+        self.keys = {}
+        self.lock = Lock()
+
+    def private_key(self, path: str, password: str = None) -> paramiko.PKey:
+        """
+        Gets the private key in the file. The file is only read and decrypted the first time
+
+        Args:
+            path (str): The path to the private key
+            password (str): The password of the private key. :obj:`optional`
+
+        Returns:
+            The private key
+        """
+
+        with self.lock:
+            if (path, password) not in self.keys:
+                self.keys[(path, password)] = self.load_private_key(os.path.expanduser(path), password)
+
+            return self.keys[(path, password)]
+
+    def load_private_key(self, path: str, password: str = None) -> paramiko.PKey:
+        """
+        Reads the private key with the first key type that can read it
+
+        Args:
+            path (str): The path to the private key
+            password (str): The password of the private key. :obj:`optional`
+
+        Returns:
+            The private key
+        """
+
+        for key_type in self.key_types[:-1]:
+            try:
+                return key_type.from_private_key_file(path, password)
+            except paramiko.SSHException:
+                pass
+
+        # The error of the last key type is shown when none of the types can read the key
+        return self.key_types[-1].from_private_key_file(path, password)
+
+    def host_keys(self) -> paramiko.HostKeys:
+        """
+        Gets the known hosts of the system. The file is only read the first time
+
+        Returns:
+            The known hosts
+        """
+
+        with self.lock:
+            if self.known_hosts is None:
+                self.known_hosts = paramiko.HostKeys()
+
+                try:
+                    self.known_hosts.load(os.path.expanduser(self.known_hosts_file))
+                except IOError:
+                    pass
+
+            return self.known_hosts
@@ -0,0 +1,85 @@
+import base64
+import inspect
+import json
+import time
+
+import paramiko
+
+from crit.config.host import Host
+from crit.connections import agent
+from crit.connections.remote_shell import RemoteShell
+
+
+class RemoteAgent(RemoteShell):
+    """
+    A small python agent that keeps running on a host over the pooled connection. The agent is sent to the host when it starts, so the host
+    only needs python 3. A request is one line of json and the agent answers with one line of json, which holds the exit status, output and stderr
+    of a command or the state of a file, package or user. It starts and holds its session the same way as the :obj:`RemoteShell`
+
+    Args:
+        pool (ConnectionPool): The pool with the connection to the host. :obj:`required`
+        host (Host): The host the agent runs on. :obj:`required`
+        sudo (bool): Starts the agent with sudo, so all the requests run as root. Defaults to :obj:`False`
+        python (str): The python of the host. Defaults to :obj:`'python3'`
+
+    Attributes:
+        source (str): The source of the agent in base64
+    """
+
+    source: str = base64.b64encode(inspect.getsource(agent).encode()).decode()
+
+    def __init__(self, pool: 'crit.connections.ConnectionPool', host: Host, sudo: bool = False, python: str = 'python3'):
+        super().__init__(pool, host, sudo, python)
+
+    def call(self, method: str, params: dict = None, timeout: float = None, shell_password: str = None) -> dict:
+        """
+        Sends a request to the agent and starts the agent when it is not running
+
+        Args:
+            method (str): The method of the agent, which is :obj:`run`, :obj:`stat`, :obj:`package` or :obj:`user`
+            params (dict): The parameters of the method. :obj:`optional`
+            timeout (float): Seconds after which the agent is closed. The next request starts a new agent. :obj:`optional`
+            shell_password (str): The password sudo asks for when an agent with sudo starts. :obj:`optional`
+
+        Returns:
+            The response of the agent, :obj:`timed_out` when it did not answer in time, :obj:`password_incorrect` when it could not start with sudo
+            or :obj:`error` when the request failed
+        """
+
+        deadline = time.monotonic() + timeout if timeout else None
+
+        with self.lock:
+            try:
+                if not self.is_alive() and not self.open(shell_password, deadline):
+                    return {'password_incorrect': True}
+
+                self.channel.sendall((json.dumps({'method': method, 'params': params or {}}) + '\n').encode())
+                output, errors = self.read(lambda output, errors: output.endswith(b'\n'), deadline)
+            except TimeoutError:
+                self.close()
+
+                return {'timed_out': True}
+            except (OSError, EOFError, paramiko.SSHException) as e:
+                self.close()
+
+                return {'error': f'{e.__class__.__name__}: {e}'}
+
+            if not output.endswith(b'\n'):
+                self.close()
+
+                return {'error': errors.decode().strip() or 'The agent stopped'}
+
+        return json.loads(output)
+
+    def startup_command(self, sentinel: str) -> str:
+        """
+        The command that starts the agent from its source. The agent prints the sentinel when it is ready
+
+        Args:
+            sentinel (str): The sentinel to print
+
+        Returns:
+            The command
+        """
+
+        return f"{self.shell} -c \"import base64; exec(base64.b64decode('{self.source}'))\" {sentinel}"
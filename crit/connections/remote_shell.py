@@ -0,0 +1,237 @@
+import re
+import select
+import time
+from threading import Lock, BoundedSemaphore
+from typing import Callable, Tuple
+from uuid import uuid4
+
+import paramiko
+
+from crit.config.host import Host
+
+
+class RemoteShell:
+    """
+    A shell that keeps running on a host over the pooled connection. The commands are written to the stdin of the shell one after another
+    and the end of their output is found by a sentinel with the exit status, so a command costs no channel and no shell startup.
+    By default every command runs in a subshell, so a :obj:`cd` or variable of one command does not change the next one. With keep_state the commands
+    run in the shell itself, so the working directory and exported variables carry over to the next command. One command runs at a time and the shell holds
+    one of the max_sessions of the host while it runs
+
+    Args:
+        pool (ConnectionPool): The pool with the connection to the host. :obj:`required`
+        host (Host): The host the shell runs on. :obj:`required`
+        sudo (bool): Starts the shell with sudo, so all the commands run as root. Defaults to :obj:`False`
+        shell (str): The shell that runs on the host. Defaults to :obj:`'sh'`
+        keep_state (bool): Runs the commands in the shell itself instead of a subshell. A command that calls :obj:`exit` stops the shell. Defaults to :obj:`False`
+
+    Attributes:
+        channel (paramiko.Channel): The channel of the shell
+        lock (Lock): Is held while a command runs in the shell
+        session (BoundedSemaphore): The session of the host the shell holds while it runs
+    """
+
+    pool: 'crit.connections.ConnectionPool' = None
+    host: Host = None
+    sudo: bool = False
+    shell: str = 'sh'
+    keep_state: bool = False
+    channel: paramiko.Channel = None
+    session: BoundedSemaphore = None
+
+    def __init__(self, pool: 'crit.connections.ConnectionPool', host: Host, sudo: bool = False, shell: str = 'sh', keep_state: bool = False):
+        self.pool = pool
+        self.host = host
+        self.sudo = sudo
+        self.shell = shell
+        self.keep_state = keep_state
+        self.lock = Lock()
+
+    def run(self, command: str, password: str = None, timeout: float = None, pty: bool = True, shell_password: str = None) -> dict:
+        """
+        Runs the command in the shell and starts the shell when it is not running
+
+        Args:
+            command (str): The command
+            password (str): The sudo password, which is the stdin of the command. :obj:`optional`
+            timeout (float): Seconds after which the shell is closed. The next command starts a new shell. :obj:`optional`
+            pty (bool): Mixes stderr with the output like a terminal does. Defaults to :obj:`True`
+            shell_password (str): The password sudo asks for when a shell with sudo starts. :obj:`optional`
+
+        Returns:
+            The response like the one of :obj:`BaseTransport.exec_command`
+        """
+
+        deadline = time.monotonic() + timeout if timeout else None
+        sentinel = f'crit-{uuid4().hex}'
+        exit_status = re.compile(rf'\n{sentinel} (\d+)\n$'.encode())
+        errors_end = f'\n{sentinel}\n'.encode()
+
+        def done(output: bytes, errors: bytes) -> bool:
+            return exit_status.search(output) is not None and errors.endswith(errors_end)
+
+        with self.lock:
+            try:
+                if not self.is_alive() and not self.open(shell_password, deadline):
+                    return {'password_incorrect': True}
+
+                stdin = f"<<'{sentinel}'\n{password}\n{sentinel}" if password else '< /dev/null'
+                group = f'{{ {command}\n}}' if self.keep_state else f'( {command} )'
+                self.channel.sendall((
+                    f"{group}{' 2>&1' if pty else ''} {stdin}\n"
+                    f"printf '\\n{sentinel} %d\\n' $?; printf '\\n{sentinel}\\n' >&2\n"
+                ).encode())
+
+                output, errors = self.read(done, deadline)
+            except TimeoutError:
+                self.close()
+
+                return {'output': b'', 'timed_out': True}
+            except (OSError, EOFError, paramiko.SSHException) as e:
+                self.close()
+                output, errors = b'', f'Failed to run the command in the shell: {e}\n'.encode()
+
+            if not done(output, errors):
+                # The shell stopped in the middle of the command, so the output is what came before that
+                self.close()
+
+                return self.response(output + errors if pty else output, errors, -1, password, pty)
+
+        match = exit_status.search(output)
+
+        return self.response(output[:match.start()], errors[:-len(errors_end)], int(match.group(1)), password, pty)
+
+    def response(self, output: bytes, errors: bytes, exit_status: int, password: str, pty: bool) -> dict:
+        """
+        Creates the response of a command
+
+        Returns:
+            The response like the one of :obj:`BaseTransport.exec_command`
+        """
+
+        if password and b'Sorry, try again.' in output + errors:
+            return {'password_incorrect': True}
+
+        if pty:
+            return {'output': output, 'timed_out': False}
+
+        return {'output': output, 'stderr': errors, 'exit_status': exit_status, 'timed_out': False}
+
+    def open(self, password: str = None, deadline: float = None) -> bool:
+        """
+        Starts the shell on the host. The shell prints a sentinel when it started, so a shell with sudo knows if sudo asks for the password
+
+        Args:
+            password (str): The password for sudo. :obj:`optional`
+            deadline (float): The monotonic time after which starting the shell times out. :obj:`optional`
+
+        Returns:
+            If the shell started. It does not start when sudo asks for a password that is missing or incorrect
+
+        Raises:
+            EOFError: When the shell stopped before it started
+        """
+
+        sentinel = f'crit-{uuid4().hex}'
+        prompt = f'{sentinel}-password:'
+        command = self.startup_command(sentinel)
+
+        if self.sudo:
+            command = f"sudo -S -p '{prompt}' " + command
+
+        self.session = self.pool.session(self.host)
+        self.session.acquire()
+
+        try:
+            self.channel = self.pool.get(self.host).get_transport().open_session()
+            self.channel.exec_command(command)
+        except Exception:
+            self.close()
+            raise
+
+        started = f'{sentinel}\n'.encode()
+        asked = False
+
+        while True:
+            output, errors = self.read(lambda output, errors: started in output or prompt.encode() in errors, deadline)
+
+            if started in output:
+                return True
+
+            if prompt.encode() not in errors:
+                raise EOFError(errors.decode().strip() or 'The shell stopped while starting')
+
+            if asked or not password:
+                self.close()
+
+                return False
+
+            asked = True
+            self.channel.sendall((password + '\n').encode())
+
+    def startup_command(self, sentinel: str) -> str:
+        """
+        The command that starts the shell and prints the sentinel when it is ready
+
+        Args:
+            sentinel (str): The sentinel to print
+
+        Returns:
+            The command
+        """
+
+        return f"{self.shell} -c 'echo {sentinel}; exec {self.shell}'"
+
+    def read(self, done: Callable[[bytes, bytes], bool], deadline: float = None) -> Tuple[bytes, bytes]:
+        """
+        Reads stdout and stderr of the shell till they are done
+
+        Args:
+            done (Callable[[bytes, bytes], bool]): Checks if the output and errors that are read are complete
+            deadline (float): The monotonic time after which reading times out. :obj:`optional`
+
+        Returns:
+            The output and the errors. They are not complete when the shell stopped
+
+        Raises:
+            TimeoutError: When the deadline passed
+        """
+
+        output, errors = b'', b''
+
+        while not done(output, errors):
+            if self.channel.recv_ready():
+                output += self.channel.recv(32768)
+            elif self.channel.recv_stderr_ready():
+                errors += self.channel.recv_stderr(32768)
+            elif self.channel.closed or self.channel.exit_status_ready():
+                return output, errors
+            else:
+                remaining = deadline - time.monotonic() if deadline else None
+
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError()
+
+                select.select([self.channel], [], [], remaining)
+
+        return output, errors
+
+    def is_alive(self) -> bool:
+        """
+        Checks if the shell is still running
+        """
+
+        return self.channel is not None and not self.channel.closed and not self.channel.exit_status_ready()
+
+    def close(self):
+        """
+        Stops the shell by closing its channel and frees its session
+        """
+
+        if self.channel:
+            self.channel.close()
+            self.channel = None
+
+        if self.session:
+            self.session.release()
+            self.session = None
@@ -0,0 +1,133 @@
+from typing import Callable
+
+from paramiko import ChannelFile
+
+
+class SudoPrompt:
+    """
+    Answers the password prompt of sudo while the output of a command is read. Sudo is started with a known prompt, so the password is written
+    as soon as sudo asks for it instead of after a fixed wait, and it is not written at all when sudo reuses its timestamp. A second prompt means the password was incorrect
+
+    Args:
+        stdin (ChannelFile): The stdin of the command. :obj:`required`
+        password (str): The sudo password. :obj:`required`
+        pty (bool): The command runs in a terminal, where sudo prints the prompt on the output instead of on stderr. Defaults to :obj:`True`
+
+    Attributes:
+        prompt (str): The prompt sudo prints when it asks for the password
+        answered (bool): If the password is written
+        incorrect (bool): If sudo asked again after the password was written
+        pending (bytes): The end of the read data which can be the start of the prompt
+    """
+
+    prompt: str = 'crit-sudo-password:'
+
+    stdin: ChannelFile = None
+    password: str = None
+    pty: bool = True
+    answered: bool = False
+    incorrect: bool = False
+    pending: bytes = b''
+
+    def __init__(self, stdin: ChannelFile, password: str, pty: bool = True):
+        self.stdin = stdin
+        self.password = password
+        self.pty = pty
+
+    @classmethod
+    def command(cls, pty: bool = True) -> str:
+        """
+        Gets the sudo command that prints the prompt. Without a terminal sudo reads the password from stdin
+
+        Args:
+            pty (bool): The command runs in a terminal. Defaults to :obj:`True`
+
+        Returns:
+            The sudo command
+        """
+
+        return f"sudo {'' if pty else '-S '}-p '{cls.prompt}'"
+
+    def read(self, receive: Callable[[int], bytes]) -> bytes:
+        """
+        Reads the output of the command till it ends and answers the prompt on the way
+
+        Args:
+            receive (Callable[[int], bytes]): Receives the next data of the command, like :obj:`Channel.recv`. Returns no data when the output ended
+
+        Returns:
+            The output without the prompt. When the password is incorrect the output till the second prompt
+        """
+
+        output = b''
+
+        while not self.incorrect:
+            data = receive(32768)
+
+            if not data:
+                break
+
+            output += self.feed(data)
+
+        return output + self.end()
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        Looks for the prompt in the next data of the command and answers it
+
+        Args:
+            data (bytes): The data that is read
+
+        Returns:
+            The data without the prompt. The end that can be the start of the prompt is kept till the next data
+        """
+
+        prompt = self.prompt.encode()
+        data = self.pending + data
+        output = b''
+
+        while prompt in data and not self.incorrect:
+            before, _, data = data.partition(prompt)
+            output += before
+            self.answer()
+
+        if self.incorrect:
+            self.pending = b''
+
+            return output
+
+        kept = next((size for size in range(min(len(prompt) - 1, len(data)), 0, -1) if prompt.startswith(data[-size:])), 0)
+        self.pending = data[len(data) - kept:]
+
+        return output + data[:len(data) - kept]
+
+    def end(self) -> bytes:
+        """
+        Gets the data that was kept because it could be the start of the prompt
+        """
+
+        pending, self.pending = self.pending, b''
+
+        return pending
+
+    def answer(self):
+        """
+        Writes the password when sudo asks for it the first time. In a terminal the command is interrupted when sudo asks again.
+        Without a terminal stdin is closed after the password, so sudo stops by itself when the password is incorrect
+        """
+
+        if self.answered:
+            self.incorrect = True
+
+            if self.pty:
+                self.stdin.write(chr(3))
+                self.stdin.flush()
+
+            return
+
+        self.answered = True
+        self.stdin.write(self.password + '\n')
+        self.stdin.flush()
+
+        if not self.pty:
+            self.stdin.channel.shutdown_write()
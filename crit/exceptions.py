@@ -58,3 +58,63 @@ class NotBaseExecutorTypeException(Exception):
     """
 
     msg = 'The executor does not inherit BaseExecutor'
+
+
+class ExecutorDependencyException(Exception):
+    """
+    Gets thrown when the after of an executor contains an executor that is not before it in the sequence or when the executors depend on each other
+    """
+
+    executor: 'BaseExecutor' = None
+    dependency: 'BaseExecutor' = None
+
+    def __init__(self, executor: 'BaseExecutor' = None, dependency: 'BaseExecutor' = None):
+        self.executor = executor
+        self.dependency = dependency
+
+        if executor:
+            self.msg = f'{repr(executor)} runs after {repr(dependency)} which is not in the same part of the sequence'
+        else:
+            self.msg = 'The executors in the sequence depend on each other'
+
+
+class ThrottleNotFoundException(Exception):
+    """
+    Gets thrown when an executor uses a throttle that is not in the general config
+    """
+
+    executor: 'BaseExecutor' = None
+
+    def __init__(self, executor: 'BaseExecutor'):
+        self.executor = executor
+        self.msg = f'{repr(executor)} uses the throttle {executor.throttle} which is not in the throttles of the general config'
+
+
+class BrokerException(Exception):
+    """
+    Gets thrown when the connection broker can not be reached or could not run the command
+    """
+
+    def __init__(self, msg: str):
+        self.msg = msg
+
+
+class ItemsNotSupportedException(Exception):
+    """
+    Gets thrown when an executor gets items that are not a dict while it does not know which field an item fills in
+    """
+
+    executor: 'BaseExecutor' = None
+
+    def __init__(self, executor: 'BaseExecutor'):
+        self.executor = executor
+        self.msg = f'{repr(executor)} has no item_field, so its items have to be dicts with the fields of the executor'
+
+
+class ProcessesNotSupportedException(Exception):
+    """
+    Gets thrown when a sequence that runs on the event loop should shard its hosts over worker processes
+    """
+
+    def __init__(self):
+        self.msg = 'The hosts can not be sharded over worker processes when the sequence runs on the event loop, run it with run() instead of run_async()'
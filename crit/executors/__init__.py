@@ -2,3 +2,5 @@ from .base_executor import BaseExecutor
 from .single_executor import SingleExecutor
 from .result import Result
 from .multi_executor import MultiExecutor
+from .barrier_executor import BarrierExecutor
+from .coalesced_executor import CoalescedExecutor
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from crit.executors import BaseExecutor
+from .result import Result, Status
+
+
+@dataclass
+class BarrierExecutor(BaseExecutor):
+    """
+    Marks a point in the sequence that every host has to reach before any host continues.
+    It only has an effect when the sequence runs with the :obj:`Strategy.FREE` strategy, the linear strategy already waits for every host after each executor
+    """
+
+    def execute(self, **kwargs) -> Result:
+        return Result(Status.SUCCESS)
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
 from typing import List, Dict
@@ -18,11 +20,16 @@ class BaseExecutor(metaclass=ABCMeta):
         register (str): Registers the output of the executor to the register. :obj:`optional`
         env (Dict[str, str]): Add the env variables to the command. :obj:`optional`
         chdir (str): Directory in which executor will go before executing its command. :obj:`optional`
+        timeout (float): Seconds the executor may run on a host before its channel is closed and the host fails. Defaults to the :obj:`--timeout` of the cli
+        throttle (str): The name of the throttle in the general config that limits how many of these executors run at the same time. :obj:`optional`
+        after (List[BaseExecutor]): The executors of the sequence this executor waits for. Executors that do not depend on each other run at the same time on a host. Without after the executor waits for all the executors before it. :obj:`optional`
         host (Host): DO NOT USE THIS. This is used for the multi executor but should be used with the get_base_attributes function. The host on which the executor is running. :obj:`Not Usable`
 
 
     Attributes:
         result (Result): The result of the execution
+        duration (float): Seconds the execution took
+        position (int): The place of the executor in its sequence, which keeps executors without a name apart in the durations
     """
 
     name: str = ''
@@ -32,10 +39,15 @@ class BaseExecutor(metaclass=ABCMeta):
     register: str = None
     env: Dict[str, str] = None
     chdir: str = None
+    timeout: float = None
+    throttle: str = None
+    after: List['BaseExecutor'] = None
 
     # Attributes
     host: Host = None
     result = None
+    duration = None
+    position = None
 
     @abstractmethod
     def execute(self, **kwargs) -> 'Result':
@@ -51,6 +63,19 @@ class BaseExecutor(metaclass=ABCMeta):
 
         pass
 
+    async def execute_async(self, **kwargs) -> 'Result':
+        """
+        The function that will execute the tasks of the executor on the event loop. By default it runs :obj:`execute` in the default executor of the loop
+
+        Args:
+            **kwargs:
+
+        Returns:
+            The result of the execution
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: self.execute(**kwargs))
+
     def run(self):
         """
         The function ran when start is called. This is behaviour of thread
@@ -60,10 +85,37 @@ class BaseExecutor(metaclass=ABCMeta):
         if not_in_config:
             return not_in_config
 
+        start = time.monotonic()
         self.result = self.execute()
+        self.duration = time.monotonic() - start
+
+        self.register_result()
+
+    async def run_async(self):
+        """
+        Same as :obj:`run` but for the asyncio engine of the sequence
+        """
+
+        not_in_config = self.not_in_config_hosts()
+        if not_in_config:
+            return not_in_config
+
+        start = time.monotonic()
+        self.result = await self.execute_async()
+        self.duration = time.monotonic() - start
 
         self.register_result()
 
+    def get_timeout(self) -> float:
+        """
+        Gets the timeout of the executor. The timeout of the executor goes before the timeout of the cli
+
+        Returns:
+            The timeout in seconds or None if there is no timeout
+        """
+
+        return self.timeout or config.timeout
+
     def not_in_config_hosts(self):
         """
         Checks if the host of the executor is in config or if it is localhost
@@ -0,0 +1,168 @@
+import re
+from dataclasses import dataclass, field
+from typing import List
+from uuid import uuid4
+from crit.exceptions import SingleExecutorFailedException
+from crit.executors import SingleExecutor
+from .result import Result, Status
+
+
+@dataclass
+class CoalescedExecutor(SingleExecutor):
+    """
+    Runs consecutive single executors as one script on the host, so they cost one round trip instead of one per executor.
+    Every command in the script is followed by a marker with its exit status, which is used to split the output back into a result per executor.
+    The script stops at the first command that exits with an error. An executor in a terminal can also fail on the error lines in its output, which the script
+    can not see, so the script ends after it and the next script only runs when it did not fail. The sequence creates these executors when it runs with :obj:`coalesce`
+
+    Args:
+        executors (List[SingleExecutor]): The executors that run in the script. :obj:`required`
+
+    Attributes:
+        marker (str): The unique string the output of the commands is split on
+        pending (List[SingleExecutor]): The executors that run in the next script
+        commands_of_pending (List[str]): The command of every pending executor
+    """
+
+    executors: List[SingleExecutor] = None
+    pty: bool = False
+
+    # Attributes
+    marker: str = field(default=None, init=False, repr=False, compare=False)
+    pending: List[SingleExecutor] = field(default=None, init=False, repr=False, compare=False)
+    commands_of_pending: List[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def commands(self) -> str:
+        """
+        The script with the commands of the pending executors. The commands run in a subshell, so a chdir or env does not leak into the next command.
+        The stderr of an executor that runs in a terminal normally is mixed with its output
+        """
+
+        lines = []
+        transport = self.get_transport()
+        self.commands_of_pending = []
+
+        for index, executor in enumerate(self.pending):
+            command = executor.build_command(executor.get_sudo_command(transport))
+            self.commands_of_pending.append(command)
+
+            lines.append(f'( {command} )' + (' 2>&1' if executor.pty else ''))
+            lines.append(f"status=$?; printf '\\n{self.marker} {index} %d\\n' $status; printf '\\n{self.marker} {index}\\n' >&2")
+            # The output of an executor in a terminal decides if it failed, so the rest runs in the next script
+            lines.append('exit $status' if executor.pty else '[ $status -eq 0 ] || exit $status')
+
+        return '\n'.join(lines)
+
+    def execute(self, exception_on_error: bool = False, **kwargs) -> Result:
+        """
+        Runs the executors in scripts till all of them ran or one failed. Executors that need the linux password run one by one,
+        because sudo would read the password from the same stdin for every command
+
+        Args:
+            exception_on_error (bool): Throws an exception on error. Can be used in other BaseExecutors
+        """
+
+        for executor in self.executors:
+            executor.host = self.host
+
+        pending = self.executors
+
+        if any(executor.needs_password() for executor in pending):
+            for executor in pending:
+                executor.run()
+        else:
+            while pending:
+                pending = self.run_script(pending)
+
+        result = self.combined_result()
+
+        if result.status == Status.FAIL and exception_on_error:
+            raise SingleExecutorFailedException(self, result)
+
+        return result
+
+    async def execute_async(self, **kwargs) -> Result:
+        """
+        Runs :obj:`execute` in the default executor of the loop, because the scripts are split in between
+        """
+
+        return await super(SingleExecutor, self).execute_async(**kwargs)
+
+    def run_script(self, pending: List[SingleExecutor]) -> List[SingleExecutor]:
+        """
+        Runs the pending executors in one script and gives every executor that finished its result
+
+        Args:
+            pending (List[SingleExecutor]): The executors that did not run yet
+
+        Returns:
+            The executors that still have to run. This is the rest of the executors when the script stopped after an executor in a terminal
+            or on an exit status that the executor does not see as a failure
+        """
+
+        self.marker = f'crit-{uuid4().hex}'
+        self.pending = pending
+
+        result = self.run_command()
+
+        outputs = re.split(rf'\n{self.marker} (\d+) (\d+)\n', '\n'.join(result.stdout or []))
+        errors = re.split(rf'\n{self.marker} \d+\n', '\n'.join(result.stderr or []))
+        finished = (len(outputs) - 1) // 3
+
+        for index in range(finished):
+            executor = pending[index]
+            output = outputs[index * 3].encode()
+            exit_status = int(outputs[index * 3 + 2])
+            command = self.commands_of_pending[index]
+
+            if executor.pty:
+                executor.result = executor.result_from_output(command, output)
+            else:
+                error = errors[index].encode() if index < len(errors) else b''
+                executor.result = executor.result_from_exit_status(command, output, error, exit_status)
+
+            executor.register_result()
+
+        rest = pending[finished:]
+
+        if not rest or any(executor.result.status == Status.FAIL for executor in pending[:finished]):
+            return []
+
+        if not finished:
+            # The script failed before the first command finished, for example because it timed out
+            rest[0].result = Result(Status.FAIL, stdin=self.commands_of_pending[0], message=result.message or 'The script stopped before the command finished')
+            rest[0].register_result()
+
+            return []
+
+        return rest
+
+    def combined_result(self) -> Result:
+        """
+        Gets the result of all the executors together
+
+        Returns:
+            Failed if one of the executors failed, changed if one of them changed and otherwise success
+        """
+
+        statuses = [executor.result.status for executor in self.executors if executor.result]
+
+        if Status.FAIL in statuses:
+            return Result(Status.FAIL)
+
+        return Result(Status.CHANGED if Status.CHANGED in statuses else Status.SUCCESS)
+
+    def get_timeout(self) -> float:
+        """
+        Gets the timeout of the script, which is the timeout of all the executors together
+
+        Returns:
+            The timeout in seconds or None if one of the executors has no timeout
+        """
+
+        timeouts = [executor.get_timeout() for executor in self.executors]
+
+        if None in timeouts:
+            return None
+
+        return sum(timeouts)
@@ -1,5 +1,6 @@
 from abc import ABC
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import List
 
 from crit.config import config
@@ -14,10 +15,10 @@ class MultiExecutor(BaseExecutor, ABC):
     Executor interface for an executor that runs multiple executors itself as one executor
 
     Attributes:
-        results (List[BaseExecutor]): Results from the executor
+        results (List[Result]): Results of the nested executors of this executor
     """
 
-    results = []
+    results: List[Result] = field(default_factory=list, init=False, repr=False, compare=False)
 
     def execute_executor(self, executor: BaseExecutor):
         """
@@ -38,6 +39,23 @@ class MultiExecutor(BaseExecutor, ABC):
 
         return result
 
+    def execute_executors(self, executors: List[BaseExecutor]) -> List[Result]:
+        """
+        Executes the executors at the same time on the host with exception_on_error. Only use this for executors that do not depend on each other.
+        The results are also added to self.results. When executors fail the exception of the first failed executor in the list is thrown after all the executors are done
+
+        Args:
+            executors (List[BaseExecutor]): Executors that will be executed
+
+        Returns:
+            The results in the same order as the executors
+        """
+
+        with ThreadPoolExecutor(max_workers=max(len(executors), 1), thread_name_prefix='crit-nested') as pool:
+            futures = [pool.submit(self.execute_executor, executor) for executor in executors]
+
+        return [future.result() for future in futures]
+
     def result_from_executor(self, message: str):
         """
         Gets the result for the executors
@@ -65,6 +83,7 @@ class MultiExecutor(BaseExecutor, ABC):
             - register
             - env
             - chdir
+            - timeout
 
         Args:
             excluded (List[str]): attributes that should not be included in the return
@@ -80,7 +99,8 @@ class MultiExecutor(BaseExecutor, ABC):
             'sudo',
             'register',
             'env',
-            'chdir'
+            'chdir',
+            'timeout'
         ]
 
         if excluded:
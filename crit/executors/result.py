@@ -1,6 +1,6 @@
 import shutil
 from enum import Enum, unique
-from typing import List
+from typing import List, Dict
 from dataclasses import dataclass
 from termcolor import colored
 from crit.config import Host, config, Localhost
@@ -21,6 +21,9 @@ class Result:
     stdout: List[str] = None
     message: str = ''
     output: bool = False
+    stderr: List[str] = None
+    exit_status: int = None
+    items: Dict[str, 'Result'] = None
 
     def to_table(self, host: Host = None, name: str = None):
         """
@@ -50,12 +53,22 @@ class Result:
 
         self.print_line('Status', self.status, self.status.value)
 
+        if self.items:
+            for item, result in self.items.items():
+                self.print_line(f'Item {item}', f'{result.status} {result.message}'.strip(), result.status.value)
+
         if self.message:
             self.print_line('Message', self.message)
 
         if self.output or config.verbose > 1:
             self.print_line('Output', self.stdout)
 
+            if self.stderr and any(self.stderr):
+                self.print_line('Errors', self.stderr)
+
+        if self.exit_status and self.status == Status.FAIL:
+            self.print_line('Exit status', self.exit_status)
+
         print('-' * term_width)
 
     def print_line(self, key: str, value, color: str=None):
@@ -1,13 +1,15 @@
-import os
-import time
-from typing import List
+import asyncio
+import re
+import shlex
+from typing import List, Dict, Union
 from abc import ABCMeta, abstractmethod
-from dataclasses import dataclass
-import paramiko
+from dataclasses import dataclass, replace
+from uuid import uuid4
 from crit.executors import BaseExecutor
-from paramiko import ChannelFile
 from crit.config import Host, config
-from crit.exceptions import SingleExecutorFailedException
+from crit.exceptions import SingleExecutorFailedException, ItemsNotSupportedException
+from crit.connections import BrokerClient, SudoPrompt
+from crit.transports import BaseTransport, AgentTransport, SshTransport
 from .result import Result, Status
 
 
@@ -18,15 +20,25 @@ class SingleExecutor(BaseExecutor, metaclass=ABCMeta):
 
     Args:
         output (str): Output the stdout from the executor. Defaults to :obj:`False`
+        pty (bool): Runs the command in a terminal. Without a terminal stdout and stderr are kept apart and the exit status of the command decides if it failed instead of the error lines. Defaults to :obj:`True`
+        items (List[Union[str, dict]]): Runs the executor for every item in one command on the host instead of one command per item. An item is the value of the item_field or a dict with fields of the executor. The result has a result per item in :obj:`items`. :obj:`optional`
 
     Attributes:
         error_lines (List[str]): Strings that will define if a command is an error
+        no_pty_sudo_command (str): Without a terminal a transport writes the password to the stdin of sudo
+        item_field (str): The field an item that is not a dict fills in
+        item_marker (str): The unique string the output of the items is split on
     """
 
     output: bool = False
+    pty: bool = True
+    items: List[Union[str, dict]] = None
 
     # Attributes
     error_lines = ['fail', 'fatal', 'error', 'No such file or directory', 'command not found', 'invalid', 'denied']
+    no_pty_sudo_command = "sudo -S -p ''"
+    item_field = None
+    item_marker = None
 
     @abstractmethod
     def commands(self) -> str:
@@ -54,39 +66,228 @@ class SingleExecutor(BaseExecutor, metaclass=ABCMeta):
 
         return result
 
-    def run_command(self) -> Result:
+    async def execute_async(self, exception_on_error: bool = False, **kwargs) -> Result:
         """
-        Runs a command on a specific host
+        Same as :obj:`execute` but waits for the output of the command on the event loop
 
         Args:
-            host (Host): The host where to run the command on
+            exception_on_error (bool): Throws an exception on error. Can be used in other BaseExecutors
+        """
+
+        result = await self.run_command_async()
+
+        if result.status == Status.FAIL and exception_on_error:
+            raise SingleExecutorFailedException(self, result)
+
+        return result
+
+    def build_command(self, sudo_command: str = 'sudo') -> str:
+        """
+        Builds the command that runs on the host out of the commands and the env, sudo and chdir attributes
+
+        Args:
+            sudo_command (str): The command that is put before the command when sudo is set. Defaults to :obj:`'sudo'`
 
         Returns:
-             returns the list with the output and if the output was successful or an error
+            The full command
         """
 
-        command = self.commands()
+        command = self.items_commands() if self.items else self.commands()
 
         if self.env:
             for key, value in self.env.items():
                 command = f'{key}="{value}" ' + command
 
         if self.sudo:
-            command = 'sudo ' + command
+            command = f'{sudo_command} ' + command
 
         # If chdir is defined add it before the command
         if self.chdir:
             command = f'cd {self.chdir} && ' + command
 
-        client = self.get_client()
-        stdin, stdout, stderr = client.exec_command(command, get_pty=True)
+        return command
+
+    def run_command(self) -> Result:
+        """
+        Runs a command on a specific host
+
+        Returns:
+             returns the list with the output and if the output was successful or an error
+        """
+
+        return self.run_transport(self.get_transport())
+
+    async def run_command_async(self) -> Result:
+        """
+        Runs a command on a specific host without blocking the event loop while the command is running
+
+        Returns:
+             returns the list with the output and if the output was successful or an error
+        """
+
+        transport = self.get_transport()
+
+        if isinstance(transport, AgentTransport) and not self.items:
+            return await asyncio.get_running_loop().run_in_executor(None, self.run_transport, transport)
+
+        command = self.build_command(self.get_sudo_command(transport))
+        password_failed = self.check_password()
+
+        if password_failed:
+            return password_failed
+
+        response = await transport.exec_command_async(self.host, command, self.get_password(), self.get_timeout(), self.pty)
+
+        return self.result_from_response(command, response)
+
+    def needs_password(self) -> bool:
+        """
+        Checks if sudo asks for the linux password on the host
+        """
+
+        return self.sudo and not self.host.passwordless_user
+
+    def get_sudo_command(self, transport: BaseTransport) -> str:
+        """
+        Gets the sudo command that fits the way the command runs. Over ssh sudo prints a known prompt, which is answered while the output is read
+
+        Args:
+            transport (BaseTransport): The transport that runs the command
+
+        Returns:
+            The sudo command
+        """
+
+        if self.needs_password() and transport.sudo_prompt:
+            return SudoPrompt.command(self.pty)
+
+        if not self.pty and self.needs_password():
+            return self.no_pty_sudo_command
+
+        return transport.sudo_command
+
+    def get_transport(self) -> BaseTransport:
+        """
+        Gets the transport that runs the command. The transport of the host goes before the broker
+
+        Returns:
+            The transport of the host, the broker or the ssh connection of crit
+        """
+
+        if self.host.transport:
+            return self.host.transport
+
+        if config.broker:
+            return BrokerClient(config.broker)
+
+        return SshTransport()
+
+    def run_transport(self, transport: BaseTransport) -> Result:
+        """
+        Runs the command through the transport. With an agent the executor first asks the agent if the command has to run at all
+
+        Args:
+            transport (BaseTransport): Runs the command
+
+        Returns:
+            The result of the command
+        """
+
+        if isinstance(transport, AgentTransport) and not self.items:
+            result = self.agent_result(transport)
+
+            if result:
+                return result
+
+        return self.run_command_with(transport, self.build_command(self.get_sudo_command(transport)))
+
+    def agent_result(self, transport: AgentTransport) -> Result:
+        """
+        Asks the agent of the host for the state the command would create. This function can be overwritten for custom executors
+
+        Args:
+            transport (AgentTransport): The transport with the agent of the host
+
+        Returns:
+            The result when the host is already in the state and the command does not have to run, otherwise None
+        """
+
+        return None
+
+    def run_command_with(self, transport: BaseTransport, command: str) -> Result:
+        """
+        Runs a command through a transport. The transport fills in the sudo password itself
+
+        Args:
+            transport (BaseTransport): Runs the command
+            command (str): The command to run
+
+        Returns:
+            The result of the command
+        """
+
+        password_failed = self.check_password()
+
+        if password_failed:
+            return password_failed
+
+        response = transport.exec_command(self.host, command, self.get_password(), self.get_timeout(), self.pty)
+
+        return self.result_from_response(command, response)
+
+    def result_from_response(self, command: str, response: dict) -> Result:
+        """
+        Creates the result out of the response of a transport or :obj:`read_command`
+
+        Args:
+            command (str): The command that ran on the host
+            response (dict): The response like the one of :obj:`BaseTransport.exec_command`
+
+        Returns:
+            The result of the command
+        """
 
-        password_correct = self.fill_password(stdin, stdout)
+        if response.get('password_incorrect'):
+            return Result(Status.FAIL, message='Incorrect linux password!')
 
-        if password_correct:
-            return password_correct
+        if response.get('timed_out'):
+            return self.timed_out_result(command, self.get_timeout())
+
+        if not self.pty:
+            return self.result_from_exit_status(command, response['output'], response.get('stderr', b''), response['exit_status'])
+
+        return self.result_from_output(command, response['output'])
+
+    def timed_out_result(self, command: str, timeout: float) -> Result:
+        """
+        Gets the result of a command that did not finish in time
+
+        Args:
+            command (str): The command that ran on the host
+            timeout (float): The timeout in seconds
+
+        Returns:
+            A failed result
+        """
+
+        return Result(Status.FAIL, stdin=command, message=f'Timed out after {timeout} seconds')
+
+    def result_from_output(self, command: str, output: bytes) -> Result:
+        """
+        Creates the result based on the output of the command
+
+        Args:
+            command (str): The command that ran on the host
+            output (bytes): The output of the command
+
+        Returns:
+            The result of the command
+        """
 
-        output = stdout.read().decode().split('\n')
+        if self.items:
+            return self.result_from_items(command, output)
+
+        output = output.decode().split('\n')
 
         # Catch the error
         error_in_text = self.error_in_text(output)
@@ -98,6 +299,143 @@ class SingleExecutor(BaseExecutor, metaclass=ABCMeta):
 
         return Result(Status.CHANGED if self.is_changed(output) else Status.SUCCESS, stdin=command, stdout=output, output=self.output)
 
+    def result_from_exit_status(self, command: str, output: bytes, errors: bytes, exit_status: int) -> Result:
+        """
+        Creates the result of a command that ran without a terminal. The command failed when the exit status is not 0
+
+        Args:
+            command (str): The command that ran on the host
+            output (bytes): The stdout of the command
+            errors (bytes): The stderr of the command
+            exit_status (int): The exit status of the command
+
+        Returns:
+            The result of the command
+        """
+
+        if exit_status != 0 and self.needs_password() and 'Sorry, try again.' in errors.decode().split('\n'):
+            return Result(Status.FAIL, message='Incorrect linux password!')
+
+        if self.items:
+            return self.result_from_items(command, output, errors, exit_status)
+
+        output = output.decode().split('\n')
+        errors = errors.decode().split('\n')
+
+        if exit_status != 0:
+
+            return Result(Status.FAIL, stdin=command, stdout=output, stderr=errors, exit_status=exit_status)
+
+        status = Status.CHANGED if self.is_changed(output) else Status.SUCCESS
+
+        return Result(status, stdin=command, stdout=output, output=self.output, stderr=errors, exit_status=exit_status)
+
+    def item_executors(self) -> List['SingleExecutor']:
+        """
+        Gets a copy of the executor for every item with the fields of the item filled in
+
+        Returns:
+            The executors of the items
+
+        Raises:
+            ItemsNotSupportedException: When an item is not a dict and the executor has no item_field
+        """
+
+        executors = []
+
+        for item in self.items:
+            if not isinstance(item, dict) and not self.item_field:
+                raise ItemsNotSupportedException(self)
+
+            executors.append(replace(self, items=None, **(item if isinstance(item, dict) else {self.item_field: item})))
+
+        return executors
+
+    def item_names(self) -> List[str]:
+        """
+        Gets the name of every item, which is the value of the item_field of the item
+
+        Returns:
+            The names of the items
+        """
+
+        return [str(getattr(executor, self.item_field, '') if self.item_field else index) for index, executor in enumerate(self.item_executors())]
+
+    def items_commands(self) -> str:
+        """
+        The command that runs the executor for all the items. By default this is a script with the command of every item, which is followed by a marker
+        with the exit status of the command. The script runs in its own shell, so sudo, env and chdir are added once. This function can be overwritten
+        for executors of which the command can take all the items at once
+
+        Returns:
+            The command to run on the server
+        """
+
+        self.item_marker = f'crit-{uuid4().hex}'
+        lines = []
+
+        for index, executor in enumerate(self.item_executors()):
+            lines.append(f'( {executor.commands()} )')
+            lines.append(f"printf '\\n{self.item_marker} {index} %d\\n' $?")
+
+            # In a terminal stderr is mixed with the output, so only the output is split
+            if not self.pty:
+                lines.append(f"printf '\\n{self.item_marker} {index}\\n' >&2")
+
+        return 'sh -c ' + shlex.quote('\n'.join(lines))
+
+    def result_from_items(self, command: str, output: bytes, errors: bytes = b'', exit_status: int = None) -> Result:
+        """
+        Creates the result of a command that ran for all the items
+
+        Args:
+            command (str): The command that ran on the host
+            output (bytes): The output of the command
+            errors (bytes): The stderr of the command. Only without a terminal
+            exit_status (int): The exit status of the command. Only without a terminal
+
+        Returns:
+            Failed if one of the items failed, changed if one of them changed and otherwise success. The results of the items are in :obj:`items`
+        """
+
+        items = self.item_results(output, errors, exit_status)
+        statuses = [result.status for result in items.values()]
+        status = Status.FAIL if Status.FAIL in statuses else Status.CHANGED if Status.CHANGED in statuses else Status.SUCCESS
+
+        return Result(
+            status, stdin=command, stdout=output.decode().split('\n'), output=self.output,
+            stderr=errors.decode().split('\n') if exit_status is not None else None, exit_status=exit_status, items=items
+        )
+
+    def item_results(self, output: bytes, errors: bytes, exit_status: int = None) -> Dict[str, Result]:
+        """
+        Splits the output of the script of :obj:`items_commands` on the markers and creates the result of every item the way the executor of the item would.
+        This function has to be overwritten together with :obj:`items_commands`
+
+        Args:
+            output (bytes): The output of the command
+            errors (bytes): The stderr of the command. Only without a terminal
+            exit_status (int): The exit status of the command. Only without a terminal
+
+        Returns:
+            The result per name of the item
+        """
+
+        outputs = re.split(rf'\r?\n{self.item_marker} (\d+) (\d+)\r?\n', output.decode())
+        errors = re.split(rf'\n{self.item_marker} \d+\n', errors.decode())
+        results = {}
+
+        for index, (name, executor) in enumerate(zip(self.item_names(), self.item_executors())):
+            if index * 3 + 2 >= len(outputs):
+                results[name] = Result(Status.FAIL, stdin=executor.commands(), message='The command stopped before the item ran')
+            elif exit_status is None:
+                results[name] = executor.result_from_output(executor.commands(), outputs[index * 3].encode())
+            else:
+                error = errors[index].encode() if index < len(errors) else b''
+                results[name] = executor.result_from_exit_status(executor.commands(), outputs[index * 3].encode(), error, int(outputs[index * 3 + 2]))
+
+        return results
+
     def error_in_text(self, output: List[str]) -> bool:
         """
         Checks if error or fail is in the error output
@@ -156,55 +494,25 @@ class SingleExecutor(BaseExecutor, metaclass=ABCMeta):
 
         return False
 
-    def fill_password(self, stdin: ChannelFile, stdout: ChannelFile) -> Result:
+    def check_password(self) -> Result:
         """
-        Here you can read prompts see https://stackoverflow.com/questions/373639/running-interactive-commands-in-paramiko how to
-
-        Args:
-            stdin (ChannelFile): The stdin of the command
-            stdout (ChannelFile): The output of the task
+        Checks if the linux password is passed when sudo asks for it. The transport checks if the password is correct
 
         Returns:
-            Result if it fails else it returns None which means nothing went wrong
+            Result if the password is missing else it returns None which means nothing went wrong
         """
-        if self.sudo and not self.host.passwordless_user:
-            if not config.linux_password:
-                return Result(Status.FAIL, message='Pass linux password with -p or pass passwordless_user on hosts!')
 
-            time.sleep(0.1)
-
-            stdin.write(config.linux_password + '\n')
-            stdin.flush()
-
-            # Read the password
-            stdout.readline()
-            stdout.readline()
-
-            if 'Sorry, try again.' in stdout.readline():
-                stdin.write(chr(3))
-                stdin.flush()
-                return Result(Status.FAIL, message='Incorrect linux password!')
+        if self.needs_password() and not config.linux_password:
+            return Result(Status.FAIL, message='Pass linux password with -p or pass passwordless_user on hosts!')
 
         return None
 
-    def get_client(self) -> paramiko.SSHClient:
+    def get_password(self) -> str:
         """
-        Get paramiko client for the host
+        Gets the sudo password the transport fills in
 
         Returns:
-            Client which can run the commands
+            The linux password or None when sudo does not need a password
         """
 
-        if self.host.url in config.channels:
-            return config.channels[self.host.url]
-        else:
-            client = paramiko.SSHClient()
-            client.load_system_host_keys()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(hostname=self.host.url, username=self.host.ssh_user, password=self.host.ssh_password,
-                           pkey=paramiko.RSAKey.from_private_key_file(os.path.expanduser(self.host.ssh_identity_file)),
-                           allow_agent=False)
-
-            config.channels[self.host.url] = client
-
-            return client
+        return config.linux_password if self.needs_password() else None
@@ -1,6 +1,8 @@
-from typing import List
+from typing import List, Dict, Set
 from dataclasses import dataclass
-from crit.executors import SingleExecutor
+from crit.executors import SingleExecutor, Result
+from crit.executors.result import Status
+from crit.transports import AgentTransport
 
 
 @dataclass
@@ -18,6 +20,7 @@ class AptExecutor(SingleExecutor):
         package (str): The package to perform the action on. :obj:`required`
         sudo (bool): Add sudo before the command. Defaults to :obj:`True`
         action (str): The action to perform. You can choose from :obj:`install`, :obj:`update`, :obj:`remove`, :obj:`purge`. Defaults to :obj:`install`
+        items (List[str]): The packages to perform the action on. All of them are passed to one apt-get. :obj:`optional`
 
     Attributes:
         action_to_call (list): Mapping of action to command and the line to check if it was changed
@@ -27,6 +30,7 @@ class AptExecutor(SingleExecutor):
     sudo: bool = True
     action: str = 'install'
     error_lines = SingleExecutor.error_lines + ['E: Unable to locate package None', 'E: dpkg was interrupted']
+    item_field = 'package'
 
     action_to_call = {
         'install': _Action('install', 'The following NEW packages will be installed:'),
@@ -51,6 +55,79 @@ class AptExecutor(SingleExecutor):
 
         return command
 
+    def items_commands(self) -> str:
+        """
+        Performs the action on all the packages with one apt-get, so apt resolves and downloads them together
+        """
+
+        return f'DEBIAN_FRONTEND="noninteractive" apt-get -y {self.action_to_call[self.action].command} ' + ' '.join(self.item_names())
+
+    def item_results(self, output: bytes, errors: bytes, exit_status: int = None) -> Dict[str, Result]:
+        """
+        Apt performs the action on all the packages or on none of them. When apt failed every package fails with the error of apt about the package.
+        Otherwise a package is changed when apt lists it under the line of the action
+        """
+
+        lines = (output + errors).decode().split('\n')
+        failed = exit_status != 0 if exit_status is not None else self.error_in_text(lines) and not self.catched_error(lines)
+        changed = self.changed_packages(lines)
+        results = {}
+
+        for package in self.item_names():
+            if failed:
+                message = next((line.strip() for line in lines if line.startswith('E:') and package in line.split()), 'Apt did not perform the action')
+                results[package] = Result(Status.FAIL, message=message)
+            else:
+                results[package] = Result(Status.CHANGED if package in changed else Status.SUCCESS)
+
+        return results
+
+    def changed_packages(self, text: List[str]) -> Set[str]:
+        """
+        Gets the packages apt lists under the line of the action
+
+        Args:
+            text: The output of the command
+
+        Returns:
+            The names of the packages
+        """
+
+        line_expected = self.action_to_call[self.action].line
+        packages = set()
+        listing = False
+
+        for line in text:
+            if line_expected in line:
+                listing = True
+            elif listing and line.startswith(' '):
+                packages.update(line.split())
+            else:
+                listing = False
+
+        return packages
+
+    def agent_result(self, transport: AgentTransport) -> Result:
+        """
+        Does not run apt when the agent finds that the package is already installed or removed
+        """
+
+        if self.action == 'update':
+            return None
+
+        state = transport.call(self.host, 'package', {'name': self.package}, self.get_timeout())
+
+        if 'installed' not in state:
+            return None
+
+        if self.action == 'install' and state['installed']:
+            return Result(Status.SUCCESS, message=f"{self.package} {state['version']} is installed")
+
+        if self.action in ['remove', 'purge'] and not state['installed']:
+            return Result(Status.SUCCESS, message=f'{self.package} is not installed')
+
+        return None
+
     def changed(self, text: List[str]):
         """
         Checks if via the output if the status is changed. This is checked via the action_to_call variable
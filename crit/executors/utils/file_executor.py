@@ -1,8 +1,11 @@
+import re
 from enum import Enum
-from typing import List
+from typing import List, Dict
 
 from dataclasses import dataclass
-from crit.executors import SingleExecutor
+from crit.executors import SingleExecutor, Result
+from crit.executors.result import Status
+from crit.transports import AgentTransport
 
 
 class TypeFile(Enum):
@@ -22,14 +25,50 @@ class FileExecutor(SingleExecutor):
     Args:
         path (str): The path where the file should be placed. :obj:`required`
         type_file (TypeFile): The type of the file. Directory or File. :obj:`required`
+        items (List[str]): The paths of the files. All of them are passed to one mkdir or touch. :obj:`optional`
     """
 
     path: str = ''
     type_file: TypeFile = None
 
+    item_field = 'path'
+
     def commands(self):
         return f'{self.type_file.value} {self.path}'
 
+    def items_commands(self) -> str:
+        return f'{self.type_file.value} ' + ' '.join(self.item_names())
+
+    def item_results(self, output: bytes, errors: bytes, exit_status: int = None) -> Dict[str, Result]:
+        """
+        Mkdir and touch only print a line about a path when they could not create it, so a path failed when a line names it and the error is not catched
+        """
+
+        lines = (output + errors).decode().split('\n')
+        results = {}
+
+        for path in self.item_names():
+            path_lines = [line for line in lines if re.search(rf"['‘]{re.escape(path)}['’]", line)]
+
+            if path_lines and not self.catched_error(path_lines):
+                results[path] = Result(Status.FAIL, stdout=path_lines)
+            else:
+                results[path] = Result(Status.SUCCESS)
+
+        return results
+
+    def agent_result(self, transport: AgentTransport) -> Result:
+        """
+        Does not run the command when the agent finds the file or directory
+        """
+
+        state = transport.call(self.host, 'stat', {'path': self.path}, self.get_timeout())
+
+        if state.get('is_dir' if self.type_file == TypeFile.DIRECTORY else 'is_file'):
+            return Result(Status.SUCCESS, message=f'{self.path} exists')
+
+        return None
+
     def catched_error(self, output: List[str]):
         for line in output:
             if self.type_file == TypeFile.DIRECTORY and 'File exists' in line:
@@ -1,6 +1,8 @@
 from typing import List
 from dataclasses import dataclass
-from crit.executors import SingleExecutor
+from crit.executors import SingleExecutor, Result
+from crit.executors.result import Status
+from crit.transports import AgentTransport
 
 
 @dataclass
@@ -15,6 +17,7 @@ class UserAddExecutor(SingleExecutor):
         shell (str): Which shell the user uses. Defaults to :obj:`'/bin/bash'`
         groups (List[str]): Groups to add the user to. :obj:`optional`
         sudo (bool): Overwrite sudo from :obj:`BaseExecutor`. Defaults to :obj:`True`
+        items (List[Union[str, dict]]): The usernames or dicts with the fields of the users. All the users are created in one script. :obj:`optional`
     """
 
     username: str = ''
@@ -24,6 +27,8 @@ class UserAddExecutor(SingleExecutor):
     groups: List[str] = None
     sudo: bool = True
 
+    item_field = 'username'
+
     def commands(self):
         add_user_command = f'useradd -s {self.shell}'
 
@@ -46,6 +51,16 @@ class UserAddExecutor(SingleExecutor):
 
         return add_user_command + ' ' + self.username
 
+    def agent_result(self, transport: AgentTransport) -> Result:
+        """
+        Does not run useradd when the agent finds the user
+        """
+
+        if transport.call(self.host, 'user', {'name': self.username}, self.get_timeout()).get('exists'):
+            return Result(Status.SUCCESS, message=f'{self.username} exists')
+
+        return None
+
     def catched_error(self, output: List[str]):
         for line in output:
             if f'useradd: user \'{self.username}\' already exists' in line:
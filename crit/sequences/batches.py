@@ -0,0 +1,80 @@
+import math
+from typing import List, Union
+
+from crit.config import Host
+from crit.utils import get_client
+
+
+def batch_size(size: Union[int, str], total: int) -> int:
+    """
+    Gets the amount of hosts in a batch
+
+    Args:
+        size (Union[int, str]): An amount of hosts like :obj:`10` or a percentage of all the hosts like :obj:`'10%'`
+        total (int): The amount of hosts in the sequence
+
+    Returns:
+        The amount of hosts. A batch always has at least one host
+    """
+
+    if isinstance(size, str) and size.endswith('%'):
+        size = math.floor(total * float(size[:-1]) / 100)
+
+    return max(int(size), 1)
+
+
+def split_batches(hosts: List[Host], sizes: List[Union[int, str]]) -> List[List[Host]]:
+    """
+    Splits the hosts in batches. The last size is used for the remaining hosts when there are more hosts than sizes
+
+    Args:
+        hosts (List[Host]): The hosts of the sequence
+        sizes (List[Union[int, str]]): The sizes of the batches. For example :obj:`[1, '10%', '50%']`
+
+    Returns:
+        The batches of hosts
+    """
+
+    batches = []
+    start = 0
+
+    for i in range(len(hosts)):
+        if start >= len(hosts):
+            break
+
+        size = batch_size(sizes[min(i, len(sizes) - 1)], len(hosts))
+
+        batches.append(hosts[start:start + size])
+        start += size
+
+    return batches
+
+
+def failed_percentage(batch: List[Host], failed_hosts: List[Host]) -> float:
+    """
+    Gets the percentage of the hosts in the batch that failed
+
+    Args:
+        batch (List[Host]): The hosts in the batch
+        failed_hosts (List[Host]): The hosts of the batch that failed
+
+    Returns:
+        The percentage of failed hosts
+    """
+
+    return len(failed_hosts) / len(batch) * 100
+
+
+def preconnect(host: Host):
+    """
+    Connects to the host before its batch starts
+
+    Args:
+        host (Host): The host to connect to
+    """
+
+    try:
+        get_client(host)
+    except Exception:
+        # The executors of the batch report the error when they connect to the host
+        pass
@@ -0,0 +1,63 @@
+from typing import List
+
+from crit.executors import BaseExecutor, SingleExecutor, CoalescedExecutor
+
+
+def can_coalesce(executor: BaseExecutor, referenced: List[BaseExecutor]) -> bool:
+    """
+    Checks if the executor can run in a script together with the executors around it. That is a single executor that only runs its command,
+    runs in the order of the sequence, has no throttle and no other executor waits for it with :obj:`after`
+
+    Args:
+        executor (BaseExecutor): The executor to check
+        referenced (List[BaseExecutor]): The executors that are in the after of an executor
+
+    Returns:
+        If the executor can be coalesced
+    """
+
+    return (
+        isinstance(executor, SingleExecutor)
+        and not isinstance(executor, CoalescedExecutor)
+        and type(executor).execute is SingleExecutor.execute
+        and type(executor).run_command is SingleExecutor.run_command
+        and executor.after is None
+        and executor.throttle is None
+        and not any(executor is dependency for dependency in referenced)
+    )
+
+
+def coalesce(executors: List[BaseExecutor]) -> List[BaseExecutor]:
+    """
+    Replaces the consecutive executors that can be coalesced and run on the same hosts with the same tags by a :obj:`CoalescedExecutor`
+
+    Args:
+        executors (List[BaseExecutor]): The executors of the sequence
+
+    Returns:
+        The executors with the coalesced executors
+    """
+
+    referenced = [dependency for executor in executors for dependency in executor.after or []]
+    groups = []
+
+    for executor in executors:
+        if not can_coalesce(executor, referenced):
+            groups.append(executor)
+        elif groups and isinstance(groups[-1], list) and groups[-1][0].hosts == executor.hosts and groups[-1][0].tags == executor.tags:
+            groups[-1].append(executor)
+        else:
+            groups.append([executor])
+
+    coalesced = []
+
+    for group in groups:
+        if not isinstance(group, list):
+            coalesced.append(group)
+        elif len(group) == 1:
+            coalesced.append(group[0])
+        else:
+            name = ', '.join(executor.name or executor.__class__.__name__ for executor in group)
+            coalesced.append(CoalescedExecutor(name=name, hosts=group[0].hosts, tags=group[0].tags, executors=group))
+
+    return coalesced
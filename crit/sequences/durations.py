@@ -0,0 +1,94 @@
+import json
+from threading import Lock
+from typing import Dict
+
+from crit.config import Host
+from crit.executors import BaseExecutor
+
+
+class Durations:
+    """
+    Keeps how long the executors ran on every host. With a path the durations of previous runs are loaded from and saved to a json file
+
+    Args:
+        path (str): The json file with the durations. :obj:`optional`
+
+    Attributes:
+        durations (Dict[str, Dict[str, float]]): The seconds per host per executor
+    """
+
+    path: str = None
+    durations: Dict[str, Dict[str, float]] = None
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.durations = {}
+        self.lock = Lock()
+
+        if path:
+            try:
+                with open(path, 'r') as durations_file:
+                    self.durations = json.load(durations_file)
+            except (FileNotFoundError, ValueError):
+                pass
+
+    def key(self, executor: BaseExecutor) -> str:
+        """
+        The key of the executor in the durations, which is its name. Executors without a name are kept apart by their position in the sequence
+        """
+
+        if executor.name:
+            return executor.name
+
+        if executor.position is not None:
+            return f'{executor.position} {executor.__class__.__name__}'
+
+        return executor.__class__.__name__
+
+    def expected(self, executor: BaseExecutor, host: Host) -> float:
+        """
+        Gets how long the executor is expected to run on the host
+
+        Args:
+            executor (BaseExecutor): The executor
+            host (Host): The host it runs on
+
+        Returns:
+            The duration on the host. The average of the other hosts when the executor has not run on the host yet, or 0 if it has never run
+        """
+
+        per_host = self.durations.get(self.key(executor), {})
+
+        if repr(host) in per_host:
+            return per_host[repr(host)]
+
+        if per_host:
+            return sum(per_host.values()) / len(per_host)
+
+        return 0
+
+    def record(self, executor: BaseExecutor, host: Host, seconds: float):
+        """
+        Records how long the executor ran on the host
+        """
+
+        with self.lock:
+            self.durations.setdefault(self.key(executor), {})[repr(host)] = seconds
+
+    def merge(self, durations: Dict[str, Dict[str, float]]):
+        """
+        Adds durations that are recorded somewhere else, like in a worker process
+        """
+
+        with self.lock:
+            for key, per_host in durations.items():
+                self.durations.setdefault(key, {}).update(per_host)
+
+    def save(self):
+        """
+        Saves the durations to the json file if there is one
+        """
+
+        if self.path:
+            with open(self.path, 'w') as durations_file:
+                json.dump(self.durations, durations_file, indent=2, sort_keys=True)
@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+from typing import List, Set, Callable
+
+from crit.exceptions import ExecutorDependencyException
+from crit.executors import BaseExecutor
+
+
+@dataclass
+class Progress:
+    """
+    How far a host is in the executor graph
+
+    Args:
+        started (Set[int]): The indexes of the executors that are started or skipped
+        done (Set[int]): The indexes of the executors that are done or skipped
+    """
+
+    started: Set[int] = field(default_factory=set)
+    done: Set[int] = field(default_factory=set)
+
+
+class ExecutorGraph:
+    """
+    The dependencies between executors. An executor without :obj:`after` depends on all the executors before it, so without :obj:`after` the executors run in the order of the list.
+    An executor with :obj:`after` only depends on the executors in it
+
+    Args:
+        executors (List[BaseExecutor]): The executors in the graph. :obj:`required`
+        sequence_executors (List[BaseExecutor]): All the executors of the sequence. Dependencies on executors before the graph are already done. Defaults to :obj:`executors`
+
+    Attributes:
+        dependencies (List[Set[int]]): The indexes of the executors every executor depends on
+    """
+
+    executors: List[BaseExecutor] = None
+    dependencies: List[Set[int]] = None
+
+    def __init__(self, executors: List[BaseExecutor], sequence_executors: List[BaseExecutor] = None):
+        self.executors = executors
+        self.dependencies = []
+
+        sequence_executors = sequence_executors or executors
+        start = self.index_of(executors[0], sequence_executors) if executors else 0
+
+        for i, executor in enumerate(executors):
+            if executor.after is None:
+                self.dependencies.append(set(range(i)))
+                continue
+
+            dependencies = set()
+
+            for dependency in executor.after:
+                index = self.index_of(dependency, executors)
+
+                if index is not None:
+                    dependencies.add(index)
+                elif not self.is_before(dependency, sequence_executors, start):
+                    raise ExecutorDependencyException(executor, dependency)
+
+            self.dependencies.append(dependencies)
+
+        # Every executor has to be reachable, otherwise there is a cycle
+        if sum(len(level) for level in self.levels()) != len(executors):
+            raise ExecutorDependencyException()
+
+    def index_of(self, executor: BaseExecutor, executors: List[BaseExecutor]) -> int:
+        """
+        Gets the index of the executor based on identity. Two executors with the same attributes are still different executors
+
+        Returns:
+            The index or None if the executor is not in the list
+        """
+
+        for i, item in enumerate(executors):
+            if item is executor:
+                return i
+
+        return None
+
+    def is_before(self, executor: BaseExecutor, sequence_executors: List[BaseExecutor], start: int) -> bool:
+        """
+        Checks if the executor is in the sequence before the executors of this graph
+        """
+
+        index = self.index_of(executor, sequence_executors)
+
+        return index is not None and index < start
+
+    def ready(self, progress: Progress) -> List[int]:
+        """
+        Gets the executors that can start because all the executors they depend on are done
+
+        Args:
+            progress (Progress): How far the host is
+
+        Returns:
+            The indexes of the executors that can start
+        """
+
+        return [
+            i for i, dependencies in enumerate(self.dependencies)
+            if i not in progress.started and dependencies <= progress.done
+        ]
+
+    def levels(self) -> List[List[int]]:
+        """
+        Groups the executors in levels. The executors in a level only depend on executors in the levels before it
+
+        Returns:
+            The indexes of the executors per level
+        """
+
+        progress = Progress()
+        levels = []
+
+        while True:
+            level = self.ready(progress)
+
+            if not level:
+                return levels
+
+            levels.append(level)
+            progress.started.update(level)
+            progress.done.update(level)
+
+    def critical_paths(self, duration: Callable[[int], float]) -> List[float]:
+        """
+        Gets for every executor the longest chain of durations from the start of the executor till the end of the graph.
+        Starting the executors with the longest chain first makes the whole graph finish the soonest
+
+        Args:
+            duration (Callable[[int], float]): Gets the expected duration of the executor by its index
+
+        Returns:
+            The length of the longest chain of every executor
+        """
+
+        paths = [0.0] * len(self.executors)
+
+        for level in reversed(self.levels()):
+            for index in level:
+                dependents = [paths[i] for i, dependencies in enumerate(self.dependencies) if index in dependencies]
+                paths[index] = duration(index) + max(dependents + [0.0])
+
+        return paths
@@ -0,0 +1,36 @@
+import socket
+
+from crit.config import Host, config
+
+
+def probe(host: Host, timeout: float, connect: bool = True) -> str:
+    """
+    Checks if the ssh port of the host can be reached and makes the ssh connection to the host.
+    For a host behind a jump host the port of the first jump host is checked. Hosts with a transport that does not use ssh are not probed
+
+    Args:
+        host (Host): The host to probe
+        timeout (float): Seconds to wait for the host
+        connect (bool): Also makes the ssh connection, which is kept in the connection pool. The connection is not tried again, so an unreachable host fails quickly. Defaults to :obj:`True`
+
+    Returns:
+        Why the host can not be reached or None if it can be reached
+    """
+
+    if host.transport and not host.transport.over_ssh:
+        return None
+
+    direct = host
+
+    while direct.jump:
+        direct = direct.jump
+
+    try:
+        socket.create_connection((direct.url, direct.ssh_port), timeout).close()
+
+        if connect:
+            config.channels.get(host, timeout, retries=0)
+    except Exception as e:
+        return f'{e.__class__.__name__}: {e}'
+
+    return None
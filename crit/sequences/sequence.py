@@ -1,13 +1,37 @@
+import asyncio
 import shutil
+from concurrent.futures import ThreadPoolExecutor, wait
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Union, List
-from crit.exceptions import NotBaseExecutorTypeException
+from enum import Enum, unique
+from queue import Queue
+from typing import Union, List, Iterator, Tuple, Callable
+from crit.exceptions import NotBaseExecutorTypeException, ProcessesNotSupportedException
 from termcolor import colored
 from crit.config import config, Host
-from crit.executors import BaseExecutor, Result
+from crit.executors import BaseExecutor, SingleExecutor, BarrierExecutor, CoalescedExecutor, Result
 from crit.executors.result import Status
-from crit.sequences.thread_executor import ThreadExecutor
+from crit.sequences.executor_graph import ExecutorGraph, Progress
+from crit.sequences.durations import Durations
+from crit.sequences.throttles import Throttles
+from crit.sequences.coalesce import coalesce
+from crit.sequences.batches import split_batches, failed_percentage, preconnect
+from crit.sequences.probe import probe
+from crit.sequences.shards import Shard, run_in_processes
+from crit.sequences.worker_pool import WorkerPool, run_executor_async
+
+
+@unique
+class Strategy(Enum):
+    """
+    Decides how the hosts move through the executors of a sequence
+
+    * `LINEAR`: Every host runs the executor before any host starts the next executor
+    * `FREE`: Every host moves through the executors on its own and only waits for the other hosts at a :obj:`BarrierExecutor`
+    """
+
+    LINEAR = 'linear'
+    FREE = 'free'
 
 
 @dataclass
@@ -18,64 +42,765 @@ class Sequence:
     Args:
         executors (List[Union[BaseExecutor, Callable[[], List[BaseExecutor]]]]): The executors that will be ran in the same order as this list. This list can also contain a function that returns executors. This is because you can than use runtime variables. :obj:`required`
         hosts (Union[Host, List[Host]]): The hosts on which this sequence will run. :obj:`optional`
+        strategy (Strategy): How the hosts move through the executors. Defaults to :obj:`Strategy.LINEAR`
+        forks (int): The maximum amount of executors that run at the same time over all hosts. The :obj:`--forks` option of the cli overwrites this. Defaults to the amount of hosts times the amount of executors that can run at the same time on a host, with at most :obj:`default_max_forks`. With processes the forks are divided over the processes
+        processes (int): Shards the hosts over this amount of worker processes which each run the sequence on their own hosts. Executors with their own hosts outside of the sequence run in the first process only. The forks and the limits of throttles that are not per host are divided over the processes, with at least one per process. Fail fast stops all the processes. The :obj:`--processes` option of the cli overwrites this. :obj:`optional`
+        batch (List[Union[int, str]]): Runs the sequence on batches of hosts one after another. The sizes are an amount of hosts or a percentage of the hosts, for example :obj:`[1, '10%', '50%']`. The last size is used for the rest of the hosts. :obj:`optional`
+        max_fail_percentage (float): Stops the sequence when more than this percentage of the hosts in a batch failed. Only used together with batch. :obj:`optional`
+        fail_fast (bool): Stops starting executors on all hosts after the first executor that fails. The executors that are running finish. The :obj:`--fail-fast` option of the cli also turns this on. Defaults to :obj:`False`
+        preconnect (bool): Probes all the hosts at the same time and connects to them before the first executor runs. Hosts that can not be reached fail right away, so they do not hold up the first executor. The :obj:`--preconnect` option of the cli also turns this on. Defaults to :obj:`False`
+        connect_timeout (float): Seconds the preconnect waits for a host. Defaults to :obj:`5`
+        durations_file (str): Json file in which the durations of the executors are kept between runs. The executors that are expected to take the longest start first. The :obj:`--durations-file` option of the cli overwrites this. :obj:`optional`
+        coalesce (bool): Runs consecutive single executors as one script on a host, so they cost one round trip. The commands of the executors are built before the script runs, so do not coalesce executors of which the command depends on the registry of the executors before them. The :obj:`--coalesce` option of the cli also turns this on. Defaults to :obj:`False`
 
     Attributes:
         term_width (int): Width of the terminal
+        default_max_forks (int): The most forks a sequence uses when the forks are not set, so a big inventory does not start a thread per host
+        pool (WorkerPool): The pool of threads that runs the executors
+        semaphore (asyncio.Semaphore): Limits the amount of executors that run at the same time in :obj:`run_async`
+        durations (Durations): How long the executors ran on every host
+        throttles (Throttles): How many executors run per throttle of the general config
+        shard (Shard): The shard the sequence runs in when it runs in a worker process
     """
 
     executors: List[BaseExecutor]
     hosts: Union[Host, List[Host]] = None
+    strategy: Strategy = Strategy.LINEAR
+    forks: int = None
+    processes: int = None
+    batch: List[Union[int, str]] = None
+    max_fail_percentage: float = None
+    fail_fast: bool = False
+    preconnect: bool = False
+    connect_timeout: float = 5
+    durations_file: str = None
+    coalesce: bool = False
 
     term_width = shutil.get_terminal_size((80, 20)).columns - 1
+    default_max_forks = 50
+    pool: WorkerPool = None
+    semaphore: asyncio.Semaphore = None
+    durations: Durations = None
+    throttles: Throttles = None
+    shard: Shard = None
 
     def run(self):
         """
         Runs all the executors in this sequence and closes all the channels of the hosts after running the executors
         """
         self.hosts = self.hosts or config.hosts
+        self.durations = Durations(config.durations_file or self.durations_file)
+        config.cancelled.clear()
+
+        try:
+            if config.preconnect or self.preconnect:
+                self.warm_up()
+
+            if self.batch:
+                self.run_batches()
+            else:
+                self.run_hosts()
+        finally:
+            self.close_channels()
+
+        self.durations.save()
+
+    def run_hosts(self):
+        """
+        Runs the executors on the hosts of the sequence. Shards the hosts over worker processes when processes is set
+        """
+
+        if self.get_processes() > 1:
+            run_in_processes(self, self.get_processes())
+        else:
+            self.run_executors()
+
+    def run_batches(self):
+        """
+        Runs the sequence on one batch of hosts after another. The connections to the hosts of the next batch are made while the current batch runs.
+        Stops when more than max_fail_percentage of the hosts in a batch failed
+        """
+
+        hosts = self.hosts
+        batches = split_batches(hosts, self.batch)
+        connecting = []
+
+        with ThreadPoolExecutor(max_workers=self.get_forks(), thread_name_prefix='crit-connect') as connector:
+            for i, batch in enumerate(batches):
+                wait(connecting)
 
-        self.run_executors()
+                # Connections can not be shared with worker processes
+                if i + 1 < len(batches) and self.get_processes() <= 1:
+                    connecting = [connector.submit(preconnect, host) for host in batches[i + 1]]
+
+                in_config = self.start_batch(i, batches)
+                self.run_hosts()
+
+                if self.finish_batch(i, in_config):
+                    break
+
+        self.hosts = hosts
+
+    async def run_batches_async(self):
+        """
+        Same as :obj:`run_batches` but runs the batches on the event loop. The connections to the next batch are made in threads
+        """
+
+        loop = asyncio.get_running_loop()
+        hosts = self.hosts
+        batches = split_batches(hosts, self.batch)
+        connecting = []
+
+        with ThreadPoolExecutor(max_workers=self.get_forks(), thread_name_prefix='crit-connect') as connector:
+            for i, batch in enumerate(batches):
+                await asyncio.gather(*connecting)
+
+                if i + 1 < len(batches):
+                    connecting = [loop.run_in_executor(connector, preconnect, host) for host in batches[i + 1]]
+
+                in_config = self.start_batch(i, batches)
+                await self.run_executors_async()
+
+                if self.finish_batch(i, in_config):
+                    break
+
+            await asyncio.gather(*connecting)
+
+        self.hosts = hosts
+
+    def start_batch(self, index: int, batches: List[List[Host]]) -> List[Host]:
+        """
+        Prints the title of the batch and makes its hosts the hosts of the sequence
+
+        Args:
+            index (int): The index of the batch
+            batches (List[List[Host]]): All the batches
+
+        Returns:
+            The hosts of the batch that are in the config, so the hosts that fail in the batch can be found
+        """
+
+        batch = batches[index]
+        self.print_batch_title(index + 1, len(batches), batch)
+        self.hosts = batch
+
+        return [host for host in batch if host in config.hosts]
+
+    def finish_batch(self, index: int, in_config: List[Host]) -> bool:
+        """
+        Frees the connections of the batch that ran and checks if the sequence has to stop
+
+        Args:
+            index (int): The index of the batch
+            in_config (List[Host]): The hosts of the batch that were in the config before it ran
+
+        Returns:
+            If more than max_fail_percentage of the hosts in the batch failed or the run is cancelled
+        """
+
+        batch = self.hosts
+        failed_hosts = [host for host in in_config if host not in config.hosts]
+
+        # The hosts of this batch are done, only the connections to the next batch are still needed
+        config.channels.evict_idle(batch)
+
+        if self.max_fail_percentage is not None and failed_percentage(batch, failed_hosts) > self.max_fail_percentage:
+            Result(Status.FAIL, message=f'Stopped the sequence because {len(failed_hosts)} of the {len(batch)} hosts failed in batch {index + 1}').to_table()
+
+            return True
+
+        return config.cancelled.is_set()
+
+    def warm_up(self):
+        """
+        Probes and connects to the hosts with as many at the same time as there are forks. The hosts that can not be reached get a failed result and are removed from the sequence.
+        Worker processes and the broker can not use the connections of the main process, so with processes or a broker only the ssh port is probed
+        """
+
+        connect = self.get_processes() <= 1 and not config.broker
+
+        with ThreadPoolExecutor(max_workers=self.get_forks(), thread_name_prefix='crit-connect') as connector:
+            errors = list(connector.map(lambda host: probe(host, self.connect_timeout, connect), self.hosts))
+
+        unreachable = [(host, error) for host, error in zip(self.hosts, errors) if error]
+
+        if unreachable:
+            self.print_name('Preconnect')
+
+            for host, error in unreachable:
+                Result(Status.FAIL, message=f'Host can not be reached. {error}').to_table(host)
+
+            self.hosts = [host for host, error in zip(self.hosts, errors) if not error]
+
+    async def run_async(self):
+        """
+        Runs all the executors in this sequence on the asyncio event loop and closes all the channels of the hosts after running the executors.
+        This can be awaited by applications that already run an event loop. Batches and preconnect work the same as in :obj:`run`
+
+        Raises:
+            ProcessesNotSupportedException: When the hosts should be sharded over worker processes, which can not be forked from a running event loop
+        """
+        if self.get_processes() > 1:
+            raise ProcessesNotSupportedException()
+
+        self.hosts = self.hosts or config.hosts
+        self.durations = Durations(config.durations_file or self.durations_file)
+        config.cancelled.clear()
+
+        try:
+            if config.preconnect or self.preconnect:
+                await asyncio.get_running_loop().run_in_executor(None, self.warm_up)
+
+            if self.batch:
+                await self.run_batches_async()
+            else:
+                await self.run_executors_async()
+        finally:
+            self.close_channels()
+
+        self.durations.save()
+
+    def close_channels(self):
+        """
+        Closes the channels of all the hosts
+        """
 
-        for name, channel in config.channels.items():
-            channel.close()
+        config.channels.close_all()
+
+    def cancel(self):
+        """
+        Cancels the run. No executors are started after this and closing the channels makes the running executors stop right away
+        """
+
+        config.cancelled.set()
+        self.close_channels()
+
+    def get_forks(self) -> int:
+        """
+        Gets the maximum amount of executors that run at the same time. The cli option goes before the forks of the sequence.
+        Without them the sequence uses a fork per executor that can run at the same time, with at most default_max_forks. In a shard every process gets an equal part of the forks
+
+        Returns:
+            The amount of forks
+        """
+
+        shards = self.shard.count if self.shard else 1
+
+        if config.forks or self.forks:
+            return max((config.forks or self.forks) // shards, 1)
+
+        executors = [executor for executor in self.executors if not isinstance(executor, BarrierExecutor)]
+        width = max([len(level) for level in ExecutorGraph(executors).levels()] + [1])
+
+        return min(max(len(self.hosts), 1) * width, max(self.default_max_forks // shards, 1))
+
+    def get_processes(self) -> int:
+        """
+        Gets the amount of worker processes the hosts are sharded over. The cli option goes before the processes of the sequence
+
+        Returns:
+            The amount of processes
+        """
+
+        return config.processes or self.processes or 1
 
     def run_executors(self):
         """
-        Runs all the executors in an array on every host
+        Runs all the executors in an array on every host based on the strategy of the sequence
         """
-        running_threads = []
 
-        for executor in self.executors:
-            if not self.has_tags(executor):
-                if config.verbose <= 3:
+        self.throttles = Throttles(config.general_config.throttles if config.general_config else None, self.shard.count if self.shard else 1)
+        self.validate_executors()
+        self.durations = self.durations or Durations()
+
+        self.set_positions()
+
+        if config.coalesce or self.coalesce:
+            self.executors = coalesce(self.executors)
+            self.set_positions()
+        self.pool = WorkerPool(self.get_forks())
+
+        try:
+            if self.strategy == Strategy.FREE:
+                self.run_free()
+            else:
+                self.run_linear()
+        except KeyboardInterrupt:
+            self.cancel()
+            raise
+        finally:
+            self.pool.shutdown()
+
+    async def run_executors_async(self):
+        """
+        Runs all the executors in an array on every host based on the strategy of the sequence as coroutines on the event loop
+        """
+
+        self.throttles = Throttles(config.general_config.throttles if config.general_config else None, self.shard.count if self.shard else 1)
+        self.validate_executors()
+        self.durations = self.durations or Durations()
+
+        self.set_positions()
+
+        if config.coalesce or self.coalesce:
+            self.executors = coalesce(self.executors)
+            self.set_positions()
+        self.semaphore = asyncio.Semaphore(self.get_forks())
+
+        try:
+            if self.strategy == Strategy.FREE:
+                await self.run_free_async()
+            else:
+                await self.run_linear_async()
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self.cancel()
+            raise
+
+    def run_linear(self):
+        """
+        Runs every executor on all the hosts and waits for all the hosts before starting the next executor.
+        Executors that do not depend on each other run at the same time
+        """
+
+        for level in self.linear_levels():
+            if len(level) == 1:
+                self.print_title(level[0][0])
+
+            steps = [(executor, copy) for executor, copies in level for copy in copies]
+            waiting = list(enumerate(copy for executor, copy in steps))
+            finished = Queue()
+            done = set()
+            printed = 0
+
+            running = self.start_waiting(waiting, 0, self.expected_duration, finished)
+
+            while running:
+                index, future = finished.get()
+                running -= 1
+
+                self.throttles.release(future.result())
+                done.add(index)
+
+                running += self.start_waiting(waiting, running, self.expected_duration, finished)
+                printed = self.print_steps(steps, done, printed, len(level) > 1)
+
+            # The executors that did not start because the run is cancelled have no result
+            self.print_steps(steps, set(range(len(steps))), printed, len(level) > 1)
+
+    async def run_linear_async(self):
+        """
+        Same as :obj:`run_linear` but runs the executors as coroutines
+        """
+
+        for level in self.linear_levels():
+            if len(level) == 1:
+                self.print_title(level[0][0])
+
+            # The copies are changed in place, so the results are printed in the order of the level
+            await asyncio.gather(*[self.run_executor_async(copy) for copy in self.longest_first(level)])
+
+            for executor, copies in level:
+                if len(level) > 1:
                     self.print_title(executor)
 
-                    Result(Status.SKIPPING, message='Skipping based on tags').to_table()
+                for copy in copies:
+                    self.finish_executor(copy)
+
+    def linear_levels(self) -> Iterator[List[Tuple[BaseExecutor, List[BaseExecutor]]]]:
+        """
+        Goes through the levels of executors that can run at the same time for the linear strategy
+
+        Returns:
+            For every level the executors with a copy of the executor for each host it runs on
+        """
+
+        executors = [executor for executor in self.executors if not isinstance(executor, BarrierExecutor)]
+        graph = ExecutorGraph(executors, self.executors)
+
+        for level in graph.levels():
+            if config.cancelled.is_set():
+                return
+
+            steps = []
+
+            for index in level:
+                executor = executors[index]
+
+                if not self.has_tags(executor):
+                    if config.verbose <= 3:
+                        self.print_title(executor)
+
+                        Result(Status.SKIPPING, message='Skipping based on tags').to_table()
+
+                    continue
+
+                copies = []
+
+                for host in self.executor_hosts(executor):
+                    copy = deepcopy(executor)
+                    copy.host = host
+
+                    copies.append(copy)
+
+                # In a shard an executor with its own hosts can have no host in the shard
+                if copies:
+                    steps.append((executor, copies))
+
+            if steps:
+                yield steps
+
+    def executor_hosts(self, executor: BaseExecutor) -> List[Host]:
+        """
+        Gets the hosts the executor runs on, which are its own hosts or otherwise the hosts of the sequence.
+        In a shard the own hosts of the other shards are left out and the own hosts outside of the sequence only run in the first shard, so they run once
+
+        Args:
+            executor (BaseExecutor): The executor
+
+        Returns:
+            The hosts of the executor
+        """
+
+        if not executor.hosts:
+            return self.hosts
 
+        if not self.shard:
+            return executor.hosts
+
+        return [host for host in executor.hosts if host in self.hosts or (self.shard.index == 0 and host not in self.shard.hosts)]
+
+    def all_hosts(self) -> List[Host]:
+        """
+        Gets the hosts of the sequence together with the own hosts of the executors, which do not have to be hosts of the sequence
+
+        Returns:
+            Every host an executor of the sequence runs on
+        """
+
+        hosts = list(self.hosts)
+
+        for executor in self.executors:
+            hosts += [host for host in self.executor_hosts(executor) if host not in hosts]
+
+        return hosts
+
+    def longest_first(self, level: List[Tuple[BaseExecutor, List[BaseExecutor]]]) -> List[BaseExecutor]:
+        """
+        Orders the copies of a level so the ones that are expected to take the longest start first.
+        Without recorded durations the order of the level is kept
+
+        Args:
+            level (List[Tuple[BaseExecutor, List[BaseExecutor]]]): The executors with their copies
+
+        Returns:
+            The copies in the order they should start
+        """
+
+        copies = [copy for executor, copies in level for copy in copies]
+
+        return sorted(copies, key=lambda copy: self.durations.expected(copy, copy.host), reverse=True)
+
+    def expected_duration(self, item: Tuple[int, BaseExecutor]) -> float:
+        """
+        The priority of a waiting executor of the linear strategy, which is how long it is expected to run on its host
+        """
+
+        return self.durations.expected(item[1], item[1].host)
+
+    def print_steps(self, steps: List[Tuple[BaseExecutor, BaseExecutor]], done: set, printed: int, show_titles: bool) -> int:
+        """
+        Prints the results of a level of the linear strategy in the order of the level. Stops at the first copy that is not done yet
+
+        Args:
+            steps (List[Tuple[BaseExecutor, BaseExecutor]]): The executor and the copy of every step in the level
+            done (set): The indexes of the steps that are done
+            printed (int): The amount of steps that are already printed
+            show_titles (bool): Prints the title of an executor before its first copy
+
+        Returns:
+            The amount of steps that are printed
+        """
+
+        while printed < len(steps) and printed in done:
+            executor, copy = steps[printed]
+
+            if show_titles and (printed == 0 or steps[printed - 1][0] is not executor):
+                self.print_title(executor)
+
+            self.finish_executor(copy)
+            printed += 1
+
+        return printed
+
+    def run_free(self):
+        """
+        Runs the executors on every host without waiting for the other hosts. The hosts only wait for each other at a :obj:`BarrierExecutor`.
+        A host that fails stops running executors for the rest of the sequence
+        """
+
+        failed_hosts = []
+
+        for executors in self.split_on_barriers():
+            graph = ExecutorGraph(executors, self.executors)
+            finished = Queue()
+            progress = {}
+            priorities = {}
+            waiting = []
+            running = 0
+
+            for host in self.all_hosts():
+                if repr(host) in failed_hosts:
+                    continue
+
+                progress[repr(host)] = Progress()
+                priorities[repr(host)] = self.critical_paths(host, graph)
+                waiting += self.ready_executors(host, graph, progress[repr(host)])
+
+            def priority(item: Tuple[int, BaseExecutor]) -> float:
+                return priorities[repr(item[1].host)][item[0]]
+
+            running += self.start_waiting(waiting, running, priority, finished)
+
+            while running:
+                index, future = finished.get()
+                running -= 1
+
+                executor = future.result()
+                self.throttles.release(executor)
+                progress[repr(executor.host)].done.add(index)
+
+                if self.finish_executor(executor, show_name=True):
+                    failed_hosts.append(repr(executor.host))
+                    waiting = [(i, ready) for i, ready in waiting if repr(ready.host) not in failed_hosts]
+
+                if repr(executor.host) not in failed_hosts:
+                    waiting += self.ready_executors(executor.host, graph, progress[repr(executor.host)])
+
+                running += self.start_waiting(waiting, running, priority, finished)
+
+    async def run_free_async(self):
+        """
+        Same as :obj:`run_free` but runs the executors as coroutines
+        """
+
+        failed_hosts = []
+
+        for executors in self.split_on_barriers():
+            graph = ExecutorGraph(executors, self.executors)
+            hosts = [host for host in self.all_hosts() if repr(host) not in failed_hosts]
+
+            # The hosts that are expected to take the longest get the semaphore first
+            hosts.sort(key=lambda host: max(self.critical_paths(host, graph) + [0]), reverse=True)
+
+            await asyncio.gather(*[self.run_host_async(host, graph, failed_hosts) for host in hosts])
+
+    async def run_host_async(self, host: Host, graph: ExecutorGraph, failed_hosts: List[str]):
+        """
+        Runs the executors on one host for the free strategy
+
+        Args:
+            host (Host): The host the executors will run on
+            graph (ExecutorGraph): The executors till the next barrier
+            failed_hosts (List[str]): The hosts that failed. The host is added to it when an executor fails
+        """
+
+        progress = Progress()
+        priorities = self.critical_paths(host, graph)
+        running = {}
+
+        while True:
+            if repr(host) not in failed_hosts:
+                ready = self.ready_executors(host, graph, progress)
+                ready.sort(key=lambda item: priorities[item[0]], reverse=True)
+
+                for index, executor in ready:
+                    running[asyncio.ensure_future(self.run_executor_async(executor))] = index
+
+            if not running:
+                return
+
+            done, pending = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                progress.done.add(running.pop(task))
+
+                if self.finish_executor(task.result(), show_name=True):
+                    failed_hosts.append(repr(host))
+
+    def critical_paths(self, host: Host, graph: ExecutorGraph) -> List[float]:
+        """
+        Gets for every executor in the graph how long it is expected to take till the end of the graph on the host
+
+        Args:
+            host (Host): The host the executors will run on
+            graph (ExecutorGraph): The executors till the next barrier
+
+        Returns:
+            The expected seconds till the end of the graph for every executor
+        """
+
+        return graph.critical_paths(lambda index: self.durations.expected(graph.executors[index], host))
+
+    def start_waiting(self, waiting: List[Tuple[int, BaseExecutor]], running: int, priority: Callable[[Tuple[int, BaseExecutor]], float], finished: Queue) -> int:
+        """
+        Starts the waiting executors while there are free workers in the pool. The executor with the highest priority starts first.
+        Executors of which the throttle is full keep waiting, so no worker blocks on a throttle
+
+        Args:
+            waiting (List[Tuple[int, BaseExecutor]]): The executors that can start. The started executors are removed from it
+            running (int): The amount of executors that are running
+            priority (Callable[[Tuple[int, BaseExecutor]], float]): Gets the priority of a waiting executor, like its critical path
+            finished (Queue): The queue the index and the future are put in when the executor is done
+
+        Returns:
+            The amount of executors that started
+        """
+
+        waiting.sort(key=priority, reverse=True)
+        started = 0
+
+        for item in list(waiting):
+            if running + started >= self.pool.forks or config.cancelled.is_set():
+                break
+
+            index, executor = item
+
+            if not self.throttles.available(executor):
                 continue
 
-            self.print_title(executor)
+            waiting.remove(item)
+            self.throttles.acquire(executor)
+            self.pool.run(executor).add_done_callback(lambda future, index=index: finished.put((index, future)))
+            started += 1
 
-            hosts = executor.hosts or self.hosts
-            for host in hosts:
-                executor = deepcopy(executor)
-                if isinstance(executor, BaseExecutor):
-                    executor.host = host
+        return started
+
+    async def run_executor_async(self, executor: BaseExecutor) -> BaseExecutor:
+        """
+        Runs the executor as a coroutine when its throttle has room. Waiting for the throttle happens before taking a fork
+
+        Args:
+            executor (BaseExecutor): The executor with the host it runs on
+
+        Returns:
+            The executor that has run
+        """
+
+        await self.throttles.acquire_async(executor)
 
-                    thread = ThreadExecutor(executor)
-                    thread.start()
+        try:
+            return await run_executor_async(executor, self.semaphore)
+        finally:
+            await self.throttles.release_async(executor)
 
-                    running_threads.append(thread)
+    def ready_executors(self, host: Host, graph: ExecutorGraph, progress: Progress) -> List[Tuple[int, BaseExecutor]]:
+        """
+        Gets the executors of which all the dependencies are done on the host. Executors that do not run on the host are done right away
+
+        Args:
+            host (Host): The host the executors will run on
+            graph (ExecutorGraph): The executors till the next barrier
+            progress (Progress): How far the host is. The returned executors are marked as started
+
+        Returns:
+            The index in the graph and a copy of the executor for the host
+        """
+
+        executors = []
+        ready = graph.ready(progress)
+
+        if config.cancelled.is_set():
+            return executors
+
+        while ready:
+            for index in ready:
+                executor = graph.executors[index]
+                progress.started.add(index)
+
+                if self.has_tags(executor) and host in self.executor_hosts(executor):
+                    executor = deepcopy(executor)
+                    executor.host = host
+
+                    executors.append((index, executor))
                 else:
-                    raise NotBaseExecutorTypeException()
+                    progress.done.add(index)
+
+            ready = graph.ready(progress)
+
+        return executors
+
+    def finish_executor(self, executor: BaseExecutor, show_name: bool = False) -> bool:
+        """
+        Prints the result of the executor if it has one. Cancels the run when the executor failed and the sequence should fail fast.
+        The executors of a coalesced executor are printed one by one
+
+        Args:
+            executor (BaseExecutor): The executor that has run
+            show_name (bool): Shows the name of the executor. Used when the title of the executor is not printed before
+
+        Returns:
+            If the executor failed
+        """
+
+        if executor.duration is not None:
+            self.durations.record(executor, executor.host, executor.duration)
+
+        if isinstance(executor, CoalescedExecutor):
+            return any([self.finish_executor(coalesced, show_name=True) for coalesced in executor.executors])
+
+        if not executor.result:
+            return False
+
+        executor.result.to_table(executor.host, (executor.name or executor.__class__.__name__) if show_name else None)
+
+        failed = executor.result.status == Status.FAIL
+
+        if failed and (config.fail_fast or self.fail_fast):
+            config.cancelled.set()
+
+        return failed
 
-            for running_executor in running_threads:
-                result = running_executor.join()
+    def set_positions(self):
+        """
+        Gives the executors their position in the sequence, which keeps them apart in the durations. An executor keeps its position when the sequence runs again,
+        for the next batch, and a coalesced executor gets the position of its first executor
+        """
 
-                if result:
-                    result.to_table(running_executor.executor.host)
+        for index, executor in enumerate(self.executors):
+            if executor.position is None:
+                executor.position = executor.executors[0].position if isinstance(executor, CoalescedExecutor) else index
 
-            running_threads = []
+    def validate_executors(self):
+        """
+        Checks if all the executors in the sequence are executors and if their items can be filled in
+        """
+
+        for executor in self.executors:
+            if not isinstance(executor, BaseExecutor):
+                raise NotBaseExecutorTypeException()
+
+            if isinstance(executor, SingleExecutor) and executor.items:
+                executor.item_executors()
+
+            self.throttles.validate(executor)
+
+    def split_on_barriers(self) -> List[List[BaseExecutor]]:
+        """
+        Splits the executors in parts which are separated by a :obj:`BarrierExecutor`
+
+        Returns:
+            The executors between the barriers
+        """
+
+        parts = [[]]
+
+        for executor in self.executors:
+            if isinstance(executor, BarrierExecutor):
+                parts.append([])
+            else:
+                parts[-1].append(executor)
+
+        return parts
 
     def has_tags(self, executor: BaseExecutor) -> bool:
         """
@@ -103,15 +828,34 @@ class Sequence:
 
         return True
 
+    def print_batch_title(self, number: int, total: int, batch: List[Host]):
+        """
+        Prints the title of a batch in the commandline
+        """
+
+        line = '#' * self.term_width
+
+        print('\n')
+        print(line)
+        print(colored(f'Batch {number}/{total}: ' + ', '.join([repr(host) for host in batch]), attrs=['bold']))
+        print(line)
+
     def print_title(self, executor):
         """
         Prints the title of the executor in the commandline
         """
 
+        self.print_name(executor.name or executor.__class__.__name__)
+
+    def print_name(self, name: str):
+        """
+        Prints a title in the commandline
+        """
+
         if len(config.hosts) != 0:
             line = '=' * self.term_width
 
             print('\n')
             print(line)
-            print(colored(executor.name or executor.__class__.__name__, attrs=['bold']))
+            print(colored(name, attrs=['bold']))
             print(line)
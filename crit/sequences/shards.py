@@ -0,0 +1,156 @@
+import io
+import multiprocessing
+import sys
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from crit.config import config, Host
+from crit.connections import ConnectionPool
+
+# The sequence the worker processes run. It is set by the initializer of the pool
+sequence: 'crit.sequences.Sequence' = None
+
+
+@dataclass
+class Shard:
+    """
+    The part of the hosts a worker process runs the sequence on
+
+    Args:
+        index (int): The number of the shard, the first shard is 0
+        count (int): The amount of shards
+        hosts (List[Host]): The hosts of all the shards together
+    """
+
+    index: int
+    count: int
+    hosts: List[Host]
+
+
+@dataclass
+class ShardResult:
+    """
+    What a worker process sends back to the main process after running its shard
+
+    Args:
+        output (str): Everything the worker printed to the terminal
+        registry (dict): The registry of the hosts in the shard
+        failed_hosts (List[Host]): The hosts that failed in the shard
+        durations (dict): The durations of the executors that ran in the shard
+    """
+
+    output: str
+    registry: dict
+    failed_hosts: List[Host]
+    durations: dict
+
+
+class ShardOutput(io.StringIO):
+    """
+    Captures the output of a worker process. Keeps the colors of the terminal the main process writes to
+    """
+
+    def isatty(self) -> bool:
+        return sys.__stdout__.isatty()
+
+
+def split_hosts(hosts: List[Host], processes: int) -> List[List[Host]]:
+    """
+    Splits the hosts in a shard for every process
+
+    Args:
+        hosts (List[Host]): The hosts of the sequence
+        processes (int): The amount of worker processes
+
+    Returns:
+        The hosts for every process. Never returns empty shards
+    """
+
+    shards = [hosts[i::processes] for i in range(processes)]
+
+    return [shard for shard in shards if shard]
+
+
+def set_sequence(shard_sequence: 'crit.sequences.Sequence', cancelled: 'multiprocessing.synchronize.Event'):
+    """
+    Initializer of the worker processes
+
+    Args:
+        shard_sequence (Sequence): The sequence that runs in the worker process
+        cancelled (multiprocessing.synchronize.Event): Is shared by all the processes, so a cancelled run stops starting executors in every shard
+    """
+
+    global sequence
+    sequence = shard_sequence
+
+    # The connections of the main process can not be used in the forked process
+    config.channels = ConnectionPool()
+    config.cancelled = cancelled
+
+
+def run_shard(shard: Tuple[Shard, List[Host]]) -> ShardResult:
+    """
+    Runs the sequence on a shard of the hosts inside a worker process
+
+    Args:
+        shard (Tuple[Shard, List[Host]]): The shard and the hosts of this shard
+
+    Returns:
+        The output, registry, failed hosts and durations of the shard
+    """
+
+    output = ShardOutput()
+    sequence.shard, sequence.hosts = shard
+
+    # The own hosts of executors that are outside of the sequence only run in the first shard
+    hosts = sequence.all_hosts()
+    in_config = [host for host in hosts if host in config.hosts]
+
+    with redirect_stdout(output):
+        sequence.run_executors()
+        sequence.close_channels()
+
+    return ShardResult(
+        output=output.getvalue(),
+        registry={repr(host): config.registry[repr(host)] for host in hosts if repr(host) in config.registry},
+        failed_hosts=[host for host in in_config if host not in config.hosts],
+        durations=sequence.durations.durations
+    )
+
+
+def run_in_processes(shard_sequence: 'crit.sequences.Sequence', processes: int):
+    """
+    Shards the hosts of the sequence over a pool of worker processes and merges the output, registry and failed hosts back into the main process.
+    The workers are forked so the sequence and the config do not have to be pickled. Executors with their own hosts run once and the forks and throttles
+    are divided over the processes
+
+    Args:
+        shard_sequence (Sequence): The sequence to run
+        processes (int): The amount of worker processes
+    """
+
+    shards = split_hosts(shard_sequence.hosts, processes)
+    context = multiprocessing.get_context('fork')
+    cancelled = context.Event()
+
+    if config.cancelled.is_set():
+        cancelled.set()
+
+    # Every shard starts from a fresh fork of the main process, so a worker never runs a sequence that already ran
+    with context.Pool(len(shards), initializer=set_sequence, initargs=(shard_sequence, cancelled), maxtasksperchild=1) as pool:
+        work = [(Shard(index, len(shards), shard_sequence.hosts), hosts) for index, hosts in enumerate(shards)]
+
+        for shard in pool.imap_unordered(run_shard, work):
+            sys.stdout.write(shard.output)
+            config.registry.update(shard.registry)
+
+            if shard_sequence.durations:
+                shard_sequence.durations.merge(shard.durations)
+
+            for host in shard.failed_hosts:
+                if host in config.hosts:
+                    config.hosts.remove(host)
+
+    if cancelled.is_set():
+        config.cancelled.set()
@@ -0,0 +1,108 @@
+import asyncio
+from typing import Dict
+
+from crit.config import Throttle
+from crit.exceptions import ThrottleNotFoundException
+from crit.executors import BaseExecutor
+
+
+class Throttles:
+    """
+    Keeps how many executors run per throttle. The scheduler only starts an executor when its throttle has room,
+    so no worker waits for a throttle
+
+    Args:
+        throttles (Dict[str, Throttle]): The throttles of the general config. :obj:`optional`
+        shards (int): The amount of worker processes the hosts are sharded over. A throttle that is not per host gets an equal part of its limit
+            in every process, with at least one. Defaults to :obj:`1`
+
+    Attributes:
+        running (Dict[str, int]): The amount of running executors per throttle and per throttle and host for throttles per host
+        released (asyncio.Condition): Notifies the coroutines that wait for a throttle when an executor is done
+    """
+
+    throttles: Dict[str, Throttle] = None
+    shards: int = 1
+    running: Dict[str, int] = None
+    released: asyncio.Condition = None
+
+    def __init__(self, throttles: Dict[str, Throttle] = None, shards: int = 1):
+        self.throttles = throttles or {}
+        self.shards = shards
+        self.running = {}
+
+    def validate(self, executor: BaseExecutor):
+        """
+        Checks if the throttle of the executor exists
+        """
+
+        if executor.throttle and executor.throttle not in self.throttles:
+            raise ThrottleNotFoundException(executor)
+
+    def key(self, executor: BaseExecutor) -> str:
+        """
+        The key of the executor in running. Throttles per host count every host on its own
+        """
+
+        if self.throttles[executor.throttle].per_host:
+            return f'{executor.throttle}@{repr(executor.host)}'
+
+        return executor.throttle
+
+    def available(self, executor: BaseExecutor) -> bool:
+        """
+        Checks if the executor can start without going over the limit of its throttle. Executors without a throttle can always start
+        """
+
+        if not executor.throttle:
+            return True
+
+        return self.running.get(self.key(executor), 0) < self.limit(executor)
+
+    def limit(self, executor: BaseExecutor) -> int:
+        """
+        The limit of the throttle of the executor in this process. The hosts of a throttle per host are all in the same process
+        """
+
+        throttle = self.throttles[executor.throttle]
+
+        if throttle.per_host:
+            return throttle.limit
+
+        return max(throttle.limit // self.shards, 1)
+
+    def acquire(self, executor: BaseExecutor):
+        """
+        Counts the executor as running for its throttle
+        """
+
+        if executor.throttle:
+            self.running[self.key(executor)] = self.running.get(self.key(executor), 0) + 1
+
+    def release(self, executor: BaseExecutor):
+        """
+        Counts the executor as done for its throttle
+        """
+
+        if executor.throttle:
+            self.running[self.key(executor)] -= 1
+
+    async def acquire_async(self, executor: BaseExecutor):
+        """
+        Waits on the event loop till the throttle of the executor has room and counts the executor as running
+        """
+
+        self.released = self.released or asyncio.Condition()
+
+        async with self.released:
+            await self.released.wait_for(lambda: self.available(executor))
+            self.acquire(executor)
+
+    async def release_async(self, executor: BaseExecutor):
+        """
+        Counts the executor as done and lets the waiting coroutines check their throttle again
+        """
+
+        async with self.released:
+            self.release(executor)
+            self.released.notify_all()
@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from crit.config import config
+from crit.executors import Result, BaseExecutor
+from crit.executors.result import Status
+
+
+def run_executor(executor: BaseExecutor) -> BaseExecutor:
+    """
+    Runs the executor inside a worker of the pool. An exception is turned into a failed result so the other hosts keep running.
+    Does not run the executor when the run is cancelled
+
+    Args:
+        executor (BaseExecutor): The executor with the host it runs on
+
+    Returns:
+        The executor that has run. The result can be found on the executor
+    """
+
+    if config.cancelled.is_set():
+        return executor
+
+    try:
+        executor.run()
+    except Exception as e:
+        executor.result = Result(Status.FAIL, message=f'{e.__class__.__name__}: {e}')
+
+    return executor
+
+
+async def run_executor_async(executor: BaseExecutor, semaphore: asyncio.Semaphore) -> BaseExecutor:
+    """
+    Same as :obj:`run_executor` but runs the executor as a coroutine
+
+    Args:
+        executor (BaseExecutor): The executor with the host it runs on
+        semaphore (asyncio.Semaphore): Limits the amount of executors that run at the same time
+
+    Returns:
+        The executor that has run. The result can be found on the executor
+    """
+
+    async with semaphore:
+        if config.cancelled.is_set():
+            return executor
+
+        try:
+            await executor.run_async()
+        except Exception as e:
+            executor.result = Result(Status.FAIL, message=f'{e.__class__.__name__}: {e}')
+
+    return executor
+
+
+class WorkerPool(ThreadPoolExecutor):
+    """
+    Bounded pool of threads that runs the executors of a sequence. The threads are reused for every executor in the sequence
+
+    Args:
+        forks (int): The maximum amount of executors that run at the same time. :obj:`required`
+    """
+
+    def __init__(self, forks: int):
+        super().__init__(max_workers=forks, thread_name_prefix='crit')
+        self.forks = forks
+
+    def run(self, executor: BaseExecutor) -> Future:
+        """
+        Schedules the executor in the pool
+
+        Args:
+            executor (BaseExecutor): The executor with the host it runs on
+
+        Returns:
+            Future that returns the executor when it is done
+        """
+
+        return self.submit(run_executor, executor)
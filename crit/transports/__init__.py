@@ -0,0 +1,6 @@
+from .base_transport import BaseTransport
+from .local_transport import LocalTransport
+from .docker_transport import DockerTransport
+from .shell_transport import ShellTransport
+from .agent_transport import AgentTransport
+from .ssh_transport import SshTransport
@@ -0,0 +1,93 @@
+import base64
+from dataclasses import dataclass
+
+from .base_transport import BaseTransport
+
+
+@dataclass(frozen=True)
+class AgentTransport(BaseTransport):
+    """
+    Runs the commands through a small python agent that keeps running on the host over the ssh connection. The agent answers with the exit status,
+    output and stderr of a command in one message. Executors can ask it for the state of a file, package or user in one call instead of parsing the output of a command,
+    so the command does not have to run when nothing changes. The host needs python 3
+
+    Args:
+        sudo (bool): Starts the agent with sudo, so every command runs as root and sudo only asks for the password once. The password of :obj:`-p` is used when sudo asks for it. Defaults to :obj:`False`
+        python (str): The python of the host. Defaults to :obj:`'python3'`
+
+    Attributes:
+        over_ssh (bool): The commands run over the ssh connection of crit
+    """
+
+    sudo: bool = False
+    python: str = 'python3'
+
+    over_ssh = True
+
+    @property
+    def sudo_command(self) -> str:
+        """
+        Commands of an agent with sudo already run as root. Otherwise sudo reads the password from the stdin of the command
+        """
+
+        return '' if self.sudo else "sudo -S -p ''"
+
+    def call(self, host: 'crit.config.Host', method: str, params: dict = None, timeout: float = None) -> dict:
+        """
+        Sends a request to the agent of the host
+
+        Args:
+            host (Host): The host of the agent
+            method (str): The method of the agent, which is :obj:`run`, :obj:`stat`, :obj:`package` or :obj:`user`
+            params (dict): The parameters of the method. :obj:`optional`
+            timeout (float): Seconds to wait for the answer. :obj:`optional`
+
+        Returns:
+            The response of the agent
+        """
+
+        # Imported here because the config imports the transports
+        from crit.config import config
+
+        shell_password = None if not self.sudo or host.passwordless_user else config.linux_password
+
+        return config.channels.agent(host, self.sudo, self.python).call(method, params, timeout, shell_password)
+
+    def exec_command(self, host: 'crit.config.Host', command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Runs the command with the agent of the host
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+            password (str): The sudo password that is the stdin of the command. :obj:`optional`
+            timeout (float): Seconds after which the command is killed. :obj:`optional`
+            pty (bool): Mixes stderr with the output. Defaults to :obj:`True`
+
+        Returns:
+            The output of the command, if it timed out and if the password was incorrect. Without a terminal the stderr and exit status as well
+        """
+
+        password = None if self.sudo else password
+        params = {'command': command, 'input': password + '\n' if password else None, 'timeout': timeout, 'pty': pty}
+
+        # The agent kills the command itself, the extra seconds are for the answer
+        response = self.call(host, 'run', params, timeout + 5 if timeout else None)
+
+        if 'error' in response:
+            error = f"Failed to run the command with the agent: {response['error']}\n".encode()
+            response = {'output': error if pty else b'', 'stderr': error, 'exit_status': -1, 'timed_out': False}
+        elif not response.get('password_incorrect') and not response.get('timed_out'):
+            response['output'] = base64.b64decode(response['output'])
+            response['stderr'] = base64.b64decode(response['stderr'])
+
+        if response.get('timed_out'):
+            return {'output': b'', 'timed_out': True}
+
+        if response.get('password_incorrect') or (password and b'Sorry, try again.' in response['output'] + response['stderr']):
+            return {'password_incorrect': True}
+
+        if pty:
+            return {'output': response['output'], 'timed_out': False}
+
+        return {'output': response['output'], 'stderr': response['stderr'], 'exit_status': response['exit_status'], 'timed_out': False}
@@ -0,0 +1,42 @@
+import asyncio
+from abc import ABCMeta, abstractmethod
+
+
+class BaseTransport(metaclass=ABCMeta):
+    """
+    Runs the commands of a host. Hosts without a transport run their commands with :obj:`SshTransport`
+
+    Attributes:
+        sudo_command (str): The command that is put before commands with sudo
+        over_ssh (bool): The commands run over the ssh connection of crit, so the host can be probed before the run
+        sudo_prompt (bool): The transport answers the prompt of :obj:`SudoPrompt`, so the sudo command of the prompt is used instead of sudo_command
+    """
+
+    sudo_command = 'sudo'
+    over_ssh = False
+    sudo_prompt = False
+
+    @abstractmethod
+    def exec_command(self, host: 'crit.config.Host', command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Runs the command on the host and waits till it is done
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+            password (str): The sudo password that is filled in when the command starts. :obj:`optional`
+            timeout (float): Seconds after which the command is stopped. :obj:`optional`
+            pty (bool): Mixes stderr with the output like a terminal does. Without it stderr is returned in :obj:`stderr` together with the :obj:`exit_status`. Defaults to :obj:`True`
+
+        Returns:
+            A dict with the output of the command in :obj:`output`, :obj:`timed_out` if it did not finish in time and :obj:`password_incorrect` if the sudo password was incorrect
+        """
+
+        pass
+
+    async def exec_command_async(self, host: 'crit.config.Host', command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Same as :obj:`exec_command` for the asyncio engine of the sequence. By default it runs :obj:`exec_command` in the default executor of the loop
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(None, self.exec_command, host, command, password, timeout, pty)
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import List
+
+from .local_transport import LocalTransport
+
+
+@dataclass(frozen=True)
+class DockerTransport(LocalTransport):
+    """
+    Runs the commands inside a running container with :obj:`docker exec`, so the container does not need an ssh server
+
+    Args:
+        container (str): The name or id of the container. Defaults to the url of the host
+        user (str): The user in the container that runs the commands. Defaults to the user of the image
+        docker (str): The docker command. Use for example :obj:`'podman'` for other container engines. Defaults to :obj:`'docker'`
+    """
+
+    container: str = None
+    user: str = None
+    docker: str = 'docker'
+
+    def args(self, host: 'crit.config.Host', command: str) -> List[str]:
+        """
+        The arguments of :obj:`docker exec` that runs the command in the container
+
+        Args:
+            host (Host): The host of the container
+            command (str): The command
+
+        Returns:
+            The program and its arguments
+        """
+
+        user = ['--user', self.user] if self.user else []
+
+        return [self.docker, 'exec', '-i'] + user + [self.container or host.url, 'sh', '-c', command]
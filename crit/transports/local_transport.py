@@ -0,0 +1,72 @@
+import os
+import signal
+import subprocess
+from dataclasses import dataclass
+from typing import List
+
+from .base_transport import BaseTransport
+
+
+@dataclass(frozen=True)
+class LocalTransport(BaseTransport):
+    """
+    Runs the commands in a subprocess on the machine crit runs on, so no ssh server is needed. This is the transport of :obj:`Localhost`.
+    The output of stderr is mixed with stdout like it is over the terminal of an ssh channel, unless the executor runs without a terminal
+
+    Attributes:
+        sudo_command (str): Without a terminal sudo has to read the password from stdin
+    """
+
+    sudo_command = "sudo -S -p ''"
+
+    def args(self, host: 'crit.config.Host', command: str) -> List[str]:
+        """
+        The arguments of the process that runs the command
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+
+        Returns:
+            The program and its arguments
+        """
+
+        return ['/bin/sh', '-c', command]
+
+    def exec_command(self, host: 'crit.config.Host', command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Runs the command in a subprocess
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+            password (str): The sudo password that is written to stdin. :obj:`optional`
+            timeout (float): Seconds after which the command is killed. :obj:`optional`
+            pty (bool): Mixes stderr with the output. Defaults to :obj:`True`
+
+        Returns:
+            The output of the command, if it timed out and if the password was incorrect. Without a terminal the stderr and exit status as well
+        """
+
+        # A new session makes it possible to kill the command together with the processes it started
+        process = subprocess.Popen(
+            self.args(host, command),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT if pty else subprocess.PIPE,
+            start_new_session=True
+        )
+
+        try:
+            output, errors = process.communicate((password + '\n').encode() if password else None, timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.communicate()
+
+            return {'output': b'', 'timed_out': True}
+
+        if password and b'Sorry, try again.' in output + (errors or b''):
+            return {'password_incorrect': True}
+
+        if not pty:
+            return {'output': output, 'stderr': errors, 'exit_status': process.returncode, 'timed_out': False}
+
+        return {'output': output, 'timed_out': False}
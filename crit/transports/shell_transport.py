@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+
+from .base_transport import BaseTransport
+
+
+@dataclass(frozen=True)
+class ShellTransport(BaseTransport):
+    """
+    Runs the commands in a shell that keeps running on the host over the ssh connection. A command is written to the shell and the end of its output
+    is found by a sentinel, so a command does not open a channel and start a shell on the host. This saves round trips on hosts with a slow link
+
+    Args:
+        sudo (bool): Starts the shell with sudo, so every command runs as root and sudo only asks for the password once. The password of :obj:`-p` is used when sudo asks for it. Defaults to :obj:`False`
+        shell (str): The shell that runs on the host. Defaults to :obj:`'sh'`
+        keep_state (bool): Keeps the working directory and exported variables of a command for the next commands on the host, for example after :obj:`cd`. Without it every command runs in a subshell. Defaults to :obj:`False`
+
+    Attributes:
+        over_ssh (bool): The commands run over the ssh connection of crit
+    """
+
+    sudo: bool = False
+    shell: str = 'sh'
+    keep_state: bool = False
+
+    over_ssh = True
+
+    @property
+    def sudo_command(self) -> str:
+        """
+        Commands in a shell with sudo already run as root. Otherwise sudo reads the password from the stdin of the command
+        """
+
+        return '' if self.sudo else "sudo -S -p ''"
+
+    def exec_command(self, host: 'crit.config.Host', command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Runs the command in the shell of the host
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+            password (str): The sudo password that is the stdin of the command. :obj:`optional`
+            timeout (float): Seconds after which the shell is closed. :obj:`optional`
+            pty (bool): Mixes stderr with the output. Defaults to :obj:`True`
+
+        Returns:
+            The output of the command, if it timed out and if the password was incorrect. Without a terminal the stderr and exit status as well
+        """
+
+        # Imported here because the config imports the transports
+        from crit.config import config
+
+        if self.sudo:
+            shell_password = None if host.passwordless_user else config.linux_password
+
+            return config.channels.shell(host, True, self.shell, self.keep_state).run(command, None, timeout, pty, shell_password)
+
+        return config.channels.shell(host, False, self.shell, self.keep_state).run(command, password, timeout, pty)
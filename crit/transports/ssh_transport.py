@@ -0,0 +1,253 @@
+import asyncio
+from dataclasses import dataclass
+from threading import BoundedSemaphore
+
+import paramiko
+
+from .base_transport import BaseTransport
+
+
+@dataclass(frozen=True)
+class SshTransport(BaseTransport):
+    """
+    Runs the commands over the pooled ssh connection of crit. Every command opens its own channel on the connection, which is held as one of the
+    sessions of the host till the command ended. This is the transport of hosts that do not have a transport
+
+    Attributes:
+        over_ssh (bool): The commands run over the ssh connection of crit
+        sudo_prompt (bool): The password is written when sudo prints the prompt of :obj:`SudoPrompt`
+    """
+
+    over_ssh = True
+    sudo_prompt = True
+
+    def exec_command(self, host: 'crit.config.Host', command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Runs the command on a channel of the host. The password is checked once per host before the first command with sudo runs on it
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command
+            password (str): The sudo password that is written when sudo asks for it. :obj:`optional`
+            timeout (float): Seconds after which the channel is closed. :obj:`optional`
+            pty (bool): Runs the command in a terminal. Defaults to :obj:`True`
+
+        Returns:
+            The output of the command, if it timed out and if the password was incorrect. Without a terminal the stderr and exit status as well
+        """
+
+        # Imported here because the config imports the transports
+        from crit.config import config
+        from crit.connections import read_command
+
+        if password and not config.channels.check_sudo(host, password):
+            return {'password_incorrect': True}
+
+        with config.channels.session(host):
+            stdin, stdout, stderr = self.start_command(host, command, pty)
+
+            return read_command(stdin, stdout, stderr, password, timeout, pty)
+
+    async def exec_command_async(self, host: 'crit.config.Host', command: str, password: str = None, timeout: float = None, pty: bool = True) -> dict:
+        """
+        Same as :obj:`exec_command` but waits for the session and reads the command on the event loop.
+        Connecting and starting the command are short blocking calls which run in the default executor of the loop
+        """
+
+        from crit.config import config
+
+        loop = asyncio.get_running_loop()
+
+        if password and not await loop.run_in_executor(None, config.channels.check_sudo, host, password):
+            return {'password_incorrect': True}
+
+        session = config.channels.session(host)
+        await self.acquire_session_async(session)
+
+        try:
+            stdin, stdout, stderr = await loop.run_in_executor(None, self.start_command, host, command, pty)
+
+            try:
+                return await asyncio.wait_for(self.read_command_async(stdin, stdout, password, pty), timeout)
+            except asyncio.TimeoutError:
+                return {'output': b'', 'timed_out': True}
+            finally:
+                stdout.channel.close()
+        finally:
+            session.release()
+
+    def start_command(self, host: 'crit.config.Host', command: str, pty: bool = True) -> tuple:
+        """
+        Starts the command on the host. When the connection died since the last command, for example because of a network blip,
+        the client is replaced and the command is started once more
+
+        Args:
+            host (Host): The host to run the command on
+            command (str): The command to start
+            pty (bool): Runs the command in a terminal. Defaults to :obj:`True`
+
+        Returns:
+            The stdin, stdout and stderr of the command
+        """
+
+        from crit.config import config
+
+        try:
+            return self.get_client(host).exec_command(command, get_pty=pty)
+        except (OSError, EOFError, paramiko.SSHException):
+            config.channels.close(host)
+
+            return self.get_client(host).exec_command(command, get_pty=pty)
+
+    async def read_command_async(self, stdin: paramiko.ChannelFile, stdout: paramiko.ChannelFile, password: str = None, pty: bool = True) -> dict:
+        """
+        Reads a started command on the event loop and fills in the password when sudo asks for it
+
+        Args:
+            stdin (ChannelFile): The stdin of the command
+            stdout (ChannelFile): The output of the command
+            password (str): The sudo password. :obj:`optional`
+            pty (bool): The command runs in a terminal. Defaults to :obj:`True`
+
+        Returns:
+            The response like the one of :obj:`exec_command`
+        """
+
+        from crit.connections import SudoPrompt
+
+        prompt = SudoPrompt(stdin, password, pty) if password else None
+
+        if pty:
+            output = await self.read_async(stdout, prompt)
+        else:
+            # Nothing is written, so a command that reads stdin does not wait. With sudo the prompt closes stdin after the password
+            if not prompt:
+                stdout.channel.shutdown_write()
+
+            output, errors, exit_status = await self.read_without_pty_async(stdout, prompt)
+
+        if prompt and (prompt.incorrect or (not pty and b'Sorry, try again.' in errors)):
+            return {'password_incorrect': True}
+
+        if pty:
+            return {'output': output, 'timed_out': False}
+
+        return {'output': output, 'stderr': errors, 'exit_status': exit_status, 'timed_out': False}
+
+    async def read_async(self, stdout: paramiko.ChannelFile, prompt: 'crit.connections.SudoPrompt' = None) -> bytes:
+        """
+        Reads the output of a command until the channel is closed. Waits on the event loop for the channel to become readable
+
+        Args:
+            stdout (ChannelFile): The output of the command
+            prompt (SudoPrompt): Answers the password prompt of sudo in the output. :obj:`optional`
+
+        Returns:
+            The output of the command
+        """
+
+        channel = stdout.channel
+        output = b''
+
+        while True:
+            await self.wait_readable(channel)
+
+            if channel.recv_ready():
+                data = stdout.read(len(channel.in_buffer))
+                output += prompt.feed(data) if prompt else data
+
+                if prompt and prompt.incorrect:
+                    return output
+            elif channel.eof_received or channel.closed:
+                data = stdout.read()
+
+                return output + (prompt.feed(data) + prompt.end() if prompt else data)
+
+    async def read_without_pty_async(self, stdout: paramiko.ChannelFile, prompt: 'crit.connections.SudoPrompt' = None) -> tuple:
+        """
+        Reads the stdout and stderr of a command without a terminal until the channel is closed and waits for its exit status, all on the event loop.
+        Both are read at the same time, so a command with a lot of errors can not fill up the window of the channel
+
+        Args:
+            stdout (ChannelFile): The output of the command
+            prompt (SudoPrompt): Answers the password prompt of sudo in stderr. :obj:`optional`
+
+        Returns:
+            The stdout, stderr and exit status of the command. The exit status is None when the password was incorrect
+        """
+
+        channel = stdout.channel
+        output, errors = b'', b''
+
+        while True:
+            await self.wait_readable(channel)
+
+            if channel.recv_ready():
+                output += stdout.read(len(channel.in_buffer))
+
+            if channel.recv_stderr_ready():
+                data = channel.recv_stderr(32768)
+                errors += prompt.feed(data) if prompt else data
+
+                if prompt and prompt.incorrect:
+                    return output, errors, None
+
+            if (channel.eof_received or channel.closed) and not channel.recv_ready() and not channel.recv_stderr_ready():
+                break
+
+        errors += prompt.end() if prompt else b''
+        delay = 0.001
+
+        # The exit status is sent apart from the output, so it can arrive after the end of the output
+        while not channel.exit_status_ready():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+        return output, errors, channel.recv_exit_status()
+
+    async def wait_readable(self, channel: paramiko.Channel):
+        """
+        Waits on the event loop till the channel has data, an end of file or is closed
+
+        Args:
+            channel (paramiko.Channel): The channel of the command
+        """
+
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        loop.add_reader(channel.fileno(), lambda: readable.done() or readable.set_result(None))
+
+        try:
+            await readable
+        finally:
+            loop.remove_reader(channel.fileno())
+
+    async def acquire_session_async(self, session: BoundedSemaphore):
+        """
+        Waits on the event loop till the session is free. The semaphore is shared with the commands that run in threads, so it is tried without blocking.
+        Blocking a thread of the default executor could use up the threads that the commands which hold the sessions need to finish
+
+        Args:
+            session (BoundedSemaphore): The session of the host
+        """
+
+        delay = 0.001
+
+        while not session.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def get_client(self, host: 'crit.config.Host') -> paramiko.SSHClient:
+        """
+        Gets the paramiko client of the host from the connection pool
+
+        Args:
+            host (Host): The host to connect to
+
+        Returns:
+            Client which can run the commands
+        """
+
+        from crit.utils import get_client
+
+        return get_client(host)
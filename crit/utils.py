@@ -1,3 +1,4 @@
+import paramiko
 from crit.config import config, Host, Localhost
 from crit.exceptions import MoreHostsWithSameUrlException, HostNotFoundException
 
@@ -24,3 +25,17 @@ def get_host_by_name(url: str) -> Host:
         raise HostNotFoundException
 
     return host[0]
+
+
+def get_client(host: Host) -> paramiko.SSHClient:
+    """
+    Gets the paramiko client for the host from the connection pool. The client is connected the first time and reused after that
+
+    Args:
+        host (Host): The host to connect to
+
+    Returns:
+        Client which can run the commands
+    """
+
+    return config.channels.get(host)
@@ -63,6 +63,7 @@ setup(
 
     entry_points={'console_scripts': [
         'crit = crit.commands.cli:main',
+        'crit-broker = crit.commands.broker:main',
     ]},
 
     # What does your project relate to?
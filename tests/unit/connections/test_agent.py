@@ -0,0 +1,47 @@
+import base64
+import os
+import tempfile
+import unittest
+from crit.config import config
+from crit.connections import agent
+
+
+class AgentTest(unittest.TestCase):
+    def test_run(self):
+        response = agent.run('echo output; echo error >&2; exit 3', pty=False)
+
+        self.assertEqual(base64.b64decode(response['output']), b'output\n')
+        self.assertEqual(base64.b64decode(response['stderr']), b'error\n')
+        self.assertEqual(response['exit_status'], 3)
+
+    def test_run_input(self):
+        response = agent.run('read password && echo $password', input='secret\n')
+
+        self.assertEqual(base64.b64decode(response['output']), b'secret\n')
+
+    def test_run_timeout(self):
+        self.assertTrue(agent.run('sleep 10', timeout=0.1)['timed_out'])
+
+    def test_stat(self):
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(b'content')
+            file.flush()
+
+            state = agent.stat(file.name)
+
+        self.assertTrue(state['is_file'])
+        self.assertEqual(state['size'], 7)
+        self.assertEqual(state['sha256'], 'ed7002b439e9ac845f22357d822bac1444730fbdb6016d3ec9432297b9ec9f73')
+
+    def test_stat_missing(self):
+        self.assertEqual(agent.stat('/does/not/exist'), {'exists': False})
+
+    def test_user(self):
+        state = agent.user('root')
+
+        self.assertTrue(state['exists'])
+        self.assertEqual(state['uid'], 0)
+        self.assertEqual(agent.user('crit-does-not-exist'), {'exists': False})
+
+    def test_package_missing(self):
+        self.assertEqual(agent.package('crit-does-not-exist'), {'installed': False})
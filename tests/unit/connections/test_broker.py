@@ -0,0 +1,114 @@
+import os
+import tempfile
+import time
+import unittest
+from threading import Thread
+from unittest.mock import Mock
+from crit.config import Host
+from crit.connections import Broker, BrokerClient
+from crit.exceptions import BrokerException
+
+
+def get_client(*lines: bytes, output: bytes = b'output') -> Mock:
+    stdin, stdout = Mock(), Mock()
+    stdout.readline.side_effect = [line.decode() for line in lines]
+    stdout.read.return_value = output
+
+    client = Mock()
+    client.exec_command.return_value = (stdin, stdout, Mock())
+
+    return client
+
+
+class BrokerTest(unittest.TestCase):
+    host = Host(url='first', ssh_user='test')
+
+    def test_exec_command(self):
+        self.broker.pool.connect = Mock(return_value=get_client())
+
+        response = self.client.exec_command(self.host, 'ls')
+
+        self.assertEqual(response['output'], b'output')
+        self.assertFalse(response['timed_out'])
+        self.broker.pool.connect.assert_called_once_with(self.host, 10)
+
+    def test_reuses_connection(self):
+        self.broker.pool.connect = Mock(return_value=get_client())
+
+        self.client.exec_command(self.host, 'ls')
+        self.client.exec_command(self.host, 'ls')
+
+        self.broker.pool.connect.assert_called_once_with(self.host, 10)
+
+    def test_password(self):
+        client = get_client()
+        client.exec_command.return_value[1].channel.recv.side_effect = [b'crit-sudo-', b'password:\r\noutput', b'']
+        self.broker.pool.connect = Mock(return_value=client)
+        self.broker.pool.check_sudo = Mock(return_value=True)
+
+        response = self.client.exec_command(self.host, 'sudo ls', password='secret')
+
+        self.assertEqual(response['output'], b'\r\noutput')
+        client.exec_command.return_value[0].write.assert_called_once_with('secret\n')
+        self.broker.pool.check_sudo.assert_called_once_with(self.host, 'secret')
+
+    def test_password_incorrect(self):
+        client = get_client()
+        client.exec_command.return_value[1].channel.recv.side_effect = [b'crit-sudo-password:', b'Sorry, try again.\r\ncrit-sudo-password:']
+        self.broker.pool.connect = Mock(return_value=client)
+        self.broker.pool.check_sudo = Mock(return_value=True)
+
+        response = self.client.exec_command(self.host, 'sudo ls', password='wrong')
+
+        self.assertTrue(response['password_incorrect'])
+        client.exec_command.return_value[0].write.assert_called_with(chr(3))
+
+    def test_password_checked(self):
+        self.broker.pool.connect = Mock(return_value=get_client())
+        self.broker.pool.check_sudo = Mock(return_value=False)
+
+        response = self.client.exec_command(self.host, 'sudo ls', password='wrong')
+
+        self.assertTrue(response['password_incorrect'])
+        self.broker.pool.connect.assert_not_called()
+
+    def test_no_pty(self):
+        client = get_client()
+        stdout, stderr = client.exec_command.return_value[1:]
+        stderr.read.return_value = b'error'
+        stdout.channel.recv_exit_status.return_value = 2
+        self.broker.pool.connect = Mock(return_value=client)
+
+        response = self.client.exec_command(self.host, 'ls', pty=False)
+
+        self.assertEqual(response['stderr'], b'error')
+        self.assertEqual(response['exit_status'], 2)
+        client.exec_command.assert_called_with('ls', get_pty=False)
+
+    def test_jump(self):
+        self.broker.pool.connect = Mock(return_value=get_client())
+        host = Host(url='first', ssh_user='test', jump=Host(url='bastion', ssh_user='test', data={'ignored': True}))
+
+        self.client.exec_command(host, 'ls')
+
+        self.broker.pool.connect.assert_called_once_with(Host(url='first', ssh_user='test', jump=Host(url='bastion', ssh_user='test')), 10)
+
+    def test_error(self):
+        self.broker.pool.connect = Mock(side_effect=OSError('unreachable'))
+
+        with self.assertRaises(BrokerException):
+            self.client.exec_command(self.host, 'ls')
+
+    def test_not_running(self):
+        self.assertFalse(BrokerClient(os.path.join(tempfile.mkdtemp(), 'none.sock')).is_running())
+
+    def setUp(self):
+        path = os.path.join(tempfile.mkdtemp(), 'broker.sock')
+        self.broker = Broker(path, idle_timeout=1)
+        self.broker.pool.backoff = 0
+        self.client = BrokerClient(path)
+
+        Thread(target=self.broker.serve, daemon=True).start()
+
+        while not self.client.is_running():
+            time.sleep(0.01)
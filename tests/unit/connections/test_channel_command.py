@@ -0,0 +1,50 @@
+import time
+import unittest
+from io import BytesIO
+from unittest.mock import Mock
+from crit.config import config
+from crit.connections import read_command
+
+
+def get_streams(output: bytes = b'output', errors: bytes = b'', exit_status: int = 0):
+    stdin, stdout, stderr = Mock(), BytesIO(output), BytesIO(errors)
+    stdout.channel = Mock()
+    stdout.channel.recv_exit_status.return_value = exit_status
+    stderr.channel = Mock()
+
+    return stdin, stdout, stderr
+
+
+class ReadCommandTest(unittest.TestCase):
+    def test_pty(self):
+        stdin, stdout, stderr = get_streams()
+
+        self.assertEqual(read_command(stdin, stdout, stderr), {'output': b'output', 'timed_out': False})
+        stdout.channel.close.assert_called_once_with()
+
+    def test_no_pty(self):
+        stdin, stdout, stderr = get_streams(errors=b'error', exit_status=2)
+
+        response = read_command(stdin, stdout, stderr, pty=False)
+
+        self.assertEqual(response, {'output': b'output', 'stderr': b'error', 'exit_status': 2, 'timed_out': False})
+        stdout.channel.shutdown_write.assert_called_once_with()
+
+    def test_password(self):
+        stdin, stdout, stderr = get_streams()
+        stdout.channel.recv.side_effect = [b'crit-sudo-password:\r\noutput', b'']
+
+        self.assertEqual(read_command(stdin, stdout, stderr, 'secret')['output'], b'\r\noutput')
+        stdin.write.assert_called_once_with('secret\n')
+
+    def test_password_incorrect_no_pty(self):
+        stdin, stdout, stderr = get_streams(exit_status=1)
+        stderr.channel.recv_stderr.side_effect = [b'crit-sudo-password:', b'Sorry, try again.\nsudo: 1 incorrect password attempt\n', b'']
+
+        self.assertEqual(read_command(stdin, stdout, stderr, 'wrong', pty=False), {'password_incorrect': True})
+
+    def test_timeout(self):
+        stdin, stdout, stderr = get_streams()
+        stdout.read = Mock(side_effect=lambda: time.sleep(0.2) or b'')
+
+        self.assertEqual(read_command(stdin, stdout, stderr, timeout=0.05), {'output': b'', 'timed_out': True})
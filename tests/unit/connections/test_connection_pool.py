@@ -0,0 +1,231 @@
+import time
+import unittest
+import paramiko
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+from crit.config import Host
+from crit.connections import ConnectionPool
+
+
+def get_client(alive: bool = True) -> Mock:
+    client = Mock()
+    client.get_transport.return_value.is_active.return_value = alive
+
+    return client
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    host = Host(url='first', ssh_user='test')
+
+    def test_reuse(self):
+        pool = ConnectionPool()
+        pool.connect = Mock(side_effect=lambda host, timeout: get_client())
+
+        self.assertIs(pool.get(self.host), pool.get(self.host))
+        pool.connect.assert_called_once_with(self.host, 10)
+
+    def test_connect_once_concurrently(self):
+        pool = ConnectionPool()
+        pool.connect = Mock(side_effect=lambda host, timeout: time.sleep(0.05) or get_client())
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            clients = list(executor.map(lambda i: pool.get(self.host), range(5)))
+
+        pool.connect.assert_called_once_with(self.host, 10)
+        self.assertEqual(len({id(client) for client in clients}), 1)
+
+    def test_replace_dead(self):
+        pool = ConnectionPool()
+        dead = get_client(alive=False)
+        pool.connect = Mock(side_effect=[dead, get_client()])
+
+        pool.get(self.host)
+        client = pool.get(self.host)
+
+        self.assertIsNot(client, dead)
+        dead.close.assert_called_once_with()
+
+    def test_evict_idle(self):
+        pool = ConnectionPool(max_idle=0)
+        client = get_client()
+        pool.connect = Mock(return_value=client)
+        pool.get(self.host)
+
+        pool.evict_idle()
+
+        self.assertNotIn(self.host, pool)
+        client.close.assert_called_once_with()
+
+    def test_evict_hosts(self):
+        pool = ConnectionPool()
+        pool.connect = Mock(side_effect=lambda host, timeout: get_client())
+        other = Host(url='second', ssh_user='test')
+        pool.get(self.host)
+        pool.get(other)
+
+        pool.evict_idle([other])
+
+        self.assertIn(self.host, pool)
+        self.assertNotIn(other, pool)
+
+    def test_close_all(self):
+        pool = ConnectionPool()
+        client = get_client()
+        pool.connect = Mock(return_value=client)
+        pool.get(self.host)
+
+        pool.close_all()
+
+        self.assertEqual(len(pool), 0)
+        client.close.assert_called_once_with()
+
+    def test_session(self):
+        pool = ConnectionPool()
+        host = Host(url='first', ssh_user='test', max_sessions=2)
+        session = pool.session(host)
+
+        self.assertIs(pool.session(host), session)
+        self.assertTrue(session.acquire(blocking=False))
+        self.assertTrue(session.acquire(blocking=False))
+        self.assertFalse(session.acquire(blocking=False))
+
+    @patch('paramiko.SSHClient')
+    def test_connect(self, ssh_client):
+        pool = ConnectionPool()
+        pool.keys.private_key = Mock(return_value='key')
+        host = Host(url='first', ssh_user='test', ssh_identity_file='~/.ssh/id_ed25519', ssh_key_password='secret', ssh_agent=True, ssh_port=2222)
+
+        pool.connect(host)
+
+        pool.keys.private_key.assert_called_once_with('~/.ssh/id_ed25519', 'secret')
+        ssh_client.return_value.connect.assert_called_once_with(
+            hostname='first', port=2222, username='test', password=None, pkey='key', allow_agent=True, look_for_keys=False, timeout=None, sock=None
+        )
+
+    @patch('paramiko.SSHClient')
+    def test_connect_agent_only(self, ssh_client):
+        pool = ConnectionPool()
+
+        pool.connect(Host(url='first', ssh_user='test', ssh_identity_file=None))
+
+        self.assertIsNone(ssh_client.return_value.connect.call_args[1]['pkey'])
+        self.assertTrue(ssh_client.return_value.connect.call_args[1]['allow_agent'])
+
+    @patch('paramiko.SSHClient')
+    def test_connect_identity_file_only(self, ssh_client):
+        pool = ConnectionPool()
+        pool.keys.private_key = Mock(return_value='key')
+
+        pool.connect(Host(url='first', ssh_user='test'))
+
+        self.assertFalse(ssh_client.return_value.connect.call_args[1]['allow_agent'])
+        self.assertFalse(ssh_client.return_value.connect.call_args[1]['look_for_keys'])
+
+    def test_jump(self):
+        pool = ConnectionPool()
+        bastion = Host(url='bastion', ssh_user='test')
+        bastion_client = get_client()
+        pool.connect = Mock(side_effect=lambda host, timeout: bastion_client)
+
+        tunnels = [pool.tunnel(Host(url=url, ssh_user='test', jump=bastion)) for url in ['first', 'second']]
+
+        pool.connect.assert_called_once_with(bastion, 10)
+        bastion_client.get_transport.return_value.open_channel.assert_called_with(
+            'direct-tcpip', ('second', 22), ('127.0.0.1', 0), timeout=None
+        )
+        self.assertEqual(len(tunnels), 2)
+
+    def test_no_jump(self):
+        self.assertIsNone(ConnectionPool().tunnel(self.host))
+
+    def test_retry_with_backoff(self):
+        pool = ConnectionPool(backoff=0.01)
+        client = get_client()
+        pool.connected.add(pool.key(self.host))
+        pool.connect = Mock(side_effect=[OSError('unreachable'), EOFError(), client])
+
+        with patch('time.sleep') as sleep:
+            self.assertIs(pool.get(self.host), client)
+
+        sleep.assert_has_calls([unittest.mock.call(0.01), unittest.mock.call(0.02)])
+
+    def test_retries_exhausted(self):
+        pool = ConnectionPool(retries=1, backoff=0)
+        pool.connected.add(pool.key(self.host))
+        pool.connect = Mock(side_effect=OSError('unreachable'))
+
+        with self.assertRaises(OSError):
+            pool.get(self.host)
+
+        self.assertEqual(pool.connect.call_count, 2)
+
+    def test_no_retry_on_first_connect(self):
+        pool = ConnectionPool(backoff=0)
+        pool.connect = Mock(side_effect=OSError('unreachable'))
+
+        with self.assertRaises(OSError):
+            pool.get(self.host)
+
+        pool.connect.assert_called_once_with(self.host, 10)
+
+    def test_retry_on_reconnect(self):
+        pool = ConnectionPool(backoff=0)
+        dead, client = get_client(), get_client()
+        dead.get_transport.return_value.is_active.return_value = False
+        pool.connect = Mock(side_effect=[dead, OSError('unreachable'), client])
+
+        pool.get(self.host)
+
+        self.assertIs(pool.get(self.host), client)
+        self.assertEqual(pool.connect.call_count, 3)
+
+    def test_no_retry_on_authentication(self):
+        pool = ConnectionPool(backoff=0)
+        pool.connect = Mock(side_effect=paramiko.AuthenticationException())
+
+        with self.assertRaises(paramiko.AuthenticationException):
+            pool.get(self.host)
+
+        pool.connect.assert_called_once_with(self.host, 10)
+
+    @patch('paramiko.SSHClient')
+    def test_keepalive(self, ssh_client):
+        ConnectionPool().connect(Host(url='first', ssh_user='test', ssh_identity_file=None, keepalive=10))
+
+        ssh_client.return_value.get_transport.return_value.set_keepalive.assert_called_once_with(10)
+
+    def test_exec_command_reconnects(self):
+        pool = ConnectionPool()
+        dead, alive = get_client(), get_client()
+        dead.exec_command.side_effect = paramiko.SSHException('SSH session not active')
+        alive.exec_command.return_value = 'streams'
+        pool.connect = Mock(side_effect=[dead, alive])
+
+        self.assertEqual(pool.exec_command(self.host, 'ls'), 'streams')
+        dead.close.assert_called_once_with()
+
+    def test_check_sudo_once(self):
+        pool = ConnectionPool()
+        client = get_client()
+        stdin, stdout, stderr = Mock(), Mock(), Mock()
+        stderr.channel.recv_stderr.side_effect = [b'crit-sudo-password:', b'']
+        client.exec_command.return_value = (stdin, stdout, stderr)
+        pool.connect = Mock(return_value=client)
+
+        self.assertTrue(pool.check_sudo(self.host, 'secret'))
+        self.assertTrue(pool.check_sudo(self.host, 'secret'))
+
+        client.exec_command.assert_called_once_with("sudo -S -p 'crit-sudo-password:' -v", get_pty=False)
+        stdin.write.assert_called_once_with('secret\n')
+        stdout.channel.close.assert_called_once_with()
+
+    def test_check_sudo_incorrect(self):
+        pool = ConnectionPool()
+        client = get_client()
+        stderr = Mock()
+        stderr.channel.recv_stderr.side_effect = [b'crit-sudo-password:', b'Sorry, try again.\ncrit-sudo-password:', b'']
+        client.exec_command.return_value = (Mock(), Mock(), stderr)
+        pool.connect = Mock(return_value=client)
+
+        self.assertFalse(pool.check_sudo(self.host, 'wrong'))
+        self.assertEqual(pool.sessions[pool.key(self.host)]._value, self.host.max_sessions)
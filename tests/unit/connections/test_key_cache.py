@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import paramiko
+from crit.connections import KeyCache
+
+
+def write_key(key: paramiko.PKey) -> str:
+    path = os.path.join(tempfile.mkdtemp(), 'id_key')
+    key.write_private_key_file(path)
+
+    return path
+
+
+class KeyCacheTest(unittest.TestCase):
+    def test_rsa(self):
+        path = write_key(paramiko.RSAKey.generate(1024))
+
+        self.assertIsInstance(KeyCache().private_key(path), paramiko.RSAKey)
+
+    def test_ecdsa(self):
+        path = write_key(paramiko.ECDSAKey.generate())
+
+        self.assertIsInstance(KeyCache().private_key(path), paramiko.ECDSAKey)
+
+    def test_loaded_once(self):
+        path = write_key(paramiko.ECDSAKey.generate())
+        keys = KeyCache()
+
+        with patch.object(keys, 'load_private_key', wraps=keys.load_private_key) as load_private_key:
+            self.assertIs(keys.private_key(path), keys.private_key(path))
+
+        load_private_key.assert_called_once_with(path, None)
+
+    def test_known_hosts_loaded_once(self):
+        path = os.path.join(tempfile.mkdtemp(), 'known_hosts')
+        key = paramiko.ECDSAKey.generate()
+
+        with open(path, 'w') as known_hosts:
+            known_hosts.write(f'example.com {key.get_name()} {key.get_base64()}\n')
+
+        keys = KeyCache(path)
+
+        self.assertIs(keys.host_keys(), keys.host_keys())
+        self.assertIn('example.com', keys.host_keys())
+
+    def test_no_known_hosts(self):
+        self.assertEqual(len(KeyCache('/non/existing/known_hosts').host_keys()), 0)
@@ -0,0 +1,49 @@
+import sys
+import unittest
+from unittest.mock import Mock
+from crit.config import Host
+from crit.connections import ConnectionPool
+from tests.unit.connections.test_remote_shell import LocalChannel
+
+
+class RemoteAgentTest(unittest.TestCase):
+    host = Host(url='first', ssh_user='test')
+
+    def test_call(self):
+        agent = self.pool.agent(self.host, python=sys.executable)
+
+        self.assertEqual(agent.call('stat', {'path': '/does/not/exist'}), {'exists': False})
+        self.assertTrue(agent.call('user', {'name': 'root'})['exists'])
+        self.assertEqual(len(self.channels), 1)
+
+    def test_error(self):
+        response = self.pool.agent(self.host, python=sys.executable).call('unknown')
+
+        self.assertEqual(response, {'error': "KeyError: 'unknown'"})
+
+    def test_timeout(self):
+        agent = self.pool.agent(self.host, python=sys.executable)
+
+        self.assertEqual(agent.call('run', {'command': 'sleep 10'}, timeout=0.2), {'timed_out': True})
+        self.assertTrue(self.channels[0].closed)
+
+    def test_python_missing(self):
+        response = self.pool.agent(self.host, python='crit-no-python').call('stat', {'path': '/'})
+
+        self.assertIn('error', response)
+
+    def open_session(self) -> LocalChannel:
+        channel = LocalChannel()
+        self.channels.append(channel)
+
+        return channel
+
+    def setUp(self):
+        self.channels = []
+        self.pool = ConnectionPool()
+        self.pool.get = Mock()
+        self.pool.get.return_value.get_transport.return_value.open_session.side_effect = self.open_session
+
+    def tearDown(self):
+        for channel in self.channels:
+            channel.close()
@@ -0,0 +1,218 @@
+import os
+import re
+import subprocess
+import unittest
+from threading import Thread, Lock
+from unittest.mock import Mock
+from crit.config import Host
+from crit.connections import ConnectionPool
+
+
+class LocalChannel:
+    """
+    Channel that runs its command in a local process, so the commands that are written to the shell really run
+    """
+
+    def __init__(self):
+        self.output, self.errors = b'', b''
+        self.lock = Lock()
+        self.read_fd, self.write_fd = os.pipe()
+
+        # The data can be taken before its wake up byte is written, so reading the pipe must not wait
+        os.set_blocking(self.read_fd, False)
+        self.closed = False
+        self.process = None
+
+    def exec_command(self, command: str):
+        self.command = command
+        self.process = subprocess.Popen(['/bin/sh', '-c', command], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        for stream, name in [(self.process.stdout, 'output'), (self.process.stderr, 'errors')]:
+            Thread(target=self.feed, args=(stream, name), daemon=True).start()
+
+        Thread(target=self.wake_on_exit, daemon=True).start()
+
+    def feed(self, stream, name: str):
+        for data in iter(lambda: stream.read1(1024), b''):
+            with self.lock:
+                setattr(self, name, getattr(self, name) + data)
+
+            os.write(self.write_fd, b'x')
+
+        os.write(self.write_fd, b'x')
+
+    def wake_on_exit(self):
+        # The exit status can be ready after the last data was taken, so the exit wakes up the reader as well
+        self.process.wait()
+        os.write(self.write_fd, b'x')
+
+    def sendall(self, data: bytes):
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+
+    def recv_ready(self) -> bool:
+        return bool(self.output)
+
+    def recv_stderr_ready(self) -> bool:
+        return bool(self.errors)
+
+    def recv(self, size: int) -> bytes:
+        return self.take('output')
+
+    def recv_stderr(self, size: int) -> bytes:
+        return self.take('errors')
+
+    def take(self, name: str) -> bytes:
+        with self.lock:
+            data = getattr(self, name)
+            setattr(self, name, b'')
+
+        try:
+            os.read(self.read_fd, 1024)
+        except BlockingIOError:
+            pass
+
+        return data
+
+    def exit_status_ready(self) -> bool:
+        return self.process.poll() is not None and not self.output and not self.errors
+
+    def fileno(self) -> int:
+        return self.read_fd
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.process.kill()
+            self.process.wait()
+
+
+class RemoteShellTest(unittest.TestCase):
+    host = Host(url='first', ssh_user='test')
+
+    def test_output(self):
+        response = self.pool.shell(self.host).run('echo output && echo error >&2')
+
+        self.assertEqual(response, {'output': b'output\nerror\n', 'timed_out': False})
+
+    def test_no_pty(self):
+        response = self.pool.shell(self.host).run('echo output; echo error >&2; exit 3', pty=False)
+
+        self.assertEqual(response, {'output': b'output\n', 'stderr': b'error\n', 'exit_status': 3, 'timed_out': False})
+
+    def test_one_shell_for_all_commands(self):
+        shell = self.pool.shell(self.host)
+
+        first = shell.run('echo $PPID', pty=False)['output']
+        shell.run('cd / && VALUE=first')
+        second = shell.run('pwd; echo "$VALUE"; echo $PPID', pty=False)['output']
+
+        self.assertEqual(len(self.channels), 1)
+        self.assertNotEqual(second.split(b'\n')[0], b'/')
+        self.assertEqual(second.split(b'\n')[1], b'')
+        self.assertEqual(first, second.split(b'\n')[2] + b'\n')
+
+    def test_keep_state(self):
+        shell = self.pool.shell(self.host, keep_state=True)
+
+        shell.run('cd / && export VALUE=first')
+        output = shell.run('pwd; echo "$VALUE"', pty=False)['output']
+
+        self.assertEqual(output, b'/\nfirst\n')
+
+    def test_holds_session(self):
+        shell = self.pool.shell(self.host)
+        shell.run('true')
+
+        self.assertEqual(self.pool.session(self.host)._value, self.host.max_sessions - 1)
+
+        shell.close()
+
+        self.assertEqual(self.pool.session(self.host)._value, self.host.max_sessions)
+
+    def test_output_without_newline(self):
+        self.assertEqual(self.pool.shell(self.host).run('printf output')['output'], b'output')
+
+    def test_password_on_stdin(self):
+        response = self.pool.shell(self.host).run('read password && echo $password', password='secret')
+
+        self.assertEqual(response['output'], b'secret\n')
+
+    def test_password_incorrect(self):
+        response = self.pool.shell(self.host).run('echo "Sorry, try again."', password='wrong')
+
+        self.assertTrue(response['password_incorrect'])
+
+    def test_timeout_restarts_shell(self):
+        shell = self.pool.shell(self.host)
+
+        self.assertTrue(shell.run('sleep 10', timeout=0.2)['timed_out'])
+        self.assertEqual(shell.run('echo output')['output'], b'output\n')
+        self.assertEqual(len(self.channels), 2)
+
+    def test_stopped_shell(self):
+        response = self.pool.shell(self.host).run('echo output; kill -9 $$', pty=False)
+
+        self.assertEqual(response['exit_status'], -1)
+
+    def test_sudo_password(self):
+        shell = self.pool.shell(self.host, sudo=True)
+
+        self.assertEqual(shell.run('echo output', shell_password='secret')['output'], b'output\n')
+        self.assertEqual(shell.run('echo output')['output'], b'output\n')
+        self.assertEqual(len(self.channels), 1)
+
+    def test_sudo_password_incorrect(self):
+        response = self.pool.shell(self.host, sudo=True).run('echo output', shell_password='wrong')
+
+        self.assertEqual(response, {'password_incorrect': True})
+        self.assertTrue(self.channels[0].closed)
+
+    def test_sudo_password_missing(self):
+        self.assertEqual(self.pool.shell(self.host, sudo=True).run('echo output'), {'password_incorrect': True})
+
+    def test_closed_with_client(self):
+        shell = self.pool.shell(self.host)
+        shell.run('true')
+        self.pool.clients[self.pool.key(self.host)] = Mock()
+
+        self.pool.close(self.host)
+
+        self.assertTrue(self.channels[0].closed)
+        self.assertIsNot(self.pool.shell(self.host), shell)
+
+    def open_session(self) -> LocalChannel:
+        channel = LocalChannel()
+
+        exec_command = channel.exec_command
+        channel.exec_command = lambda command: exec_command(self.fake_sudo(command))
+
+        self.channels.append(channel)
+
+        return channel
+
+    def fake_sudo(self, command: str) -> str:
+        """
+        Sudo is not available in the tests, so it is replaced by a script that asks for the password secret
+        """
+
+        if not command.startswith('sudo'):
+            return command
+
+        prompt, shell = re.match(r"sudo -S -p '(.*?)' (.*)", command).groups()
+
+        return (
+            f"printf '%s' '{prompt}' >&2; while read password; do "
+            f"[ \"$password\" = secret ] && exec {shell}; "
+            f"echo 'Sorry, try again.' >&2; printf '%s' '{prompt}' >&2; done"
+        )
+
+    def setUp(self):
+        self.channels = []
+        self.pool = ConnectionPool()
+        self.pool.get = Mock()
+        self.pool.get.return_value.get_transport.return_value.open_session.side_effect = self.open_session
+
+    def tearDown(self):
+        for channel in self.channels:
+            channel.close()
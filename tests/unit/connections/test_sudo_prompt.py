@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import Mock
+from crit.config import Host
+from crit.connections import SudoPrompt
+
+
+class SudoPromptTest(unittest.TestCase):
+    def test_no_prompt(self):
+        prompt, stdin = self.get_prompt()
+
+        self.assertEqual(prompt.read(Mock(side_effect=[b'output', b'crit', b''])), b'outputcrit')
+        stdin.write.assert_not_called()
+
+    def test_answers_prompt(self):
+        prompt, stdin = self.get_prompt()
+
+        self.assertEqual(prompt.read(Mock(side_effect=[b'crit-sudo-password:\r\noutput', b''])), b'\r\noutput')
+        stdin.write.assert_called_once_with('secret\n')
+        self.assertFalse(prompt.incorrect)
+
+    def test_prompt_split(self):
+        prompt, stdin = self.get_prompt()
+
+        self.assertEqual(prompt.read(Mock(side_effect=[b'lecture\ncrit-su', b'do-pass', b'word:', b'output', b''])), b'lecture\noutput')
+        stdin.write.assert_called_once_with('secret\n')
+
+    def test_incorrect(self):
+        prompt, stdin = self.get_prompt()
+
+        prompt.read(Mock(side_effect=[b'crit-sudo-password:\r\nSorry, try again.\r\ncrit-sudo-password:']))
+
+        self.assertTrue(prompt.incorrect)
+        stdin.write.assert_called_with(chr(3))
+
+    def test_without_pty(self):
+        prompt, stdin = self.get_prompt(pty=False)
+
+        self.assertEqual(prompt.read(Mock(side_effect=[b'crit-sudo-password:', b'warning', b''])), b'warning')
+        stdin.channel.shutdown_write.assert_called_once_with()
+
+    def test_command(self):
+        self.assertEqual(SudoPrompt.command(), "sudo -p 'crit-sudo-password:'")
+        self.assertEqual(SudoPrompt.command(False), "sudo -S -p 'crit-sudo-password:'")
+
+    def get_prompt(self, pty: bool = True) -> tuple:
+        stdin = Mock()
+
+        return SudoPrompt(stdin, 'secret', pty), stdin
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+from crit.config import Localhost, config, Host
+from crit.executors import CoalescedExecutor, Result
+from crit.executors.result import Status
+from crit.executors.utils import CommandExecutor
+
+
+class CoalescedExecutorTest(unittest.TestCase):
+    def test_splits_results(self):
+        first = CommandExecutor(command='echo first', register='first')
+        second = CommandExecutor(command='printf second >&2', register='second', pty=False)
+        executor = self.get_executor(first, second)
+
+        result = executor.execute()
+
+        self.assertEqual(result, Result(Status.SUCCESS))
+        self.assertEqual(first.result, Result(Status.SUCCESS, stdin='echo first', stdout=['first', '']))
+        self.assertEqual(second.result, Result(Status.SUCCESS, stdin='printf second >&2', stdout=[''], stderr=['second'], exit_status=0))
+        self.assertIs(config.get_registered(executor.host, 'second'), second.result)
+
+    def test_one_round_trip(self):
+        executor = self.get_executor(CommandExecutor(command='echo first', pty=False), CommandExecutor(command='echo second'))
+        executor.host = Host(url='remote', ssh_user='test', transport=Mock(sudo_command='sudo'))
+        executor.host.transport.exec_command.side_effect = lambda host, script, *args: {
+            'output': self.run_locally(script), 'stderr': b'', 'exit_status': 0
+        }
+
+        executor.execute()
+
+        executor.host.transport.exec_command.assert_called_once()
+        self.assertEqual(executor.executors[1].result.stdout, ['second', ''])
+
+    def test_stops_at_failure(self):
+        third = CommandExecutor(command='echo third')
+        executor = self.get_executor(CommandExecutor(command='echo first'), CommandExecutor(command='exit 3', pty=False), third)
+
+        result = executor.execute()
+
+        self.assertEqual(result.status, Status.FAIL)
+        self.assertEqual(executor.executors[1].result.exit_status, 3)
+        self.assertIsNone(third.result)
+
+    def test_error_lines(self):
+        executor = self.get_executor(CommandExecutor(command='echo error'), CommandExecutor(command='echo second'))
+
+        executor.execute()
+
+        self.assertEqual(executor.executors[0].result.status, Status.FAIL)
+
+    def test_stops_at_error_lines(self):
+        second = CommandExecutor(command='touch second', chdir=self.directory)
+        executor = self.get_executor(CommandExecutor(command='echo error'), second)
+
+        result = executor.execute()
+
+        self.assertEqual(result.status, Status.FAIL)
+        self.assertIsNone(second.result)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'second')))
+
+    def test_terminal_executor_ends_script(self):
+        executor = self.get_executor(CommandExecutor(command='echo first'), CommandExecutor(command='echo second'))
+        executor.run_command = Mock(wraps=executor.run_command)
+
+        result = executor.execute()
+
+        self.assertEqual(result.status, Status.SUCCESS)
+        self.assertEqual(executor.run_command.call_count, 2)
+
+    def test_continues_after_exit_status_of_terminal_executor(self):
+        second = CommandExecutor(command='echo second')
+        executor = self.get_executor(CommandExecutor(command='false'), second)
+
+        result = executor.execute()
+
+        self.assertEqual(result.status, Status.SUCCESS)
+        self.assertEqual(second.result.stdout, ['second', ''])
+
+    def test_chdir_and_env_do_not_leak(self):
+        second = CommandExecutor(command='pwd && echo "$VALUE"')
+        executor = self.get_executor(CommandExecutor(command='true', chdir='/', env={'VALUE': 'first'}), second, chdir=None)
+
+        executor.execute()
+
+        self.assertNotIn('first', second.result.stdout)
+
+    def test_password_runs_one_by_one(self):
+        executor = self.get_executor(CommandExecutor(command='ls', sudo=True))
+        executor.host = Host(url='remote', ssh_user='test')
+        executor.executors[0].run = Mock()
+        executor.run_script = Mock()
+
+        executor.execute()
+
+        executor.executors[0].run.assert_called_once_with()
+        executor.run_script.assert_not_called()
+
+    def test_timed_out(self):
+        first = CommandExecutor(command='sleep 10')
+        executor = self.get_executor(first, CommandExecutor(command='echo second'))
+        config.timeout = 0.1
+
+        try:
+            executor.execute()
+        finally:
+            config.timeout = None
+
+        self.assertEqual(first.result.status, Status.FAIL)
+        self.assertIn('Timed out', first.result.message)
+
+    def test_async(self):
+        executor = self.get_executor(CommandExecutor(command='echo first'), CommandExecutor(command='echo second'))
+
+        result = asyncio.new_event_loop().run_until_complete(executor.execute_async())
+
+        self.assertEqual(result.status, Status.SUCCESS)
+
+    def get_executor(self, *executors, **kwargs) -> CoalescedExecutor:
+        executor = CoalescedExecutor(executors=list(executors), **kwargs)
+        executor.host = Localhost()
+
+        return executor
+
+    def run_locally(self, script: str) -> bytes:
+        return Localhost().transport.exec_command(Localhost(), script, pty=False)['output']
+
+    def setUp(self):
+        config.registry = {}
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
@@ -1,6 +1,8 @@
 import unittest
-from unittest.mock import patch
+from threading import Event
+from unittest.mock import patch, Mock
 from crit.config import Localhost
+from crit.exceptions import SingleExecutorFailedException
 from crit.executors import MultiExecutor, Result
 from crit.executors.result import Status
 
@@ -17,7 +19,8 @@ class GetBaseAttributesTests(unittest.TestCase):
         'sudo': True,
         'register': 'test',
         'env': {'TEST': 'test'},
-        'chdir': '/test'
+        'chdir': '/test',
+        'timeout': 10
     }
 
     def test_all_attributes(self):
@@ -57,3 +60,43 @@ class ResultFromExecutorTests(unittest.TestCase):
         ]
 
         self.assertEqual(executor.result_from_executor('test'), Result(Status.CHANGED, message='test'))
+
+
+class ExecuteExecutorsTests(unittest.TestCase):
+    def test_at_the_same_time(self):
+        started = Event()
+
+        waiting = Mock()
+        waiting.execute = Mock(side_effect=lambda **kwargs: Result(Status.SUCCESS if started.wait(1) else Status.FAIL))
+
+        starting = Mock()
+        starting.execute = Mock(side_effect=lambda **kwargs: started.set() or Result(Status.CHANGED))
+
+        executor = get_executor()
+
+        self.assertEqual(executor.execute_executors([waiting, starting]), [Result(Status.SUCCESS), Result(Status.CHANGED)])
+        self.assertEqual(len(executor.results), 2)
+        waiting.execute.assert_called_with(exception_on_error=True)
+
+    def test_failed(self):
+        result = Result(Status.FAIL, message='failed')
+
+        failing = Mock()
+        failing.execute = Mock(side_effect=SingleExecutorFailedException(failing, result))
+
+        succeeding = Mock()
+        succeeding.execute = Mock(return_value=Result(Status.SUCCESS))
+
+        executor = get_executor()
+
+        with self.assertRaises(SingleExecutorFailedException) as context:
+            executor.execute_executors([succeeding, failing])
+
+        self.assertEqual(context.exception.result, result)
+        self.assertTrue(succeeding.execute.called)
+
+    def test_results_per_executor(self):
+        first = get_executor()
+        first.results.append(Result(Status.CHANGED))
+
+        self.assertEqual(get_executor().results, [])
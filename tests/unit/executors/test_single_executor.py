@@ -1,18 +1,51 @@
+import asyncio
+import os
 import unittest
 from io import BytesIO
+from threading import Event
 from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from unittest.mock import patch, Mock
 from crit.config import Localhost, config, Host
-from crit.exceptions import SingleExecutorFailedException
+from crit.transports import LocalTransport, SshTransport
+from crit.exceptions import SingleExecutorFailedException, ItemsNotSupportedException
 from crit.executors import SingleExecutor, Result
 from crit.executors.result import Status
 
 
+# Host that is reached over ssh. Localhost runs its commands in a local subprocess
+remote = Host(url='remote', ssh_user='test', passwordless_user=True)
+
+
 @patch.multiple(SingleExecutor, __abstractmethods__=set())
 def get_executor(*args, **kwargs):
     return SingleExecutor(*args, **kwargs)
 
 
+def mock_client(test: unittest.TestCase, client_mock: Mock = None) -> Mock:
+    """
+    Replaces the function of the ssh transport that gets the client of the host till the end of the test
+    """
+
+    patcher = patch.object(SshTransport, 'get_client', client_mock or Mock())
+    test.addCleanup(patcher.stop)
+
+    return patcher.start()
+
+
+@dataclass(frozen=True)
+class ClientTransport(SshTransport):
+    """
+    Ssh transport that runs the commands of one executor on a fake client
+    """
+
+    client: Mock = None
+
+    def get_client(self, host: Host) -> Mock:
+        return self.client
+
+
 class ExecuteOnHostTest(unittest.TestCase):
     """
     Tests if the output paramiko returns is parsed correctly
@@ -63,10 +96,6 @@ class RunCommandTest(unittest.TestCase):
         # mock ssh client
         executor = self.mock_executor(client_mock, (BytesIO(b'output'), BytesIO(b'output'), BytesIO(b'')), sudo=True)
 
-        fill_password = Mock()
-        fill_password.return_value = None
-        executor.fill_password = fill_password
-
         result = executor.run_command()
 
         self.assertEqual('sudo value', result.stdin)
@@ -106,88 +135,570 @@ class RunCommandTest(unittest.TestCase):
         result = executor.run_command()
         self.assertEqual(result.status, Status.FAIL)
 
+    @mock.patch('paramiko.SSHClient')
+    def test_execute_password(self, client_mock):
+        stdin, stdout = Mock(), Mock()
+        executor = self.mock_executor(client_mock, (stdin, stdout, BytesIO()), sudo=True)
+        stdout.channel.recv.side_effect = [b'crit-sudo-password:\r\noutput', b'']
+        executor.host = Host(url='first', ssh_user='test')
+        config.linux_password = 'secret'
+
+        with patch.object(config.channels, 'check_sudo', return_value=True):
+            result = executor.run_command()
+
+        self.assertEqual(result.stdin, "sudo -p 'crit-sudo-password:' value")
+        self.assertEqual(result.stdout, ['\r', 'output'])
+        stdin.write.assert_called_once_with('secret\n')
+
     @mock.patch('paramiko.SSHClient')
     def test_execute_wrong_password(self, client_mock):
-        executor = self.mock_executor(client_mock, (BytesIO(b'output'),) * 3)
+        stdin, stdout = Mock(), Mock()
+        executor = self.mock_executor(client_mock, (stdin, stdout, BytesIO()), sudo=True)
+        stdout.channel.recv.side_effect = [b'crit-sudo-password:\r\nSorry, try again.\r\ncrit-sudo-password:']
+        executor.host = Host(url='first', ssh_user='test')
+        config.linux_password = 'wrong'
 
-        fill_password = Mock()
-        fill_password.return_value = Result(Status.FAIL, message='Incorrect linux password!')
-        executor.fill_password = fill_password
+        with patch.object(config.channels, 'check_sudo', return_value=True):
+            result = executor.run_command()
 
-        result = executor.run_command()
         self.assertEqual(result, Result(Status.FAIL, message='Incorrect linux password!'))
+        stdin.write.assert_called_with(chr(3))
+
+    @mock.patch('paramiko.SSHClient')
+    def test_password_checked_once(self, client_mock):
+        executor = self.mock_executor(client_mock, (BytesIO(b'output'),) * 3, sudo=True)
+        executor.host = Host(url='first', ssh_user='test')
+        config.linux_password = 'wrong'
+
+        with patch.object(config.channels, 'check_sudo', return_value=False) as check_sudo:
+            result = executor.run_command()
+
+        self.assertEqual(result, Result(Status.FAIL, message='Incorrect linux password!'))
+        check_sudo.assert_called_once_with(executor.host, 'wrong')
+        client_mock.return_value.exec_command.assert_not_called()
+
+    @mock.patch('paramiko.SSHClient')
+    def test_closes_channel(self, client_mock):
+        stdout = BytesIO(b'output')
+        executor = self.mock_executor(client_mock, (BytesIO(), stdout, BytesIO()))
+
+        executor.run_command()
+
+        stdout.channel.close.assert_called_once_with()
+        self.assertEqual(config.channels.session(executor.host)._value, executor.host.max_sessions)
+
+    def test_reconnects_dead_client(self):
+        stdout = BytesIO(b'output')
+        stdout.channel = Mock()
+        dead, alive = Mock(), Mock()
+        dead.exec_command.side_effect = EOFError()
+        alive.exec_command.return_value = (BytesIO(), stdout, BytesIO())
+
+        executor = get_executor(host=remote)
+        executor.commands = Mock(return_value='value')
+        mock_client(self, Mock(side_effect=[dead, alive]))
+
+        with patch.object(config.channels, 'close') as close:
+            result = executor.run_command()
+
+        close.assert_called_once_with(executor.host)
+        self.assertEqual(result.stdout, ['output'])
 
     def mock_executor(self, client_mock, exec_return, **kwargs):
         # Set executor
         executor = get_executor(**kwargs)
-        executor.host = Localhost()
+        executor.host = remote
 
         # Mock commands() on executor
         commands_mock = Mock()
         commands_mock.return_value = 'value'
         executor.commands = commands_mock
 
-        # Mock get_client on executor
+        # Mock the client of the ssh transport
+        for stream in exec_return:
+            stream.channel = Mock()
+
         client_mock.return_value.exec_command.return_value = exec_return
-        executor.get_client = client_mock
+        mock_client(self, client_mock)
 
         return executor
 
     def setUp(self):
-        config.hosts = [Localhost()]
+        config.hosts = [remote]
         config.registry = {}
 
+    def tearDown(self):
+        config.linux_password = None
 
-class FillPasswordTest(unittest.TestCase):
-    @mock.patch('paramiko.ChannelFile')
-    def test_no_sudo(self, channel):
-        self.assertEqual(get_executor().fill_password('', channel), None)
 
-    @mock.patch('paramiko.ChannelFile')
-    def test_sudoless_user(self, channel):
-        executor = get_executor()
+class FakeChannel:
+    """
+    Channel of which the output is available right away
+    """
 
-        host = Host('test.url', 'jessie', passwordless_user=True)
-        executor.host = host
+    closed = False
+
+    def __init__(self, output: bytes, errors: bytes = b'', exit_status: int = 0):
+        self.in_buffer = output
+        self.errors = errors
+        self.exit_status = exit_status
+        self.read_fd, self.write_fd = os.pipe()
+        os.write(self.write_fd, b'x')
+
+    def fileno(self):
+        return self.read_fd
+
+    def recv_ready(self):
+        return len(self.in_buffer) > 0
+
+    def recv_stderr_ready(self):
+        return len(self.errors) > 0
+
+    def recv_stderr(self, size: int) -> bytes:
+        errors, self.errors = self.errors[:size], self.errors[size:]
+
+        return errors
+
+    def exit_status_ready(self):
+        return True
+
+    def recv_exit_status(self):
+        return self.exit_status
+
+    def shutdown_write(self):
+        pass
+
+    @property
+    def eof_received(self):
+        return not self.recv_ready() and not self.recv_stderr_ready()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            os.close(self.read_fd)
+            os.close(self.write_fd)
+
+
+class FakeStdout:
+    def __init__(self, output: bytes, errors: bytes = b'', exit_status: int = 0):
+        self.channel = FakeChannel(output, errors, exit_status)
 
-        self.assertEqual(executor.fill_password(channel, channel), None)
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            size = len(self.channel.in_buffer)
 
-    @mock.patch('paramiko.ChannelFile')
-    def test_no_linux_password(self, channel):
+        output = self.channel.in_buffer[:size]
+        self.channel.in_buffer = self.channel.in_buffer[size:]
+
+        return output
+
+
+class HangingChannel:
+    """
+    Channel of a command that never finishes until the channel is closed
+    """
+
+    def __init__(self):
+        self.closed = Event()
+        self.read_fd, self.write_fd = os.pipe()
+
+    def fileno(self):
+        return self.read_fd
+
+    def recv_ready(self):
+        return False
+
+    @property
+    def eof_received(self):
+        return self.closed.is_set()
+
+    def close(self):
+        self.closed.set()
+
+
+class HangingStdout:
+    def __init__(self):
+        self.channel = HangingChannel()
+
+    def read(self, size: int = -1) -> bytes:
+        self.channel.closed.wait()
+
+        return b''
+
+
+class LocalhostTest(unittest.TestCase):
+    def test_runs_locally(self):
+        executor = get_executor(host=Localhost())
+        executor.commands = Mock(return_value='echo output')
+        get_client = mock_client(self)
+
+        result = executor.run_command()
+
+        self.assertEqual(result, Result(Status.SUCCESS, stdin='echo output', stdout=['output', '']))
+        get_client.assert_not_called()
+
+    def test_runs_locally_async(self):
+        executor = get_executor(host=Localhost())
+        executor.commands = Mock(return_value='echo output')
+
+        result = asyncio.new_event_loop().run_until_complete(executor.run_command_async())
+
+        self.assertEqual(result.stdout, ['output', ''])
+
+    def test_transport_of_host(self):
+        transport = Mock(sudo_command='sudo')
+        transport.exec_command.return_value = {'output': b'output', 'timed_out': False}
+        executor = get_executor(host=Host(url='web', ssh_user='root', transport=transport))
+        executor.commands = Mock(return_value='ls')
+
+        config.broker = '/tmp/crit.sock'
+
+        try:
+            result = executor.run_command()
+        finally:
+            config.broker = None
+
+        self.assertEqual(result.stdout, ['output'])
+        transport.exec_command.assert_called_once_with(executor.host, 'ls', None, None, True)
+
+    def test_sudo_reads_stdin(self):
         executor = get_executor(sudo=True)
-        config.linux_password = ''
+        executor.commands = Mock(return_value='ls')
+
+        self.assertEqual(executor.build_command(LocalTransport.sudo_command), "sudo -S -p '' ls")
+
+
+@patch('crit.executors.single_executor.BrokerClient')
+class BrokerTest(unittest.TestCase):
+    def test_output(self, broker_client):
+        broker_client.return_value.exec_command.return_value = {'output': b'output', 'timed_out': False}
+        executor = self.mock_executor()
+
+        result = executor.run_command()
+
+        self.assertEqual(result, Result(Status.SUCCESS, stdin='value', stdout=['output']))
+        broker_client.assert_called_with('/tmp/crit.sock')
+        broker_client.return_value.exec_command.assert_called_with(executor.host, 'value', None, None, True)
+
+    def test_password(self, broker_client):
+        broker_client.return_value.exec_command.return_value = {'password_incorrect': True}
+        broker_client.return_value.sudo_prompt = True
+        config.linux_password = 'wrong'
+        executor = self.mock_executor(sudo=True, host=Host(url='first', ssh_user='test'))
+
+        result = executor.run_command()
+
+        self.assertEqual(result, Result(Status.FAIL, message='Incorrect linux password!'))
+        broker_client.return_value.exec_command.assert_called_with(executor.host, "sudo -p 'crit-sudo-password:' value", 'wrong', None, True)
+
+    def test_no_pty(self, broker_client):
+        broker_client.return_value.exec_command.return_value = {'output': b'output', 'stderr': b'', 'exit_status': 1, 'timed_out': False}
+        executor = self.mock_executor(pty=False)
+
+        result = executor.run_command()
+
+        self.assertEqual(result.exit_status, 1)
+        broker_client.return_value.exec_command.assert_called_with(executor.host, 'value', None, None, False)
+
+    def test_timed_out(self, broker_client):
+        broker_client.return_value.exec_command.return_value = {'output': b'', 'timed_out': True}
+        config.timeout = 1
+
+        result = self.mock_executor().run_command()
+
+        self.assertEqual(result.message, 'Timed out after 1 seconds')
+
+    def mock_executor(self, **kwargs):
+        executor = get_executor(**kwargs)
+        executor.host = executor.host or remote
+        executor.commands = Mock(return_value='value')
+
+        return executor
+
+    def setUp(self):
+        config.broker = '/tmp/crit.sock'
+
+    def tearDown(self):
+        config.broker = None
+        config.linux_password = None
+        config.timeout = None
+
+
+class NoPtyTest(unittest.TestCase):
+    def test_success(self):
+        executor, stdin = self.mock_executor(b'output', b'warning', 0)
+
+        result = executor.run_command()
+
+        self.assertEqual(result, Result(Status.SUCCESS, stdin='value', stdout=['output'], stderr=['warning'], exit_status=0))
+        SshTransport.get_client.return_value.exec_command.assert_called_with('value', get_pty=False)
+
+    def test_error_lines_do_not_fail(self):
+        executor, stdin = self.mock_executor(b'error', b'', 0)
+
+        self.assertEqual(executor.run_command().status, Status.SUCCESS)
+
+    def test_exit_status_fails(self):
+        executor, stdin = self.mock_executor(b'', b'missing', 2)
+
+        result = executor.run_command()
+
+        self.assertEqual(result.status, Status.FAIL)
+        self.assertEqual(result.exit_status, 2)
+        self.assertEqual(result.stderr, ['missing'])
+
+    def test_password_on_prompt(self):
+        config.linux_password = 'secret'
+        executor, stdin = self.mock_executor(b'', [b'crit-sudo-password:', b'warning', b''], 0, sudo=True, host=Host(url='first', ssh_user='test'))
+
+        with patch.object(config.channels, 'check_sudo', return_value=True):
+            result = executor.run_command()
+
+        self.assertEqual(result.stdin, "sudo -S -p 'crit-sudo-password:' value")
+        self.assertEqual(result.stderr, ['warning'])
+        stdin.write.assert_called_once_with('secret\n')
+        stdin.channel.shutdown_write.assert_called_once_with()
+
+    def test_no_prompt(self):
+        config.linux_password = 'secret'
+        executor, stdin = self.mock_executor(b'output', [b''], 0, sudo=True, host=Host(url='first', ssh_user='test'))
+
+        with patch.object(config.channels, 'check_sudo', return_value=True):
+            self.assertEqual(executor.run_command().status, Status.SUCCESS)
+
+        stdin.write.assert_not_called()
+
+    def test_wrong_password(self):
+        config.linux_password = 'wrong'
+        errors = [b'crit-sudo-password:', b'Sorry, try again.\ncrit-sudo-password:\nsudo: 1 incorrect password attempt\n', b'']
+        executor, stdin = self.mock_executor(b'', errors, 1, sudo=True, host=Host(url='first', ssh_user='test'))
+
+        with patch.object(config.channels, 'check_sudo', return_value=True):
+            self.assertEqual(executor.run_command(), Result(Status.FAIL, message='Incorrect linux password!'))
+
+    def test_locally(self):
+        executor = get_executor(host=Localhost(), pty=False)
+        executor.commands = Mock(return_value='echo output && echo error >&2 && exit 3')
+
+        result = executor.run_command()
+
+        self.assertEqual(result, Result(Status.FAIL, stdin=executor.commands(), stdout=['output', ''], stderr=['error', ''], exit_status=3))
+
+    def mock_executor(self, output: bytes, errors: bytes, exit_status: int, **kwargs):
+        executor = get_executor(pty=False, **kwargs)
+        executor.host = executor.host or remote
+        executor.commands = Mock(return_value='value')
+
+        stdin, stdout = Mock(), BytesIO(output)
+        stdout.channel = Mock()
+        stdout.channel.recv_exit_status.return_value = exit_status
+
+        # The errors of a command with sudo are received in chunks, so the prompt can be answered
+        stderr = BytesIO(errors) if isinstance(errors, bytes) else Mock()
+        stderr.channel = Mock()
+        stderr.channel.recv_stderr.side_effect = errors
+
+        mock_client(self).return_value.exec_command.return_value = (stdin, stdout, stderr)
+
+        return executor, stdin
+
+    def tearDown(self):
+        config.linux_password = None
+
+
+class TimeoutTest(unittest.TestCase):
+    def test_timeout(self):
+        stdout = HangingStdout()
+        executor = self.mock_executor(stdout, timeout=0.05)
+
+        self.assertEqual(executor.run_command(), Result(Status.FAIL, stdin='value', message='Timed out after 0.05 seconds'))
+        self.assertTrue(stdout.channel.closed.is_set())
+
+    def test_global_timeout(self):
+        config.timeout = 0.05
+        executor = self.mock_executor(HangingStdout())
+
+        self.assertEqual(executor.run_command().status, Status.FAIL)
+
+    def test_async_timeout(self):
+        stdout = HangingStdout()
+        executor = self.mock_executor(stdout, timeout=0.05)
+
+        result = asyncio.new_event_loop().run_until_complete(executor.run_command_async())
+
+        self.assertEqual(result, Result(Status.FAIL, stdin='value', message='Timed out after 0.05 seconds'))
+        self.assertTrue(stdout.channel.closed.is_set())
+
+    def mock_executor(self, stdout, **kwargs):
+        executor = get_executor(**kwargs)
+        executor.host = remote
+        executor.commands = Mock(return_value='value')
+
+        client = Mock()
+        client.exec_command.return_value = (BytesIO(), stdout, BytesIO())
+        executor.get_transport = Mock(return_value=ClientTransport(client))
+
+        return executor
+
+    def tearDown(self):
+        config.timeout = None
+
+
+class RunCommandAsyncTest(unittest.TestCase):
+    def test_success(self):
+        result = self.run_command(b'output\nmore output')
+
+        self.assertEqual(result, Result(Status.SUCCESS, stdin='value', stdout=['output', 'more output']))
 
-        host = Host('test.url', 'jessie')
+    def test_error(self):
+        result = self.run_command(b'output\nerror')
+
+        self.assertEqual(result.status, Status.FAIL)
+
+    def test_execute_throws_exception(self):
+        stdout = FakeStdout(b'error')
+        executor = self.mock_executor(stdout)
+
+        with self.assertRaises(SingleExecutorFailedException):
+            asyncio.new_event_loop().run_until_complete(executor.execute_async(exception_on_error=True))
+
+        stdout.channel.close()
+
+    def test_sessions_do_not_block_default_executor(self):
+        host = Host(url='sessions', ssh_user='test', passwordless_user=True, max_sessions=2)
+        stdouts = [FakeStdout(b'output') for i in range(12)]
+        executors = [self.mock_executor(stdout, host) for stdout in stdouts]
+
+        # Without a terminal the session is acquired and the output is read on the event loop as well
+        for executor in executors[::2]:
+            executor.pty = False
+
+        async def run_all():
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=4))
+
+            return await asyncio.wait_for(asyncio.gather(*[executor.run_command_async() for executor in executors]), 5)
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            results = loop.run_until_complete(run_all())
+        finally:
+            loop.close()
+
+            for stdout in stdouts:
+                stdout.channel.close()
+
+        self.assertEqual([result.status for result in results], [Status.SUCCESS] * 12)
+        self.assertEqual(config.channels.session(host)._value, 2)
+
+    def test_no_pty(self):
+        stdout = FakeStdout(b'output', b'error', 3)
+        executor = self.mock_executor(stdout)
+        executor.pty = False
+
+        result = asyncio.new_event_loop().run_until_complete(executor.run_command_async())
+        stdout.channel.close()
+
+        self.assertEqual(result, Result(Status.FAIL, stdin='value', stdout=['output'], stderr=['error'], exit_status=3))
+
+    def test_no_pty_does_not_use_default_executor_for_reading(self):
+        stdout = FakeStdout(b'output')
+        executor = self.mock_executor(stdout)
+        executor.pty = False
+
+        with patch.object(SshTransport, 'exec_command') as exec_command:
+            result = asyncio.new_event_loop().run_until_complete(executor.run_command_async())
+
+        stdout.channel.close()
+
+        self.assertEqual(result.status, Status.SUCCESS)
+        exec_command.assert_not_called()
+
+    def run_command(self, output: bytes) -> Result:
+        stdout = FakeStdout(output)
+        executor = self.mock_executor(stdout)
+
+        result = asyncio.new_event_loop().run_until_complete(executor.run_command_async())
+        stdout.channel.close()
+
+        return result
+
+    def mock_executor(self, stdout: FakeStdout, host: Host = remote):
+        executor = get_executor()
         executor.host = host
+        executor.commands = Mock(return_value='value')
 
-        self.assertEqual(executor.fill_password(channel, channel), Result(Status.FAIL, message='Pass linux password with -p or pass passwordless_user on hosts!'))
+        client = Mock()
+        client.exec_command.return_value = (BytesIO(), stdout, BytesIO())
+        executor.get_transport = Mock(return_value=ClientTransport(client))
 
-    @mock.patch('paramiko.ChannelFile')
-    def test_right_password(self, channel):
-        executor = get_executor(sudo=True)
+        return executor
+
+
+class CheckPasswordTest(unittest.TestCase):
+    def test_no_sudo(self):
+        self.assertEqual(get_executor(host=Host('test.url', 'jessie')).check_password(), None)
+
+    def test_sudoless_user(self):
+        executor = get_executor(sudo=True, host=Host('test.url', 'jessie', passwordless_user=True))
         config.linux_password = 'test'
 
-        readline = Mock()
-        readline.return_value = ''
-        channel.readline = readline
-        channel.write = Mock()
+        self.assertEqual(executor.check_password(), None)
+        self.assertEqual(executor.get_password(), None)
 
-        host = Host('test.url', 'jessie')
-        executor.host = host
+    def test_no_linux_password(self):
+        executor = get_executor(sudo=True, host=Host('test.url', 'jessie'))
+        config.linux_password = ''
 
-        self.assertEqual(executor.fill_password(channel, channel), None)
+        self.assertEqual(executor.check_password(), Result(Status.FAIL, message='Pass linux password with -p or pass passwordless_user on hosts!'))
 
-    @mock.patch('paramiko.ChannelFile')
-    def test_wrong_password(self, channel):
-        executor = get_executor(sudo=True)
+    def test_password_for_transport(self):
+        executor = get_executor(sudo=True, host=Host('test.url', 'jessie'))
         config.linux_password = 'test'
 
-        readline = Mock()
-        readline.return_value = 'Sorry, try again.'
-        channel.readline = readline
-        channel.write = Mock()
+        self.assertEqual(executor.check_password(), None)
+        self.assertEqual(executor.get_password(), 'test')
 
-        host = Host('test.url', 'jessie')
-        executor.host = host
+    def tearDown(self):
+        config.linux_password = None
+
+
+@dataclass
+class EchoExecutor(SingleExecutor):
+    word: str = ''
+
+    item_field = 'word'
+
+    def commands(self):
+        return f'echo {self.word}'
+
+
+class ItemsTest(unittest.TestCase):
+    def test_one_command(self):
+        executor = EchoExecutor(items=['first', {'word': 'second'}], host=Localhost(), sudo=True)
+
+        command = executor.build_command()
+
+        self.assertTrue(command.startswith("sudo sh -c '( echo first )"))
+        self.assertIn('( echo second )', command)
+
+    def test_results(self):
+        result = EchoExecutor(items=['first', 'error'], host=Localhost()).run_command()
+
+        self.assertEqual(result.status, Status.FAIL)
+        self.assertEqual(list(result.items), ['first', 'error'])
+        self.assertEqual(result.items['first'], Result(Status.SUCCESS, stdin='echo first', stdout=['first', '']))
+        self.assertEqual(result.items['error'].status, Status.FAIL)
+
+    def test_results_without_pty(self):
+        result = EchoExecutor(items=['error', 'failed; exit 3'], host=Localhost(), pty=False).run_command()
+
+        self.assertEqual(result.items['error'].status, Status.SUCCESS)
+        self.assertEqual(result.items['failed; exit 3'].exit_status, 3)
+        self.assertEqual(result.status, Status.FAIL)
+
+    def test_dict_items_without_field(self):
+        executor = get_executor(items=['first'])
 
-        self.assertEqual(executor.fill_password(channel, channel), Result(Status.FAIL, message='Incorrect linux password!'))
+        with self.assertRaises(ItemsNotSupportedException):
+            executor.item_executors()
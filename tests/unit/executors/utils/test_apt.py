@@ -1,5 +1,9 @@
 import unittest
+from unittest.mock import Mock
+from crit.config import Host
 from crit.executors.utils import AptExecutor
+from crit.executors.result import Status
+from crit.transports import AgentTransport
 
 
 class TestAptExecutor(unittest.TestCase):
@@ -17,3 +21,56 @@ class TestAptExecutor(unittest.TestCase):
 
         # Wrong text for install
         self.assertFalse(executor.changed(['he following NEW packages will be installed:']))
+
+
+class TestAgent(unittest.TestCase):
+    def test_installed(self):
+        result = self.get_executor({'installed': True, 'version': '7.0'}).agent_result(self.transport)
+
+        self.assertEqual(result.status, Status.SUCCESS)
+        self.transport.call.assert_called_once_with(self.host, 'package', {'name': 'curl'}, None)
+
+    def test_not_installed(self):
+        self.assertIsNone(self.get_executor({'installed': False}).agent_result(self.transport))
+
+    def test_removed(self):
+        self.assertEqual(self.get_executor({'installed': False}, 'remove').agent_result(self.transport).status, Status.SUCCESS)
+
+    def test_agent_error(self):
+        self.assertIsNone(self.get_executor({'error': 'failed'}).agent_result(self.transport))
+
+    def get_executor(self, state: dict, action: str = 'install') -> AptExecutor:
+        self.transport = Mock(spec=AgentTransport)
+        self.transport.call.return_value = state
+        self.host = Host(url='web', ssh_user='root', transport=self.transport)
+
+        return AptExecutor(package='curl', action=action, host=self.host)
+
+
+class TestItems(unittest.TestCase):
+    output = (
+        b'Reading package lists...\n'
+        b'The following NEW packages will be installed:\n'
+        b'  curl git\n'
+        b'0 upgraded, 2 newly installed, 0 to remove and 0 not upgraded.\n'
+    )
+
+    def test_one_command(self):
+        executor = AptExecutor(items=['curl', 'git', 'vim'])
+
+        self.assertEqual(executor.build_command(), 'sudo DEBIAN_FRONTEND="noninteractive" apt-get -y install curl git vim')
+
+    def test_changed_per_package(self):
+        result = AptExecutor(items=['curl', 'git', 'vim']).result_from_output('apt-get', self.output)
+
+        self.assertEqual(result.status, Status.CHANGED)
+        self.assertEqual({name: item.status for name, item in result.items.items()}, {'curl': Status.CHANGED, 'git': Status.CHANGED, 'vim': Status.SUCCESS})
+
+    def test_failed(self):
+        output = b'Reading package lists...\nE: Unable to locate package missing\n'
+
+        result = AptExecutor(items=['curl', 'missing'], host=Host(url='web', ssh_user='root', passwordless_user=True)).result_from_exit_status('apt-get', output, b'', 100)
+
+        self.assertEqual(result.status, Status.FAIL)
+        self.assertEqual(result.items['missing'].message, 'E: Unable to locate package missing')
+        self.assertEqual(result.items['curl'].status, Status.FAIL)
@@ -1,11 +1,58 @@
-import unittest
-from crit.executors.utils import FileExecutor
-from crit.executors.utils.file_executor import TypeFile
-
-
-class CommandTest(unittest.TestCase):
-    def test_command_dir(self):
-        self.assertEqual(FileExecutor(path='test', type_file=TypeFile.DIRECTORY).commands(), 'mkdir test')
-
-    def test_command_file(self):
-        self.assertEqual(FileExecutor(path='test', type_file=TypeFile.FILE).commands(), 'touch test')
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+from crit.config import Host, Localhost
+from crit.executors.utils import FileExecutor
+from crit.executors.result import Status
+from crit.executors.utils.file_executor import TypeFile
+from crit.transports import AgentTransport
+
+
+class CommandTest(unittest.TestCase):
+    def test_command_dir(self):
+        self.assertEqual(FileExecutor(path='test', type_file=TypeFile.DIRECTORY).commands(), 'mkdir test')
+
+    def test_command_file(self):
+        self.assertEqual(FileExecutor(path='test', type_file=TypeFile.FILE).commands(), 'touch test')
+
+
+class AgentTest(unittest.TestCase):
+    def test_exists(self):
+        executor = self.get_executor({'exists': True, 'is_dir': True, 'is_file': False})
+
+        self.assertEqual(executor.run_command().status, Status.SUCCESS)
+        executor.host.transport.call.assert_called_once_with(executor.host, 'stat', {'path': '/srv'}, None)
+        executor.host.transport.exec_command.assert_not_called()
+
+    def test_missing(self):
+        executor = self.get_executor({'exists': False})
+
+        executor.run_command()
+
+        executor.host.transport.exec_command.assert_called_once()
+
+    def get_executor(self, state: dict) -> FileExecutor:
+        transport = Mock(spec=AgentTransport, sudo_command='sudo')
+        transport.call.return_value = state
+        transport.exec_command.return_value = {'output': b'', 'timed_out': False}
+
+        return FileExecutor(path='/srv', type_file=TypeFile.DIRECTORY, host=Host(url='web', ssh_user='root', transport=transport))
+
+
+class ItemsTest(unittest.TestCase):
+    def test_one_command(self):
+        self.assertEqual(FileExecutor(items=['first', 'second'], type_file=TypeFile.FILE).build_command(), 'touch first second')
+
+    def test_results(self):
+        directory = tempfile.mkdtemp()
+        existing, new, missing = [os.path.join(directory, name) for name in ['existing', 'new', 'missing/child']]
+        os.mkdir(existing)
+
+        result = FileExecutor(items=[existing, new, missing], type_file=TypeFile.DIRECTORY, host=Localhost(), pty=False).run_command()
+
+        self.assertEqual(result.status, Status.FAIL)
+        self.assertEqual(result.items[existing].status, Status.SUCCESS)
+        self.assertEqual(result.items[new].status, Status.SUCCESS)
+        self.assertEqual(result.items[missing].status, Status.FAIL)
+        self.assertTrue(os.path.isdir(new))
@@ -1,22 +1,65 @@
-import unittest
-from crit.executors.utils import UserAddExecutor
-
-
-class CommandTest(unittest.TestCase):
-    base = 'useradd'
-    standard = 'useradd -s /bin/bash -m'
-
-    def test_command(self):
-        self.assertEqual(UserAddExecutor(username='test').commands(), f'{self.standard} test')
-
-    def test_command_password(self):
-        self.assertEqual(UserAddExecutor(username='test', password='test').commands(), f'{self.standard} -p \'test\' test')
-
-    def test_command_create_home(self):
-        self.assertEqual(UserAddExecutor(username='test', create_home=False).commands(), f'{self.base} -s /bin/bash test')
-
-    def test_command_shell(self):
-        self.assertEqual(UserAddExecutor(username='test', shell='/bin/shell').commands(), f'{self.base} -s /bin/shell -m test')
-
-    def test_command_groups(self):
-        self.assertEqual(UserAddExecutor(username='test', groups=['test', 'test2']).commands(), f'{self.standard} -G test,test2 test')
+import unittest
+from unittest.mock import Mock
+from crit.config import Host
+from crit.executors.utils import UserAddExecutor
+from crit.executors.result import Status
+from crit.transports import AgentTransport
+
+
+class CommandTest(unittest.TestCase):
+    base = 'useradd'
+    standard = 'useradd -s /bin/bash -m'
+
+    def test_command(self):
+        self.assertEqual(UserAddExecutor(username='test').commands(), f'{self.standard} test')
+
+    def test_command_password(self):
+        self.assertEqual(UserAddExecutor(username='test', password='test').commands(), f'{self.standard} -p \'test\' test')
+
+    def test_command_create_home(self):
+        self.assertEqual(UserAddExecutor(username='test', create_home=False).commands(), f'{self.base} -s /bin/bash test')
+
+    def test_command_shell(self):
+        self.assertEqual(UserAddExecutor(username='test', shell='/bin/shell').commands(), f'{self.base} -s /bin/shell -m test')
+
+    def test_command_groups(self):
+        self.assertEqual(UserAddExecutor(username='test', groups=['test', 'test2']).commands(), f'{self.standard} -G test,test2 test')
+
+
+class ItemsTest(unittest.TestCase):
+    def test_one_command(self):
+        executor = UserAddExecutor(items=['first', {'username': 'second', 'groups': ['docker']}])
+
+        command = executor.build_command()
+
+        self.assertTrue(command.startswith("sudo sh -c '( useradd -s /bin/bash -m first )"))
+        self.assertIn('( useradd -s /bin/bash -m -G docker second )', command)
+
+    def test_existing_user(self):
+        executor = UserAddExecutor(items=['first', 'second'])
+        executor.build_command()
+        output = f"\n{executor.item_marker} 0 0\nuseradd: user 'second' already exists\n{executor.item_marker} 1 9\n".encode()
+
+        result = executor.result_from_output('useradd', output)
+
+        self.assertEqual(result.status, Status.CHANGED)
+        self.assertEqual(result.items['first'].status, Status.CHANGED)
+        self.assertEqual(result.items['second'].status, Status.SUCCESS)
+
+
+class AgentTest(unittest.TestCase):
+    def test_exists(self):
+        result = self.get_executor({'exists': True, 'uid': 1000}).agent_result(self.transport)
+
+        self.assertEqual(result.status, Status.SUCCESS)
+        self.transport.call.assert_called_once_with(self.host, 'user', {'name': 'test'}, None)
+
+    def test_missing(self):
+        self.assertIsNone(self.get_executor({'exists': False}).agent_result(self.transport))
+
+    def get_executor(self, state: dict) -> UserAddExecutor:
+        self.transport = Mock(spec=AgentTransport)
+        self.transport.call.return_value = state
+        self.host = Host(url='web', ssh_user='root', transport=self.transport)
+
+        return UserAddExecutor(username='test', host=self.host)
@@ -0,0 +1,34 @@
+import unittest
+from crit.config import Host
+from crit.sequences.batches import batch_size, split_batches, failed_percentage
+
+
+class BatchSizeTest(unittest.TestCase):
+    def test_amount(self):
+        self.assertEqual(batch_size(3, 10), 3)
+
+    def test_percentage(self):
+        self.assertEqual(batch_size('25%', 10), 2)
+
+    def test_at_least_one_host(self):
+        self.assertEqual(batch_size('1%', 10), 1)
+
+
+class SplitBatchesTest(unittest.TestCase):
+    hosts = [Host(url=str(i), ssh_user='test') for i in range(10)]
+
+    def test_last_size_repeats(self):
+        batches = split_batches(self.hosts, [1, '20%'])
+
+        self.assertEqual([len(batch) for batch in batches], [1, 2, 2, 2, 2, 1])
+        self.assertEqual(sum(batches, []), self.hosts)
+
+    def test_bigger_than_hosts(self):
+        self.assertEqual(split_batches(self.hosts, [20]), [self.hosts])
+
+
+class FailedPercentageTest(unittest.TestCase):
+    def test_failed_percentage(self):
+        hosts = [Host(url=str(i), ssh_user='test') for i in range(4)]
+
+        self.assertEqual(failed_percentage(hosts, hosts[:1]), 25)
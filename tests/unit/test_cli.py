@@ -208,6 +208,89 @@ class TestSetVerbose(unittest.TestCase):
         self.assertEqual(3, config.verbose)
 
 
+class TestSetForks(unittest.TestCase):
+    def test_set_forks(self):
+        cli.set_forks(10)
+        self.assertEqual(10, config.forks)
+
+    def tearDown(self):
+        config.forks = None
+
+
+class TestSetProcesses(unittest.TestCase):
+    def test_set_processes(self):
+        cli.set_processes(4)
+        self.assertEqual(4, config.processes)
+
+    def tearDown(self):
+        config.processes = None
+
+
+class TestSetTimeout(unittest.TestCase):
+    def test_set_timeout(self):
+        cli.set_timeout(1.5)
+        self.assertEqual(1.5, config.timeout)
+
+    def tearDown(self):
+        config.timeout = None
+
+
+class TestSetFailFast(unittest.TestCase):
+    def test_set_fail_fast(self):
+        cli.set_fail_fast(True)
+        self.assertTrue(config.fail_fast)
+
+    def tearDown(self):
+        config.fail_fast = False
+
+
+class TestSetPreconnect(unittest.TestCase):
+    def test_set_preconnect(self):
+        cli.set_preconnect(True)
+        self.assertTrue(config.preconnect)
+
+    def tearDown(self):
+        config.preconnect = False
+
+
+class TestSetCoalesce(unittest.TestCase):
+    def test_set_coalesce(self):
+        cli.set_coalesce(True)
+        self.assertTrue(config.coalesce)
+
+    def tearDown(self):
+        config.coalesce = False
+
+
+class TestSetBroker(unittest.TestCase):
+    @mock.patch('crit.commands.cli.BrokerClient')
+    def test_set_broker(self, broker_client):
+        cli.set_broker('/tmp/crit.sock')
+
+        self.assertEqual(config.broker, '/tmp/crit.sock')
+        broker_client.assert_called_with('/tmp/crit.sock')
+        broker_client.return_value.start.assert_called_with()
+
+    @mock.patch('crit.commands.cli.BrokerClient')
+    def test_no_broker(self, broker_client):
+        cli.set_broker(None)
+
+        self.assertIsNone(config.broker)
+        broker_client.assert_not_called()
+
+    def tearDown(self):
+        config.broker = None
+
+
+class TestSetDurationsFile(unittest.TestCase):
+    def test_set_durations_file(self):
+        cli.set_durations_file('durations.json')
+        self.assertEqual(config.durations_file, 'durations.json')
+
+    def tearDown(self):
+        config.durations_file = None
+
+
 class TestLinuxPassword(unittest.TestCase):
     def test_ask_linux_password(self):
         getpass_mock = Mock()
@@ -0,0 +1,52 @@
+import unittest
+from crit.config import Localhost
+from crit.executors import BarrierExecutor, CoalescedExecutor
+from crit.executors.utils import CommandExecutor, UserExecutor
+from crit.sequences.coalesce import coalesce
+
+
+class CoalesceTest(unittest.TestCase):
+    def test_consecutive(self):
+        first, second = CommandExecutor(command='ls'), CommandExecutor(command='pwd', name='Second')
+
+        executors = coalesce([first, second])
+
+        self.assertEqual(len(executors), 1)
+        self.assertIsInstance(executors[0], CoalescedExecutor)
+        self.assertEqual(executors[0].executors, [first, second])
+        self.assertEqual(executors[0].name, 'CommandExecutor, Second')
+
+    def test_single_executor_is_kept(self):
+        executor = CommandExecutor(command='ls')
+
+        self.assertEqual(coalesce([executor, BarrierExecutor()]), [executor, BarrierExecutor()])
+
+    def test_split_on_other_executors(self):
+        user = UserExecutor(username='test')
+        executors = coalesce([CommandExecutor(command='ls'), CommandExecutor(command='ls'), user, CommandExecutor(command='ls')])
+
+        self.assertEqual(len(executors), 3)
+        self.assertIs(executors[1], user)
+
+    def test_split_on_hosts_and_tags(self):
+        executors = coalesce([
+            CommandExecutor(command='ls'),
+            CommandExecutor(command='ls', hosts=[Localhost()]),
+            CommandExecutor(command='ls', tags=['deploy']),
+        ])
+
+        self.assertEqual(len(executors), 3)
+
+    def test_dependencies_are_not_coalesced(self):
+        first = CommandExecutor(command='ls')
+        second = CommandExecutor(command='ls')
+        third = CommandExecutor(command='ls', after=[first])
+
+        executors = coalesce([first, second, third])
+
+        self.assertEqual(executors, [first, second, third])
+
+    def test_throttle_is_not_coalesced(self):
+        executors = coalesce([CommandExecutor(command='ls', throttle='deploy'), CommandExecutor(command='ls')])
+
+        self.assertEqual(len(executors), 2)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from crit.config import Host
+from crit.executors import BaseExecutor
+from crit.sequences.durations import Durations
+
+
+@patch.multiple(BaseExecutor, __abstractmethods__=set())
+def get_executor(*args, **kwargs):
+    return BaseExecutor(*args, **kwargs)
+
+
+class DurationsTest(unittest.TestCase):
+    first = Host(url='first', ssh_user='test')
+    second = Host(url='second', ssh_user='test')
+
+    def test_expected(self):
+        durations = Durations()
+        executor = get_executor(name='executor')
+
+        self.assertEqual(durations.expected(executor, self.first), 0)
+
+        durations.record(executor, self.first, 2)
+        durations.record(executor, Host(url='third', ssh_user='test'), 4)
+
+        self.assertEqual(durations.expected(executor, self.first), 2)
+        self.assertEqual(durations.expected(executor, self.second), 3)
+
+    def test_merge(self):
+        durations = Durations()
+        executor = get_executor(name='executor')
+        durations.record(executor, self.first, 2)
+
+        durations.merge({'executor': {'second': 3}})
+
+        self.assertEqual(durations.durations, {'executor': {'first': 2, 'second': 3}})
+
+    def test_unnamed_executors_apart(self):
+        durations = Durations()
+        first, second = get_executor(), get_executor()
+        first.position, second.position = 0, 1
+
+        durations.record(first, self.first, 2)
+        durations.record(second, self.first, 4)
+
+        self.assertEqual(durations.expected(first, self.first), 2)
+        self.assertEqual(durations.expected(second, self.first), 4)
+
+    def test_save_and_load(self):
+        path = os.path.join(tempfile.mkdtemp(), 'durations.json')
+        durations = Durations(path)
+        durations.record(get_executor(), self.first, 2)
+        durations.save()
+
+        self.assertEqual(Durations(path).durations, {'BaseExecutor': {'first': 2}})
+
+    def test_missing_file(self):
+        self.assertEqual(Durations('/non/existing/durations.json').durations, {})
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+from crit.exceptions import ExecutorDependencyException
+from crit.executors import BaseExecutor
+from crit.sequences.executor_graph import ExecutorGraph, Progress
+
+
+@patch.multiple(BaseExecutor, __abstractmethods__=set())
+def get_executor(*args, **kwargs):
+    return BaseExecutor(*args, **kwargs)
+
+
+class LevelsTest(unittest.TestCase):
+    def test_list_order(self):
+        executors = [get_executor(), get_executor(), get_executor()]
+
+        self.assertEqual(ExecutorGraph(executors).levels(), [[0], [1], [2]])
+
+    def test_after(self):
+        checkout = get_executor(name='checkout')
+        pull = get_executor(name='pull', after=[])
+        run = get_executor(name='run')
+
+        self.assertEqual(ExecutorGraph([checkout, pull, run]).levels(), [[0, 1], [2]])
+
+    def test_after_later_executor(self):
+        first = get_executor(name='first')
+        second = get_executor(name='second', after=[])
+        first.after = [second]
+
+        self.assertEqual(ExecutorGraph([first, second]).levels(), [[1], [0]])
+
+    def test_cycle(self):
+        first = get_executor(name='first')
+        second = get_executor(name='second', after=[first])
+        first.after = [second]
+
+        with self.assertRaises(ExecutorDependencyException):
+            ExecutorGraph([first, second])
+
+    def test_not_in_sequence(self):
+        with self.assertRaises(ExecutorDependencyException):
+            ExecutorGraph([get_executor(after=[get_executor()])])
+
+    def test_before_graph(self):
+        before = get_executor(name='before')
+        executor = get_executor(after=[before])
+
+        self.assertEqual(ExecutorGraph([executor], [before, executor]).dependencies, [set()])
+
+
+class ReadyTest(unittest.TestCase):
+    def test_ready(self):
+        graph = ExecutorGraph([get_executor(), get_executor(after=[]), get_executor()])
+
+        self.assertEqual(graph.ready(Progress()), [0, 1])
+        self.assertEqual(graph.ready(Progress(started={0, 1}, done={0})), [])
+        self.assertEqual(graph.ready(Progress(started={0, 1}, done={0, 1})), [2])
+
+
+class CriticalPathsTest(unittest.TestCase):
+    def test_critical_paths(self):
+        first = get_executor(name='first')
+        short = get_executor(name='short', after=[first])
+        long = get_executor(name='long', after=[])
+        last = get_executor(name='last', after=[short])
+        durations = [1, 2, 5, 3]
+
+        graph = ExecutorGraph([first, short, long, last])
+
+        self.assertEqual(graph.critical_paths(lambda index: durations[index]), [6, 5, 5, 3])
@@ -0,0 +1,48 @@
+import socket
+import unittest
+from unittest.mock import patch
+from crit.config import Host, config
+from crit.sequences.probe import probe
+from crit.transports import ShellTransport
+
+
+class ProbeTest(unittest.TestCase):
+    def test_reachable(self):
+        self.assertIsNone(probe(self.host, 1, connect=False))
+
+    def test_unreachable(self):
+        self.server.close()
+
+        self.assertIn('ConnectionRefusedError', probe(self.host, 1, connect=False))
+
+        self.server = socket.socket()
+
+    def test_jump(self):
+        host = Host(url='unreachable.internal', ssh_user='test', jump=self.host)
+
+        self.assertIsNone(probe(host, 1, connect=False))
+
+    def test_transport_over_ssh(self):
+        with patch.object(config.channels, 'get') as get:
+            self.assertIsNone(probe(Host(url='127.0.0.1', ssh_user='test', ssh_port=self.host.ssh_port, transport=ShellTransport()), 1))
+
+        get.assert_called_once()
+
+    def test_connect(self):
+        with patch.object(config.channels, 'get') as get:
+            self.assertIsNone(probe(self.host, 1))
+
+        get.assert_called_once_with(self.host, 1, retries=0)
+
+    def test_connect_fails(self):
+        with patch.object(config.channels, 'get', side_effect=OSError('Authentication failed')):
+            self.assertEqual(probe(self.host, 1), 'OSError: Authentication failed')
+
+    def setUp(self):
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen()
+        self.host = Host(url='127.0.0.1', ssh_user='test', ssh_port=self.server.getsockname()[1])
+
+    def tearDown(self):
+        self.server.close()
@@ -1,10 +1,17 @@
+import asyncio
+import time
 import unittest
-from unittest.mock import Mock, patch
-from crit.config import Localhost, config
-from crit.executors import Result, BaseExecutor
+from dataclasses import dataclass
+from threading import Event, Lock
+from unittest.mock import Mock, patch, call
+from crit.config import Localhost, config, Host, GeneralConfig, Throttle
+from crit.exceptions import ThrottleNotFoundException, ItemsNotSupportedException, ProcessesNotSupportedException
+from crit.executors import Result, BaseExecutor, BarrierExecutor
 from crit.executors.result import Status
 from crit.executors.utils import CommandExecutor
-from crit.sequences import Sequence
+from crit.sequences import Sequence, Strategy
+from crit.sequences.durations import Durations
+from crit.sequences.shards import Shard
 
 
 @patch.multiple(BaseExecutor, __abstractmethods__=set())
@@ -12,6 +19,29 @@ def get_executor(*args, **kwargs):
     return BaseExecutor(*args, **kwargs)
 
 
+events = {}
+
+
+@dataclass
+class EventExecutor(BaseExecutor):
+    """
+    Executor that waits for an event and sets another event, so the order of the hosts can be tested
+    """
+
+    wait_for: str = None
+    set_event: str = None
+    status: Status = Status.SUCCESS
+
+    def execute(self, **kwargs) -> Result:
+        if self.wait_for and not events[self.wait_for].wait(1):
+            return Result(Status.FAIL, message='Timed out waiting for ' + self.wait_for)
+
+        if self.set_event:
+            events[self.set_event].set()
+
+        return Result(self.status)
+
+
 class RunTest(unittest.TestCase):
     def test_run(self):
         # Host and the empty mock
@@ -52,6 +82,589 @@ class RunTest(unittest.TestCase):
         start.called_with()
 
 
+@patch('crit.executors.result.Result.to_table', Mock())
+class FreeStrategyTest(unittest.TestCase):
+    slow = Host(url='slow', ssh_user='test')
+    fast = Host(url='fast', ssh_user='test')
+
+    def test_fast_host_does_not_wait(self):
+        """
+        The slow host only finishes its first executor after the fast host ran its second executor
+        """
+
+        sequence = Sequence(
+            hosts=[self.slow, self.fast],
+            strategy=Strategy.FREE,
+            executors=[
+                EventExecutor(hosts=[self.slow], wait_for='fast_done', register='first'),
+                EventExecutor(hosts=[self.fast], register='first'),
+                EventExecutor(hosts=[self.fast], set_event='fast_done', register='second'),
+            ]
+        )
+
+        sequence.run_executors()
+
+        self.assertEqual(config.get_registered(self.slow, 'first').status, Status.SUCCESS)
+        self.assertEqual(config.get_registered(self.fast, 'second').status, Status.SUCCESS)
+
+    def test_barrier(self):
+        """
+        The fast host waits at the barrier so the slow host never sees its event
+        """
+
+        sequence = Sequence(
+            hosts=[self.slow, self.fast],
+            strategy=Strategy.FREE,
+            executors=[
+                EventExecutor(hosts=[self.slow], wait_for='fast_done', register='first'),
+                BarrierExecutor(),
+                EventExecutor(hosts=[self.fast], set_event='fast_done', register='second'),
+            ]
+        )
+
+        sequence.run_executors()
+
+        self.assertEqual(config.get_registered(self.slow, 'first').status, Status.FAIL)
+        self.assertEqual(config.get_registered(self.fast, 'second').status, Status.SUCCESS)
+
+    def test_failed_host_stops(self):
+        sequence = Sequence(
+            hosts=[self.slow],
+            strategy=Strategy.FREE,
+            executors=[
+                EventExecutor(status=Status.FAIL, register='first'),
+                BarrierExecutor(),
+                EventExecutor(register='second'),
+            ]
+        )
+
+        sequence.run_executors()
+
+        self.assertNotIn('second', config.registry[repr(self.slow)])
+
+    def test_own_hosts(self):
+        sequence = Sequence(
+            hosts=[self.slow],
+            strategy=Strategy.FREE,
+            executors=[
+                EventExecutor(register='first'),
+                EventExecutor(hosts=[Localhost()], register='local'),
+            ]
+        )
+
+        sequence.run_executors()
+
+        self.assertEqual(config.get_registered(Localhost(), 'local').status, Status.SUCCESS)
+        self.assertNotIn('local', config.registry[repr(self.slow)])
+
+    def test_split_on_barriers(self):
+        first = get_executor(name='first')
+        second = get_executor(name='second')
+
+        sequence = Sequence(executors=[first, BarrierExecutor(), second])
+
+        self.assertEqual(sequence.split_on_barriers(), [[first], [second]])
+
+    def setUp(self):
+        config.hosts = [self.slow, self.fast]
+        config.registry = {}
+        events['fast_done'] = Event()
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+        config.registry = {}
+
+
+@patch('crit.executors.result.Result.to_table', Mock())
+class RunAsyncTest(unittest.TestCase):
+    slow = Host(url='slow', ssh_user='test')
+    fast = Host(url='fast', ssh_user='test')
+
+    def test_linear(self):
+        sequence = Sequence(
+            hosts=[self.slow, self.fast],
+            executors=[
+                EventExecutor(register='first'),
+                EventExecutor(status=Status.CHANGED, register='second'),
+            ]
+        )
+
+        self.run_sequence(sequence)
+
+        for host in [self.slow, self.fast]:
+            self.assertEqual(config.get_registered(host, 'first').status, Status.SUCCESS)
+            self.assertEqual(config.get_registered(host, 'second').status, Status.CHANGED)
+
+    def test_free(self):
+        sequence = Sequence(
+            hosts=[self.slow, self.fast],
+            strategy=Strategy.FREE,
+            executors=[
+                EventExecutor(hosts=[self.slow], wait_for='fast_done', register='first'),
+                EventExecutor(hosts=[self.fast], set_event='fast_done', register='second'),
+            ]
+        )
+
+        self.run_sequence(sequence)
+
+        self.assertEqual(config.get_registered(self.slow, 'first').status, Status.SUCCESS)
+
+    def test_free_own_hosts(self):
+        sequence = Sequence(hosts=[self.slow], strategy=Strategy.FREE, executors=[EventExecutor(hosts=[Localhost()], register='local')])
+
+        self.run_sequence(sequence)
+
+        self.assertEqual(config.get_registered(Localhost(), 'local').status, Status.SUCCESS)
+
+    def run_sequence(self, sequence: Sequence):
+        asyncio.new_event_loop().run_until_complete(sequence.run_executors_async())
+
+    def setUp(self):
+        config.hosts = [self.slow, self.fast]
+        config.registry = {}
+        events['fast_done'] = Event()
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+        config.registry = {}
+
+
+@patch('crit.executors.result.Result.to_table', Mock())
+class AfterTest(unittest.TestCase):
+    """
+    The first executor waits for the second one, this only works if they run at the same time
+    """
+
+    host = Host(url='test', ssh_user='test')
+
+    def test_linear(self):
+        self.run_sequence(Strategy.LINEAR)
+
+    def test_free(self):
+        self.run_sequence(Strategy.FREE)
+
+    def test_async(self):
+        asyncio.new_event_loop().run_until_complete(self.get_sequence(Strategy.FREE).run_executors_async())
+        self.assert_registry()
+
+    def run_sequence(self, strategy: Strategy):
+        self.get_sequence(strategy).run_executors()
+        self.assert_registry()
+
+    def get_sequence(self, strategy: Strategy) -> Sequence:
+        waiting = EventExecutor(wait_for='second_started', register='first')
+        setting = EventExecutor(set_event='second_started', register='second', after=[])
+
+        return Sequence(
+            hosts=[self.host],
+            strategy=strategy,
+            executors=[
+                waiting,
+                setting,
+                EventExecutor(register='third', after=[waiting, setting])
+            ]
+        )
+
+    def assert_registry(self):
+        for register in ['first', 'second', 'third']:
+            self.assertEqual(config.get_registered(self.host, register).status, Status.SUCCESS)
+
+    def setUp(self):
+        config.hosts = [self.host]
+        config.registry = {}
+        events['second_started'] = Event()
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+        config.registry = {}
+
+
+@dataclass
+class FailOnHostExecutor(BaseExecutor):
+    """
+    Fails on the host with the url fail
+    """
+
+    def execute(self, **kwargs) -> Result:
+        return Result(Status.FAIL if self.host.url == 'fail' else Status.SUCCESS)
+
+
+def remove_failed_host(result: Result, host: Host = None, name: str = None):
+    if result.status == Status.FAIL and host:
+        config.hosts.remove(host)
+
+
+@patch('crit.sequences.sequence.preconnect')
+@patch('crit.executors.result.Result.to_table', remove_failed_host)
+class BatchTest(unittest.TestCase):
+    hosts = [Host(url='first', ssh_user='test'), Host(url='fail', ssh_user='test'), Host(url='third', ssh_user='test')]
+
+    def test_all_batches(self, preconnect):
+        sequence = Sequence(hosts=self.hosts, batch=[1], executors=[FailOnHostExecutor(register='result')])
+        sequence.print_batch_title = Mock()
+
+        sequence.run()
+
+        self.assertEqual(sequence.print_batch_title.call_count, 3)
+        self.assertIn('result', config.registry['third'])
+        preconnect.assert_has_calls([call(self.hosts[1]), call(self.hosts[2])])
+
+    def test_max_fail_percentage(self, preconnect):
+        sequence = Sequence(hosts=self.hosts, batch=[1], max_fail_percentage=0, executors=[FailOnHostExecutor(register='result')])
+        sequence.print_batch_title = Mock()
+
+        sequence.run()
+
+        self.assertEqual(sequence.print_batch_title.call_count, 2)
+        self.assertNotIn('third', config.registry)
+        self.assertEqual(sequence.hosts, self.hosts)
+
+    def test_max_fail_percentage_async(self, preconnect):
+        sequence = Sequence(hosts=self.hosts, batch=[1], max_fail_percentage=0, executors=[FailOnHostExecutor(register='result')])
+        sequence.print_batch_title = Mock()
+
+        asyncio.run(sequence.run_async())
+
+        self.assertEqual(sequence.print_batch_title.call_count, 2)
+        self.assertIn('result', config.registry['first'])
+        self.assertNotIn('third', config.registry)
+        preconnect.assert_has_calls([call(self.hosts[1]), call(self.hosts[2])])
+
+    def setUp(self):
+        config.hosts = list(self.hosts)
+        config.registry = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+        config.registry = {}
+
+
+@patch('crit.executors.result.Result.to_table', Mock())
+class CancelTest(unittest.TestCase):
+    hosts = [Host(url='fail', ssh_user='test'), Host(url='second', ssh_user='test')]
+
+    def test_fail_fast(self):
+        sequence = Sequence(
+            hosts=self.hosts,
+            fail_fast=True,
+            executors=[FailOnHostExecutor(register='first'), FailOnHostExecutor(register='second')]
+        )
+
+        sequence.run_executors()
+
+        for registry in config.registry.values():
+            self.assertNotIn('second', registry)
+
+        self.assertTrue(config.cancelled.is_set())
+
+    def test_fail_fast_free(self):
+        sequence = Sequence(
+            hosts=self.hosts,
+            strategy=Strategy.FREE,
+            fail_fast=True,
+            executors=[FailOnHostExecutor(hosts=[self.hosts[0]], register='first'), BarrierExecutor(), FailOnHostExecutor(register='second')]
+        )
+
+        sequence.run_executors()
+
+        self.assertNotIn('second', config.registry)
+
+    @patch.multiple(BaseExecutor, __abstractmethods__=set())
+    def test_keyboard_interrupt(self):
+        executor = BaseExecutor()
+        executor.execute = Mock(side_effect=KeyboardInterrupt)
+
+        sequence = Sequence(hosts=self.hosts, executors=[executor])
+        sequence.close_channels = Mock()
+
+        with self.assertRaises(KeyboardInterrupt):
+            sequence.run_executors()
+
+        self.assertTrue(config.cancelled.is_set())
+        sequence.close_channels.assert_called_with()
+
+    def setUp(self):
+        config.hosts = list(self.hosts)
+        config.registry = {}
+
+    def tearDown(self):
+        config.cancelled.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+        config.registry = {}
+
+
+started = []
+
+
+@dataclass
+class OrderExecutor(BaseExecutor):
+    """
+    Executor that keeps the order in which the hosts started
+    """
+
+    def execute(self, **kwargs) -> Result:
+        started.append(self.host.url)
+
+        return Result(Status.SUCCESS)
+
+
+@patch('crit.executors.result.Result.to_table', Mock())
+class DurationsTest(unittest.TestCase):
+    hosts = [Host(url='fast', ssh_user='test'), Host(url='slow', ssh_user='test')]
+
+    def sequence(self, strategy: Strategy) -> Sequence:
+        sequence = Sequence(hosts=self.hosts, forks=1, strategy=strategy, executors=[OrderExecutor(name='order')])
+        sequence.durations = Durations()
+        sequence.durations.record(sequence.executors[0], self.hosts[1], 10)
+        sequence.durations.record(sequence.executors[0], self.hosts[0], 1)
+
+        return sequence
+
+    def test_linear_longest_first(self):
+        self.sequence(Strategy.LINEAR).run_executors()
+
+        self.assertEqual(started, ['slow', 'fast'])
+
+    def test_free_longest_first(self):
+        self.sequence(Strategy.FREE).run_executors()
+
+        self.assertEqual(started, ['slow', 'fast'])
+
+    def test_async_longest_first(self):
+        asyncio.run(self.sequence(Strategy.FREE).run_executors_async())
+
+        self.assertEqual(started, ['slow', 'fast'])
+
+    def test_record(self):
+        sequence = Sequence(hosts=self.hosts, executors=[OrderExecutor(name='order')])
+        sequence.run_executors()
+
+        self.assertEqual(set(sequence.durations.durations['order'].keys()), {'fast', 'slow'})
+
+    def test_record_unnamed(self):
+        sequence = Sequence(hosts=self.hosts, executors=[OrderExecutor(), OrderExecutor()])
+        sequence.run_executors()
+
+        self.assertEqual(set(sequence.durations.durations.keys()), {'0 OrderExecutor', '1 OrderExecutor'})
+
+    def setUp(self):
+        started.clear()
+        config.hosts = list(self.hosts)
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+
+
+running = []
+running_lock = Lock()
+
+
+@dataclass
+class ConcurrencyExecutor(BaseExecutor):
+    """
+    Executor that keeps the highest amount of executors that ran at the same time
+    """
+
+    def execute(self, **kwargs) -> Result:
+        with running_lock:
+            running.append(self.host.url)
+            most = len(running)
+
+        time.sleep(0.02)
+
+        with running_lock:
+            running.remove(self.host.url)
+
+        return Result(Status.SUCCESS, message=str(most))
+
+
+@patch('crit.executors.result.Result.to_table', Mock())
+class ThrottleTest(unittest.TestCase):
+    hosts = [Host(url=str(i), ssh_user='test') for i in range(3)]
+
+    def most_at_once(self) -> int:
+        return max(int(config.get_registered(host, 'most').message) for host in self.hosts)
+
+    def sequence(self, strategy: Strategy) -> Sequence:
+        return Sequence(hosts=self.hosts, strategy=strategy, executors=[ConcurrencyExecutor(throttle='registry', register='most')])
+
+    def test_linear(self):
+        sequence = self.sequence(Strategy.LINEAR)
+        sequence.run_executors()
+
+        self.assertEqual(self.most_at_once(), 1)
+
+    def test_free(self):
+        sequence = self.sequence(Strategy.FREE)
+        sequence.run_executors()
+
+        self.assertEqual(self.most_at_once(), 1)
+
+    def test_async(self):
+        sequence = self.sequence(Strategy.FREE)
+        asyncio.run(sequence.run_executors_async())
+
+        self.assertEqual(self.most_at_once(), 1)
+
+    def test_unknown_throttle(self):
+        sequence = Sequence(hosts=self.hosts, executors=[ConcurrencyExecutor(throttle='unknown')])
+
+        with self.assertRaises(ThrottleNotFoundException):
+            sequence.run_executors()
+
+    def test_items_not_supported(self):
+        sequence = Sequence(hosts=self.hosts, executors=[CommandExecutor(command='ls', items=['first'])])
+
+        with self.assertRaises(ItemsNotSupportedException):
+            sequence.run_executors()
+
+    def setUp(self):
+        config.hosts = list(self.hosts)
+        config.registry = {}
+        config.general_config = GeneralConfig(hosts=self.hosts, throttles={'registry': Throttle(1)})
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+        config.registry = {}
+        config.general_config = None
+
+
+class ForksTest(unittest.TestCase):
+    def test_host_per_fork(self):
+        hosts = [Host(url=f'host{i}', ssh_user='test') for i in range(3)]
+
+        self.assertEqual(Sequence(hosts=hosts, executors=[get_executor()]).get_forks(), 3)
+
+    def test_capped(self):
+        hosts = [Host(url=f'host{i}', ssh_user='test') for i in range(1000)]
+
+        self.assertEqual(Sequence(hosts=hosts, executors=[get_executor()]).get_forks(), Sequence.default_max_forks)
+
+    def test_forks_not_capped(self):
+        hosts = [Host(url=f'host{i}', ssh_user='test') for i in range(1000)]
+
+        self.assertEqual(Sequence(hosts=hosts, forks=200, executors=[get_executor()]).get_forks(), 200)
+
+    def test_divided_over_shards(self):
+        hosts = [Host(url=f'host{i}', ssh_user='test') for i in range(1000)]
+        sequence = Sequence(hosts=hosts[:500], forks=200, executors=[get_executor()])
+        sequence.shard = Shard(0, 2, hosts)
+
+        self.assertEqual(sequence.get_forks(), 100)
+
+        sequence.forks = None
+        self.assertEqual(sequence.get_forks(), Sequence.default_max_forks // 2)
+
+
+@patch('crit.executors.result.Result.to_table', Mock())
+class WarmUpTest(unittest.TestCase):
+    hosts = [Host(url='first', ssh_user='test'), Host(url='unreachable', ssh_user='test')]
+
+    @patch('crit.sequences.sequence.probe', side_effect=lambda host, timeout, connect: 'timed out' if host.url == 'unreachable' else None)
+    def test_unreachable_removed(self, probe):
+        sequence = Sequence(hosts=list(self.hosts), preconnect=True, connect_timeout=1, executors=[OrderExecutor()])
+
+        sequence.run()
+
+        self.assertEqual(started, ['first'])
+        probe.assert_any_call(self.hosts[1], 1, True)
+
+    @patch('crit.sequences.sequence.probe', side_effect=lambda host, timeout, connect: 'timed out' if host.url == 'unreachable' else None)
+    def test_unreachable_removed_async(self, probe):
+        sequence = Sequence(hosts=list(self.hosts), preconnect=True, connect_timeout=1, executors=[OrderExecutor()])
+
+        asyncio.run(sequence.run_async())
+
+        self.assertEqual(started, ['first'])
+
+    def test_processes_async(self):
+        with self.assertRaises(ProcessesNotSupportedException):
+            asyncio.run(Sequence(hosts=list(self.hosts), processes=2, executors=[OrderExecutor()]).run_async())
+
+    @patch('crit.sequences.sequence.probe')
+    def test_only_probe_with_processes(self, probe):
+        probe.return_value = None
+        sequence = Sequence(hosts=list(self.hosts), processes=2, executors=[])
+
+        sequence.warm_up()
+
+        probe.assert_called_with(self.hosts[1], 5, False)
+
+    @patch('crit.sequences.sequence.ThreadPoolExecutor')
+    def test_uses_forks(self, thread_pool):
+        thread_pool.return_value.__enter__.return_value.map.return_value = [None, None]
+        sequence = Sequence(hosts=list(self.hosts), forks=1, executors=[])
+
+        sequence.warm_up()
+
+        thread_pool.assert_called_once_with(max_workers=1, thread_name_prefix='crit-connect')
+
+    @patch('crit.sequences.sequence.probe')
+    def test_off_by_default(self, probe):
+        Sequence(hosts=list(self.hosts), executors=[OrderExecutor()]).run()
+
+        probe.assert_not_called()
+
+    def setUp(self):
+        started.clear()
+        config.hosts = list(self.hosts)
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+
+
+class CoalesceTest(unittest.TestCase):
+    def test_results_per_executor(self):
+        sequence = self.get_sequence()
+
+        with patch.object(Result, 'to_table') as to_table:
+            sequence.run()
+
+        self.assertEqual(config.get_registered(Localhost(), 'first').stdout, ['first', ''])
+        self.assertEqual(config.get_registered(Localhost(), 'second').stdout, ['second', ''])
+        self.assertEqual(to_table.call_args_list, [call(Localhost(), 'CommandExecutor'), call(Localhost(), 'Second')])
+
+    def test_async(self):
+        sequence = self.get_sequence()
+
+        with patch.object(Result, 'to_table'):
+            asyncio.new_event_loop().run_until_complete(sequence.run_async())
+
+        self.assertEqual(config.get_registered(Localhost(), 'second').stdout, ['second', ''])
+
+    def test_free(self):
+        sequence = self.get_sequence(strategy=Strategy.FREE)
+
+        with patch.object(Result, 'to_table'):
+            sequence.run()
+
+        self.assertEqual(config.get_registered(Localhost(), 'second').stdout, ['second', ''])
+
+    def get_sequence(self, **kwargs) -> Sequence:
+        return Sequence(hosts=[Localhost()], coalesce=True, executors=[
+            CommandExecutor(command='echo first', register='first'),
+            CommandExecutor(command='echo second', name='Second', register='second'),
+        ], **kwargs)
+
+    def setUp(self):
+        config.hosts = [Localhost()]
+        config.registry = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+
+
 class TagsTest(unittest.TestCase):
     """
     Tests if the right response is returned when some tags are set
@@ -0,0 +1,98 @@
+import io
+import os
+import unittest
+from threading import Event
+from dataclasses import dataclass
+from unittest.mock import patch, Mock
+from crit.config import Host, Localhost, config
+from crit.executors import BaseExecutor, Result
+from crit.executors.result import Status
+from crit.sequences import Sequence
+from crit.sequences import shards
+
+
+@dataclass
+class PidExecutor(BaseExecutor):
+    """
+    Returns the pid of the process it runs in. Fails on the host with the url fail
+    """
+
+    def execute(self, **kwargs) -> Result:
+        print('ran on ' + repr(self.host))
+
+        return Result(Status.FAIL if self.host.url == 'fail' else Status.SUCCESS, message=str(os.getpid()))
+
+
+class SplitHostsTest(unittest.TestCase):
+    hosts = [Host(url=str(i), ssh_user='test') for i in range(5)]
+
+    def test_split(self):
+        self.assertEqual(shards.split_hosts(self.hosts, 2), [self.hosts[0::2], self.hosts[1::2]])
+
+    def test_more_processes_than_hosts(self):
+        self.assertEqual(shards.split_hosts(self.hosts[:2], 4), [[self.hosts[0]], [self.hosts[1]]])
+
+
+@patch('crit.executors.result.Result.to_table', Mock())
+class RunInProcessesTest(unittest.TestCase):
+    hosts = [Host(url='first', ssh_user='test'), Host(url='second', ssh_user='test'), Host(url='fail', ssh_user='test')]
+
+    def test_merge(self):
+        sequence = Sequence(hosts=self.hosts, executors=[PidExecutor(register='pid')])
+
+        shards.run_in_processes(sequence, 3)
+
+        pids = {config.get_registered(host, 'pid').message for host in self.hosts}
+
+        self.assertEqual(len(pids), 3)
+        self.assertNotIn(str(os.getpid()), pids)
+
+    def test_failed_hosts_removed(self):
+        sequence = Sequence(hosts=self.hosts, executors=[PidExecutor(register='pid')])
+
+        with patch('crit.executors.result.Result.to_table', lambda result, host=None, name=None: config.hosts.remove(host) if result.status == Status.FAIL else None):
+            shards.run_in_processes(sequence, 2)
+
+        self.assertEqual(config.hosts, self.hosts[:2])
+
+    def test_own_hosts_run_once(self):
+        sequence = Sequence(hosts=self.hosts[:2], executors=[PidExecutor(register='pid'), PidExecutor(hosts=[Localhost()], register='local')])
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            shards.run_in_processes(sequence, 2)
+
+        self.assertEqual(output.getvalue().count('ran on localhost'), 1)
+        self.assertEqual(output.getvalue().count('ran on first'), 1)
+        self.assertIsNotNone(config.get_registered(Localhost(), 'local'))
+
+    def test_fail_fast_cancels_all_shards(self):
+        sequence = Sequence(hosts=[self.hosts[2], self.hosts[0]], fail_fast=True, executors=[
+            PidExecutor(hosts=[self.hosts[0]], register='wait'),
+            PidExecutor(register='pid'),
+        ])
+        sequence.executors[0].execute = lambda **kwargs: Result(Status.SUCCESS) if config.cancelled.wait(5) else Result(Status.FAIL)
+
+        shards.run_in_processes(sequence, 2)
+
+        self.assertTrue(config.cancelled.is_set())
+        self.assertNotIn('pid', config.registry.get(repr(self.hosts[0]), {}))
+
+    def test_run_shard(self):
+        shards.set_sequence(Sequence(executors=[PidExecutor(register='pid')]), Event())
+
+        shard = shards.run_shard((shards.Shard(0, 1, self.hosts[:1]), self.hosts[:1]))
+
+        self.assertIn('ran on first\n', shard.output)
+        self.assertEqual(shard.registry[repr(self.hosts[0])]['pid'].message, str(os.getpid()))
+        self.assertEqual(shard.failed_hosts, [])
+
+    def setUp(self):
+        config.hosts = list(self.hosts)
+        config.registry = {}
+        config.cancelled = Event()
+
+    @classmethod
+    def tearDownClass(cls):
+        config.hosts = []
+        config.registry = {}
+        config.cancelled = Event()
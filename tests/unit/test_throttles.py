@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+from crit.config import Host, Throttle
+from crit.exceptions import ThrottleNotFoundException
+from crit.executors import BaseExecutor
+from crit.sequences.throttles import Throttles
+
+
+@patch.multiple(BaseExecutor, __abstractmethods__=set())
+def get_executor(*args, **kwargs):
+    return BaseExecutor(*args, **kwargs)
+
+
+class ThrottlesTest(unittest.TestCase):
+    first = Host(url='first', ssh_user='test')
+    second = Host(url='second', ssh_user='test')
+
+    def test_global(self):
+        throttles = Throttles({'registry': Throttle(1)})
+        executor = get_executor(throttle='registry', host=self.first)
+
+        self.assertTrue(throttles.available(executor))
+        throttles.acquire(executor)
+        self.assertFalse(throttles.available(get_executor(throttle='registry', host=self.second)))
+        throttles.release(executor)
+        self.assertTrue(throttles.available(executor))
+
+    def test_per_host(self):
+        throttles = Throttles({'heavy': Throttle(1, per_host=True)})
+        throttles.acquire(get_executor(throttle='heavy', host=self.first))
+
+        self.assertFalse(throttles.available(get_executor(throttle='heavy', host=self.first)))
+        self.assertTrue(throttles.available(get_executor(throttle='heavy', host=self.second)))
+
+    def test_shards(self):
+        throttles = Throttles({'registry': Throttle(5), 'heavy': Throttle(1, per_host=True), 'single': Throttle(1)}, shards=2)
+
+        self.assertEqual(throttles.limit(get_executor(throttle='registry', host=self.first)), 2)
+        self.assertEqual(throttles.limit(get_executor(throttle='heavy', host=self.first)), 1)
+        self.assertEqual(throttles.limit(get_executor(throttle='single', host=self.first)), 1)
+
+    def test_no_throttle(self):
+        throttles = Throttles()
+        executor = get_executor(host=self.first)
+        throttles.acquire(executor)
+
+        self.assertTrue(throttles.available(executor))
+        self.assertEqual(throttles.running, {})
+
+    def test_validate(self):
+        with self.assertRaises(ThrottleNotFoundException):
+            Throttles({'registry': Throttle(1)}).validate(get_executor(throttle='unknown'))
+
+    def test_async(self):
+        throttles = Throttles({'registry': Throttle(1)})
+        first = get_executor(throttle='registry', host=self.first)
+        second = get_executor(throttle='registry', host=self.second)
+        order = []
+
+        async def run(executor):
+            await throttles.acquire_async(executor)
+            order.append(f'start {executor.host}')
+            await asyncio.sleep(0.01)
+            order.append(f'end {executor.host}')
+            await throttles.release_async(executor)
+
+        async def run_both():
+            await asyncio.gather(run(first), run(second))
+
+        asyncio.run(run_both())
+
+        self.assertEqual(order, ['start first', 'end first', 'start second', 'end second'])
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+from dataclasses import dataclass
+from unittest.mock import patch, Mock
+from crit.config import Localhost, config
+from crit.executors import BaseExecutor, Result
+from crit.executors.result import Status
+from crit.sequences import Sequence
+from crit.sequences.worker_pool import WorkerPool, run_executor
+
+running = []
+threads = set()
+lock = threading.Lock()
+
+
+@dataclass
+class CountingExecutor(BaseExecutor):
+    """
+    Executor that keeps track of how many executors run at the same time and on which threads
+    """
+
+    def execute(self, **kwargs) -> Result:
+        with lock:
+            running.append(self)
+            threads.add(threading.get_ident())
+            at_once = len(running)
+
+        time.sleep(0.01)
+
+        with lock:
+            running.remove(self)
+
+        return Result(Status.SUCCESS, message=str(at_once))
+
+
+class RunExecutorTest(unittest.TestCase):
+    @patch.multiple(BaseExecutor, __abstractmethods__=set())
+    def test_exception_to_result(self):
+        executor = BaseExecutor(host=Localhost())
+        executor.execute = Mock(side_effect=OSError('No route to host'))
+
+        self.assertEqual(run_executor(executor).result, Result(Status.FAIL, message='OSError: No route to host'))
+
+    @patch.multiple(BaseExecutor, __abstractmethods__=set())
+    def test_cancelled(self):
+        executor = BaseExecutor(host=Localhost())
+        executor.execute = Mock()
+        config.cancelled.set()
+
+        run_executor(executor)
+
+        self.assertFalse(executor.execute.called)
+        config.cancelled.clear()
+
+
+@patch('crit.executors.result.Result.to_table', Mock())
+class WorkerPoolTest(unittest.TestCase):
+    def test_bounded(self):
+        pool = WorkerPool(2)
+        futures = [pool.run(CountingExecutor(host=Localhost())) for _ in range(10)]
+
+        at_once = [int(future.result().result.message) for future in futures]
+        pool.shutdown()
+
+        self.assertLessEqual(max(at_once), 2)
+
+    def test_threads_reused(self):
+        sequence = Sequence(
+            hosts=[Localhost()],
+            forks=1,
+            executors=[CountingExecutor(), CountingExecutor(), CountingExecutor()]
+        )
+
+        sequence.run_executors()
+
+        self.assertEqual(len(threads), 1)
+
+    def test_cli_forks_overwrites_sequence(self):
+        config.forks = 3
+        sequence = Sequence(hosts=[Localhost()], forks=1, executors=[])
+
+        sequence.run_executors()
+
+        self.assertEqual(sequence.pool._max_workers, 3)
+
+    def setUp(self):
+        threads.clear()
+
+    def tearDown(self):
+        config.forks = None
@@ -0,0 +1,50 @@
+import base64
+import unittest
+from unittest.mock import patch
+from crit.config import Host, config
+from crit.transports import AgentTransport
+
+
+class AgentTransportTest(unittest.TestCase):
+    host = Host(url='web', ssh_user='root')
+
+    def test_exec_command(self):
+        response = self.exec_command({'output': 'b3V0cHV0', 'stderr': '', 'exit_status': 2, 'timed_out': False}, pty=False)
+
+        self.assertEqual(response, {'output': b'output', 'stderr': b'', 'exit_status': 2, 'timed_out': False})
+        self.agent.assert_called_once_with(self.host, False, 'python3')
+        self.agent.return_value.call.assert_called_once_with(
+            'run', {'command': 'ls', 'input': 'secret\n', 'timeout': 10, 'pty': False}, 15, None
+        )
+
+    def test_password_incorrect(self):
+        output = base64.b64encode(b'Sorry, try again.').decode()
+
+        self.assertEqual(self.exec_command({'output': output, 'stderr': '', 'exit_status': 1}), {'password_incorrect': True})
+
+    def test_timed_out(self):
+        self.assertEqual(self.exec_command({'output': '', 'timed_out': True}), {'output': b'', 'timed_out': True})
+
+    def test_error(self):
+        response = self.exec_command({'error': 'EOFError: closed'})
+
+        self.assertIn(b'Failed to run the command with the agent', response['output'])
+
+    def test_sudo_agent(self):
+        config.linux_password = 'secret'
+
+        try:
+            with patch.object(config.channels, 'agent') as agent:
+                AgentTransport(sudo=True).call(self.host, 'user', {'name': 'root'})
+        finally:
+            config.linux_password = None
+
+        agent.assert_called_once_with(self.host, True, 'python3')
+        agent.return_value.call.assert_called_once_with('user', {'name': 'root'}, None, 'secret')
+        self.assertEqual(AgentTransport(sudo=True).sudo_command, '')
+
+    def exec_command(self, response: dict, pty: bool = True) -> dict:
+        with patch.object(config.channels, 'agent') as self.agent:
+            self.agent.return_value.call.return_value = response
+
+            return AgentTransport().exec_command(self.host, 'ls', 'secret', 10, pty)
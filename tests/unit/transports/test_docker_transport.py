@@ -0,0 +1,28 @@
+import unittest
+from unittest.mock import patch, Mock
+from crit.config import Host
+from crit.transports import DockerTransport
+
+
+class DockerTransportTest(unittest.TestCase):
+    host = Host(url='web', ssh_user='root')
+
+    def test_args(self):
+        self.assertEqual(DockerTransport().args(self.host, 'ls'), ['docker', 'exec', '-i', 'web', 'sh', '-c', 'ls'])
+
+    def test_args_with_container_and_user(self):
+        transport = DockerTransport(container='web-1', user='app', docker='podman')
+
+        self.assertEqual(
+            transport.args(self.host, 'ls'),
+            ['podman', 'exec', '-i', '--user', 'app', 'web-1', 'sh', '-c', 'ls']
+        )
+
+    @patch('subprocess.Popen')
+    def test_exec_command(self, popen):
+        popen.return_value.communicate.return_value = (b'output', None)
+
+        response = DockerTransport().exec_command(self.host, 'ls')
+
+        self.assertEqual(response, {'output': b'output', 'timed_out': False})
+        self.assertEqual(popen.call_args[0][0], ['docker', 'exec', '-i', 'web', 'sh', '-c', 'ls'])
@@ -0,0 +1,35 @@
+import time
+import unittest
+from crit.config import Localhost
+from crit.transports import LocalTransport
+
+
+class LocalTransportTest(unittest.TestCase):
+    host = Localhost()
+
+    def test_output(self):
+        response = LocalTransport().exec_command(self.host, 'echo output && echo error >&2')
+
+        self.assertEqual(response, {'output': b'output\nerror\n', 'timed_out': False})
+
+    def test_no_pty(self):
+        response = LocalTransport().exec_command(self.host, 'echo output && echo error >&2 && exit 3', pty=False)
+
+        self.assertEqual(response, {'output': b'output\n', 'stderr': b'error\n', 'exit_status': 3, 'timed_out': False})
+
+    def test_password_on_stdin(self):
+        response = LocalTransport().exec_command(self.host, 'read password && echo $password', password='secret')
+
+        self.assertEqual(response['output'], b'secret\n')
+
+    def test_password_incorrect(self):
+        response = LocalTransport().exec_command(self.host, 'echo "Sorry, try again."', password='wrong')
+
+        self.assertTrue(response['password_incorrect'])
+
+    def test_timeout(self):
+        start = time.monotonic()
+        response = LocalTransport().exec_command(self.host, 'sleep 10', timeout=0.1)
+
+        self.assertTrue(response['timed_out'])
+        self.assertLess(time.monotonic() - start, 5)
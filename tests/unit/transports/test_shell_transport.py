@@ -0,0 +1,34 @@
+import unittest
+from unittest.mock import patch
+from crit.config import Host, config
+from crit.transports import ShellTransport
+
+
+class ShellTransportTest(unittest.TestCase):
+    host = Host(url='web', ssh_user='root')
+
+    def test_exec_command(self):
+        with patch.object(config.channels, 'shell') as shell:
+            shell.return_value.run.return_value = {'output': b'output', 'timed_out': False}
+
+            response = ShellTransport().exec_command(self.host, "sudo -S -p '' ls", 'secret', 10, False)
+
+        self.assertEqual(response, {'output': b'output', 'timed_out': False})
+        shell.assert_called_once_with(self.host, False, 'sh', False)
+        shell.return_value.run.assert_called_once_with("sudo -S -p '' ls", 'secret', 10, False)
+
+    def test_sudo_shell(self):
+        config.linux_password = 'secret'
+
+        try:
+            with patch.object(config.channels, 'shell') as shell:
+                ShellTransport(sudo=True, shell='bash', keep_state=True).exec_command(self.host, ' ls', 'secret')
+        finally:
+            config.linux_password = None
+
+        shell.assert_called_once_with(self.host, True, 'bash', True)
+        shell.return_value.run.assert_called_once_with(' ls', None, None, True, 'secret')
+
+    def test_sudo_command(self):
+        self.assertEqual(ShellTransport().sudo_command, "sudo -S -p ''")
+        self.assertEqual(ShellTransport(sudo=True).sudo_command, '')
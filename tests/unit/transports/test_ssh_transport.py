@@ -0,0 +1,45 @@
+import asyncio
+import unittest
+from io import BytesIO
+from unittest.mock import patch, Mock
+from crit.config import Host, config
+from crit.transports import SshTransport
+
+
+class SshTransportTest(unittest.TestCase):
+    host = Host(url='web', ssh_user='root')
+
+    def test_exec_command(self):
+        stdout = BytesIO(b'output')
+        stdout.channel = Mock()
+        self.get_client.return_value.exec_command.return_value = (BytesIO(), stdout, BytesIO())
+
+        response = SshTransport().exec_command(self.host, 'ls', timeout=10)
+
+        self.assertEqual(response, {'output': b'output', 'timed_out': False})
+        self.get_client.return_value.exec_command.assert_called_once_with('ls', get_pty=True)
+        self.assertEqual(config.channels.session(self.host)._value, self.host.max_sessions)
+
+    def test_password_checked_once(self):
+        with patch.object(config.channels, 'check_sudo', return_value=False) as check_sudo:
+            response = SshTransport().exec_command(self.host, "sudo -p 'crit-sudo-password:' ls", 'wrong')
+
+        self.assertEqual(response, {'password_incorrect': True})
+        check_sudo.assert_called_once_with(self.host, 'wrong')
+        self.get_client.return_value.exec_command.assert_not_called()
+
+    def test_password_checked_once_async(self):
+        with patch.object(config.channels, 'check_sudo', return_value=False):
+            response = asyncio.run(SshTransport().exec_command_async(self.host, "sudo -p 'crit-sudo-password:' ls", 'wrong'))
+
+        self.assertEqual(response, {'password_incorrect': True})
+        self.get_client.return_value.exec_command.assert_not_called()
+
+    def test_over_ssh(self):
+        self.assertTrue(SshTransport.over_ssh)
+        self.assertTrue(SshTransport.sudo_prompt)
+
+    def setUp(self):
+        patcher = patch.object(SshTransport, 'get_client')
+        self.addCleanup(patcher.stop)
+        self.get_client = patcher.start()